@@ -13,6 +13,7 @@ import signal
 import threading
 import time
 from enum import Enum, auto
+from types import SimpleNamespace
 from typing import TYPE_CHECKING, Callable, Optional
 
 if TYPE_CHECKING:
@@ -65,6 +66,7 @@ class Engine:
     MAX_ERREURS_CONSECUTIVES = 10  # Global
     MAX_ACTIONS_PAR_MANOIR = 50  # Par tour
     DELAI_ENTRE_VERIFICATIONS = 0.1  # Secondes
+    INTERVALLE_VERIF_ACTIVITE = 0.5  # Secondes entre deux vérifications d'activité
 
     def __init__(self):
         """Initialise le moteur"""
@@ -82,6 +84,7 @@ class Engine:
         # État interne
         self._manoir_courant: Optional[str] = None
         self._echecs_consecutifs: dict[str, int] = {}  # Par manoir
+        self._contextes: dict[str, SimpleNamespace] = {}  # Méthodes liées par manoir
         self._erreurs_consecutives: int = 0  # Global
         self._stop_event = threading.Event()
         self._pause_event = threading.Event()
@@ -123,31 +126,48 @@ class Engine:
     # CONFIGURATION
     # =========================================================
 
-    def ajouter_manoir(self, manoir):
-        """Ajoute un manoir au moteur
+    def _enregistrer_manoir(self, manoir):
+        """Enregistre un manoir, sans log ni invalidation de l'ordonnanceur (PROTÉGÉ)
 
         Args:
             manoir: Instance de ManoirBase
         """
         self.manoirs[manoir.manoir_id] = manoir
+        # Oublier les méthodes liées d'un manoir remplacé sous le même identifiant
+        self._contextes.pop(manoir.manoir_id, None)
 
         # Initialiser le compteur d'échecs
         self._echecs_consecutifs[manoir.manoir_id] = 0
 
+    def ajouter_manoir(self, manoir):
+        """Ajoute un manoir au moteur
+
+        Args:
+            manoir: Instance de ManoirBase
+        """
+        self._enregistrer_manoir(manoir)
+        # Les collectes mémorisées par l'ordonnanceur ne connaissent pas ce manoir
+        self.scheduler.invalidate()
+
         logger.info(f"Manoir ajouté: {manoir.manoir_id} (priorité={manoir.priorite})")
 
     def ajouter_manoirs(self, manoirs):
         """Ajoute plusieurs manoirs
 
+        L'ordonnanceur n'est invalidé qu'une fois et un seul log résume l'ajout.
+
         Args:
             manoirs: Dict ou List de manoirs
         """
-        if isinstance(manoirs, dict):
-            for manoir in manoirs.values():
-                self.ajouter_manoir(manoir)
-        else:
-            for manoir in manoirs:
-                self.ajouter_manoir(manoir)
+        iterable = manoirs.values() if hasattr(manoirs, "values") else manoirs
+
+        ajoutes = []
+        for manoir in iterable:
+            self._enregistrer_manoir(manoir)
+            ajoutes.append(f"{manoir.manoir_id} (priorité={manoir.priorite})")
+        self.scheduler.invalidate()
+
+        logger.info(f"Manoirs ajoutés ({len(ajoutes)}): {', '.join(ajoutes)}")
 
     def set_callback(self, event, callback):
         """Définit un callback pour un événement
@@ -265,6 +285,7 @@ class Engine:
                 self.bus.clear_expired()
 
                 # Sélectionner le manoir prioritaire via le scheduler
+                self.scheduler.nouveau_tour()
                 selection = self.scheduler.selectionner_manoir(self.manoirs)
 
                 if not selection:
@@ -346,7 +367,11 @@ class Engine:
         # Créer le gestionnaire d'états partagé
         try:
             chemin_config = CONFIG_DIR / "etat-chemin.toml"
-            self._gestionnaire_etats = GestionnaireEtats(str(chemin_config))
+            gestionnaire = GestionnaireEtats(str(chemin_config))
+            # Scan et validation ici : une configuration invalide désactive le
+            # gestionnaire au lieu d'échouer plus tard dans la boucle
+            gestionnaire.initialiser()
+            self._gestionnaire_etats = gestionnaire
             logger.info("Gestionnaire d'états créé")
         except Exception as e:
             logger.warning(f"Gestionnaire d'états non disponible: {e}")
@@ -364,11 +389,34 @@ class Engine:
                 # Initialiser la séquence
                 manoir.initialiser_sequence()
 
+                # Précalculer les méthodes liées utilisées à chaque action
+                self._contextes[manoir_id] = self._creer_contexte(manoir)
+
                 logger.info(f"Manoir {manoir_id} initialisé")
 
             except Exception as e:
                 logger.error(f"Erreur initialisation {manoir_id}: {e}")
 
+    @staticmethod
+    def _creer_contexte(manoir):
+        """Crée le contexte d'exécution d'un manoir (PROTÉGÉ)
+
+        Regroupe les méthodes liées appelées à chaque action pour éviter
+        de résoudre les chaînes d'attributs dans la boucle d'exécution.
+
+        Args:
+            manoir: Instance de ManoirBase
+
+        Returns:
+            SimpleNamespace: Méthodes liées du manoir
+        """
+        return SimpleNamespace(
+            seq_end=manoir.sequence.is_end,
+            seq_next=manoir.sequence.__next__,
+            doit_tourner=manoir.doit_tourner,
+            inc_stat=manoir.incrementer_stat,
+        )
+
     def _changer_manoir(self, manoir_id):
         """Change le manoir courant (PROTÉGÉ)
 
@@ -406,6 +454,16 @@ class Engine:
             manoir_id: ID du manoir
         """
         manoir = self.manoirs[manoir_id]
+        ctx = self._contextes.get(manoir_id)
+        if ctx is None:
+            ctx = self._contextes[manoir_id] = self._creer_contexte(manoir)
+        seq_end = ctx.seq_end
+        seq_next = ctx.seq_next
+        doit_tourner = ctx.doit_tourner
+        inc_stat = ctx.inc_stat
+        stop_is_set = self._stop_event.is_set
+        stats = self.stats
+        echecs = self._echecs_consecutifs
 
         # Manoir prépare et alimente sa séquence
         try:
@@ -418,27 +476,33 @@ class Engine:
             logger.debug(f"{manoir_id}: Pas prêt (en cours de lancement/chargement)")
             return
 
-        if manoir.sequence.is_end():
+        if seq_end():
             logger.debug(f"{manoir_id}: Aucune action à exécuter")
             return
 
         # Exécuter les actions de la séquence
         actions_executees = 0
+        is_user_active = self.activity.is_user_active
+        intervalle_activite = self.INTERVALLE_VERIF_ACTIVITE
+        prochaine_verif_activite = 0.0
 
-        while not manoir.sequence.is_end() and not self._stop_event.is_set():
+        while not seq_end() and not stop_is_set():
             # Limite de sécurité
             if actions_executees >= self.MAX_ACTIONS_PAR_MANOIR:
                 logger.warning(f"{manoir_id}: Limite d'actions atteinte")
                 break
 
-            # Vérifier l'activité utilisateur
-            if self.activity.is_user_active(1):
-                logger.info("Activité utilisateur détectée, pause")
-                break
+            # Vérifier l'activité utilisateur (résolution 1s, inutile à chaque action)
+            maintenant = time.monotonic()
+            if maintenant >= prochaine_verif_activite:
+                prochaine_verif_activite = maintenant + intervalle_activite
+                if is_user_active(1):
+                    logger.info("Activité utilisateur détectée, pause")
+                    break
 
             # Récupérer l'action courante
             try:
-                action = next(manoir.sequence)
+                action = seq_next()
             except StopIteration:
                 break
 
@@ -455,9 +519,9 @@ class Engine:
                         logger.debug(f"{manoir_id}: Reprise preparer_tour demandée")
                         if result:
                             actions_executees += 1
-                            self.stats["actions_executees"] += 1
-                            self._echecs_consecutifs[manoir_id] = 0
-                            manoir.incrementer_stat("actions_executees")
+                            stats["actions_executees"] += 1
+                            echecs[manoir_id] = 0
+                            inc_stat("actions_executees")
                         # Rappeler preparer_tour pour recalculer le chemin
                         try:
                             manoir.preparer_tour()
@@ -466,21 +530,21 @@ class Engine:
                         continue  # Continuer avec la nouvelle séquence
 
                     # VÉRIFIER SI ROTATION DEMANDÉE (attente non bloquante)
-                    if manoir.doit_tourner():
+                    if doit_tourner():
                         logger.debug(f"{manoir_id}: Rotation demandée par action")
                         if result:
                             actions_executees += 1
-                            self.stats["actions_executees"] += 1
-                            self._echecs_consecutifs[manoir_id] = 0
-                            manoir.incrementer_stat("actions_executees")
+                            stats["actions_executees"] += 1
+                            echecs[manoir_id] = 0
+                            inc_stat("actions_executees")
                         break  # Sortir, passer au manoir suivant
 
                     if result:
                         # Succès
                         actions_executees += 1
-                        self.stats["actions_executees"] += 1
-                        self._echecs_consecutifs[manoir_id] = 0
-                        manoir.incrementer_stat("actions_executees")
+                        stats["actions_executees"] += 1
+                        echecs[manoir_id] = 0
+                        inc_stat("actions_executees")
 
                         # Callback
                         if self._on_action_executed:
@@ -488,12 +552,12 @@ class Engine:
                                 self._on_action_executed(manoir_id, actions_executees)
                     else:
                         # Échec - condition non remplie
-                        self._echecs_consecutifs[manoir_id] += 1
-                        manoir.incrementer_stat("actions_echouees")
+                        echecs[manoir_id] += 1
+                        inc_stat("actions_echouees")
                         logger.debug(f"Action {nom} échouée (condition non remplie)")
 
                         # Vérifier si blocage
-                        if self._echecs_consecutifs[manoir_id] >= self.MAX_ECHECS_CONSECUTIFS:
+                        if echecs[manoir_id] >= self.MAX_ECHECS_CONSECUTIFS:
                             logger.warning(
                                 f"{manoir_id}: {self.MAX_ECHECS_CONSECUTIFS} échecs consécutifs - signalement blocage"
                             )
@@ -506,7 +570,7 @@ class Engine:
 
             except Exception as e:
                 logger.error(f"Erreur exécution action: {e}")
-                self._echecs_consecutifs[manoir_id] += 1
+                echecs[manoir_id] += 1
 
                 if self._on_error:
                     with contextlib.suppress(Exception):
@@ -46,11 +46,15 @@ class Etat(metaclass=SingletonMeta):
     Attributes:
         nom: Identifiant unique de l'état
         groupes: Liste des groupes d'appartenance (ex: "popup", "ecran_principal")
+        TOUJOURS_FAUX: Si True, l'état n'est jamais testé lors de la détection
     """
 
     nom: str = None
     groupes: list[str] = []
 
+    # True si verif() retourne toujours False (état jamais détectable)
+    TOUJOURS_FAUX: bool = False
+
     def __init__(self):
         if self.nom is None:
             self.nom = self.__class__.__name__
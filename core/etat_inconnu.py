@@ -27,6 +27,9 @@ class EtatInconnu(Etat):
 
     etats_possibles: list[Union["Etat", str, type]] = []
 
+    # verif() retourne toujours False : exclu d'office de la détection
+    TOUJOURS_FAUX = True
+
     def __init__(self, etats_possibles=None):
         """
         Initialise l'état inconnu.
@@ -4,8 +4,10 @@ GestionnaireEtats - Composant central du système de gestion d'états et chemins
 Gère le graphe d'états, le pathfinding et la détermination d'état.
 """
 
-import importlib
-import importlib.util
+import heapq
+import os
+import sys
+import threading
 from typing import TYPE_CHECKING, Any, Optional, Union
 
 if TYPE_CHECKING:
@@ -13,11 +15,6 @@ if TYPE_CHECKING:
 from collections import deque
 from pathlib import Path
 
-try:
-    import tomllib
-except ImportError:
-    import tomli as tomllib
-
 from core.chemin import Chemin
 from core.etat import Etat
 from core.etat_inconnu import EtatInconnu
@@ -39,25 +36,47 @@ class GestionnaireEtats:
         _etats: Dictionnaire nom → instance Etat
         _chemins: Liste de tous les chemins enregistrés
         _priorites: Ordre de priorité des noms d'états pour les tests
+        _priorite_index: Index nom d'état → rang dans _priorites
+        _etats_detectables: États dont verif() peut réussir, triés par priorité
+        _fallback_inconnu_global: EtatInconnu sans etats_possibles (repli), ou None
+        _graphe_certain: Graphe précalculé limité aux chemins certains
+        _graphe_complet: Graphe précalculé de tous les chemins
+        _graphes_inverses: Graphes inverses (état → [(chemin, état précédent)])
+        _etats_sortie_cache: États de sortie précalculés par id(chemin)
+        _chemins_par_depart: Index état → chemins partant de cet état
+        _chemins_par_arrivee: Index état → chemins pouvant arriver à cet état
         _logger: Logger du module
         _config: Configuration chargée du fichier TOML
+        _initialise: True une fois les états/chemins scannés
+        _erreur_initialisation: Erreur du scan, relevée sans rescanner, ou None
     """
 
     def __init__(self, chemin_config: str):
         """
-        Initialise le gestionnaire, scan les états/chemins, charge la config.
+        Initialise le gestionnaire et charge la config.
+
+        Le scan des états/chemins est fait par initialiser(), ou à défaut au
+        premier appel d'une méthode publique (voir _assurer_initialisation).
 
         Args:
             chemin_config: Chemin vers fichier TOML de configuration
 
         Raises:
             ErreurConfiguration: Si le fichier TOML est invalide
-            ErreurValidation: Si noms dupliqués ou références invalides
         """
         self._logger = get_module_logger("GestionnaireEtats")
         self._etats: dict[str, Etat] = {}
         self._chemins: list[Chemin] = []
         self._priorites: list[str] = []
+        self._priorite_index: dict[str, int] = {}
+        self._etats_detectables: list[Etat] = []
+        self._fallback_inconnu_global: Optional[Etat] = None
+        self._graphe_certain: dict[Etat, list[Chemin]] = {}
+        self._graphe_complet: dict[Etat, list[Chemin]] = {}
+        self._graphes_inverses: dict[int, dict[Etat, list[tuple[Chemin, Etat]]]] = {}
+        self._etats_sortie_cache: dict[int, list[Etat]] = {}
+        self._chemins_par_depart: dict[Etat, list[Chemin]] = {}
+        self._chemins_par_arrivee: dict[Etat, list[Chemin]] = {}
         self._config: dict[str, Any] = {}
 
         # Chemin de base par défaut (parent.parent du fichier config)
@@ -66,21 +85,92 @@ class GestionnaireEtats:
         self._chemin_etats: Optional[Path] = None
         self._chemin_chemins: Optional[Path] = None
 
+        # Scan différé (initialiser() ou premier usage)
+        self._initialise = False
+        self._erreur_initialisation: Optional[Exception] = None
+        self._verrou_initialisation = threading.Lock()
+
         self._charger_configuration(chemin_config)
+
+    def initialiser(self) -> None:
+        """
+        Scanne les états/chemins et valide leur cohérence.
+
+        À appeler juste après la construction pour qu'une configuration
+        invalide soit signalée immédiatement ; sinon le scan a lieu au
+        premier usage.
+
+        Raises:
+            ErreurValidation: Si noms dupliqués ou références invalides
+        """
+        self._assurer_initialisation()
+
+    def _assurer_initialisation(self) -> None:
+        """
+        Scanne les états/chemins une seule fois (idempotent, thread-safe).
+
+        Un échec est mémorisé : les appels suivants relèvent la même erreur
+        sans rescanner les modules.
+
+        Raises:
+            ErreurValidation: Si noms dupliqués ou références invalides
+        """
+        if self._initialise:
+            return
+
+        with self._verrou_initialisation:
+            if self._initialise:
+                return
+            if self._erreur_initialisation is not None:
+                raise self._erreur_initialisation
+
+            try:
+                self._initialiser()
+            except Exception as e:
+                self._erreur_initialisation = e
+                raise
+            self._initialise = True
+
+    def _initialiser(self) -> None:
+        """Scan, résolution, validation et précalculs (appelé une seule fois)."""
         self._scanner_etats()
         self._resoudre_groupes_sortie()
         self._scanner_chemins()
         self._resoudre_references()
         self._valider_coherence()
+        self._etats_detectables = sorted(
+            (e for e in self._etats.values() if not e.TOUJOURS_FAUX), key=self._priorite_key
+        )
+        self._fallback_inconnu_global = next(
+            (
+                e
+                for e in self._etats.values()
+                if isinstance(e, EtatInconnu) and not e.etats_possibles
+            ),
+            None,
+        )
+        self._precalculer_graphes()
+        self._construire_index_chemins()
 
     def _charger_configuration(self, chemin_config: str) -> None:
         """Charge la configuration depuis le fichier TOML."""
+        # Import différé : le parseur TOML n'est utile qu'à la construction
+        try:
+            import tomllib
+        except ImportError:
+            import tomli as tomllib
+
         try:
             with open(chemin_config, "rb") as f:
                 self._config = tomllib.load(f)
 
             if "priorites" in self._config:
-                self._priorites = self._config["priorites"].get("ordre", [])
+                self._priorites = [
+                    sys.intern(nom) for nom in self._config["priorites"].get("ordre", [])
+                ]
+                # Premier rang d'un nom en double (comme list.index)
+                for i, nom in enumerate(self._priorites):
+                    self._priorite_index.setdefault(nom, i)
 
             if "logging" in self._config:
                 niveau = self._config["logging"].get("niveau", "INFO")
@@ -114,6 +204,7 @@ class GestionnaireEtats:
 
         chemins_popup_generes = 0
         for instance in instances:
+            instance.nom = sys.intern(instance.nom)
             if instance.nom in self._etats:
                 raise ErreurValidation(f"Nom d'état dupliqué: {instance.nom}")
             self._etats[instance.nom] = instance
@@ -250,16 +341,25 @@ class GestionnaireEtats:
         Returns:
             Liste d'instances des classes trouvées
         """
+        import importlib.util
+
         instances = []
-        repertoire_path = Path(repertoire)
 
-        for fichier in repertoire_path.glob("*.py"):
-            if fichier.name.startswith("__"):
-                continue
+        with os.scandir(repertoire) as entrees:
+            fichiers = [
+                entree
+                for entree in entrees
+                if entree.name.endswith(".py")
+                and not entree.name.startswith("__")
+                and entree.is_file()
+            ]
 
+        for fichier in fichiers:
             try:
-                module_name = fichier.stem
-                spec = importlib.util.spec_from_file_location(module_name, fichier)
+                # Exécuter le module pour chaque gestionnaire : ses classes (et donc
+                # leurs instances singleton) ne sont pas partagées entre gestionnaires
+                module_name = fichier.name[:-3]
+                spec = importlib.util.spec_from_file_location(module_name, fichier.path)
                 module = importlib.util.module_from_spec(spec)
                 spec.loader.exec_module(module)
 
@@ -321,6 +421,12 @@ class GestionnaireEtats:
         Raises:
             ErreurValidation: Si la référence est invalide
         """
+        # Chemin rapide : nom d'état enregistré
+        if type(ref) is str:
+            etat = self._etats.get(ref)
+            if etat is not None:
+                return etat
+
         if isinstance(ref, Etat):
             return ref
 
@@ -367,6 +473,7 @@ class GestionnaireEtats:
         Raises:
             EtatInconnuException: Si etat_depart ou etat_arrivee n'existe pas
         """
+        self._assurer_initialisation()
         try:
             depart = self._resoudre_reference(etat_depart)
             arrivee = self._resoudre_reference(etat_arrivee)
@@ -399,7 +506,47 @@ class GestionnaireEtats:
 
         return ([], False)
 
+    def _precalculer_graphes(self) -> None:
+        """
+        Précalcule les graphes de pathfinding et les états de sortie des chemins.
+
+        Les chemins ne changent plus après le chargement : les graphes certain
+        et complet sont construits une seule fois au lieu de l'être à chaque
+        appel de trouver_chemin().
+        """
+        self._etats_sortie_cache = {
+            id(chemin): self._calculer_etats_sortie(chemin) for chemin in self._chemins
+        }
+        self._graphe_certain = self._calculer_graphe(seulement_certains=True)
+        self._graphe_complet = self._calculer_graphe(seulement_certains=False)
+        self._graphes_inverses = {
+            id(graphe): self._calculer_graphe_inverse(graphe)
+            for graphe in (self._graphe_certain, self._graphe_complet)
+        }
+
+    def _construire_index_chemins(self) -> None:
+        """Indexe les chemins par état de départ et par état d'arrivée possible."""
+        # Le graphe complet est exactement l'index par état de départ
+        self._chemins_par_depart = self._graphe_complet
+
+        self._chemins_par_arrivee = {}
+        for chemin in self._chemins:
+            for etat in dict.fromkeys(self._obtenir_etats_sortie(chemin)):
+                self._chemins_par_arrivee.setdefault(etat, []).append(chemin)
+
     def _construire_graphe(self, seulement_certains: bool = False) -> dict[Etat, list[Chemin]]:
+        """
+        Retourne le graphe précalculé pour le pathfinding.
+
+        Args:
+            seulement_certains: True = ignorer chemins incertains
+
+        Returns:
+            Map associant chaque état aux chemins partant de cet état
+        """
+        return self._graphe_certain if seulement_certains else self._graphe_complet
+
+    def _calculer_graphe(self, seulement_certains: bool = False) -> dict[Etat, list[Chemin]]:
         """
         Construit le graphe pour le pathfinding.
 
@@ -415,20 +562,40 @@ class GestionnaireEtats:
             if seulement_certains and not chemin.est_certain():
                 continue
 
-            etat_depart = chemin.etat_initial
+            graphe.setdefault(chemin.etat_initial, []).append(chemin)
 
-            if etat_depart not in graphe:
-                graphe[etat_depart] = []
+        return graphe
 
-            graphe[etat_depart].append(chemin)
+    def _calculer_graphe_inverse(
+        self, graphe: dict[Etat, list[Chemin]]
+    ) -> dict[Etat, list[tuple[Chemin, Etat]]]:
+        """
+        Construit le graphe inverse d'un graphe de pathfinding.
 
-        return graphe
+        Args:
+            graphe: Pour chaque état, liste des chemins sortants
+
+        Returns:
+            Map associant chaque état aux (chemin, état précédent) qui y mènent
+        """
+        graphe_inverse: dict[Etat, list[tuple[Chemin, Etat]]] = {}
+
+        for etat_depart, chemins in graphe.items():
+            for chemin in chemins:
+                for etat_sortie in self._obtenir_etats_sortie(chemin):
+                    graphe_inverse.setdefault(etat_sortie, []).append((chemin, etat_depart))
+
+        return graphe_inverse
 
     def _bfs_plus_court_chemin(
         self, graphe: dict[Etat, list[Chemin]], depart: Etat, arrivee: Etat
     ) -> Optional[list[Chemin]]:
         """
-        Algorithme BFS pour trouver le plus court chemin.
+        Algorithme BFS bidirectionnel pour trouver le plus court chemin.
+
+        Explore simultanément depuis le départ (graphe) et depuis l'arrivée
+        (graphe inverse), en étendant à chaque tour le niveau complet de la
+        plus petite frontière, jusqu'à la rencontre des deux recherches.
 
         Args:
             graphe: Pour chaque état, liste des chemins sortants
@@ -440,39 +607,153 @@ class GestionnaireEtats:
         """
         max_profondeur = self._config.get("pathfinding", {}).get("max_profondeur", 20)
 
-        file: deque = deque()
-        file.append((depart, []))
-        visites = set()
+        if depart == arrivee:
+            return []
+
+        graphe_inverse = self._graphes_inverses.get(id(graphe))
+        if graphe_inverse is None:
+            graphe_inverse = self._calculer_graphe_inverse(graphe)
+
+        def voisins_avant(etat: Etat):
+            for chemin in graphe.get(etat, []):
+                for etat_suivant in self._obtenir_etats_sortie(chemin):
+                    yield chemin, etat_suivant
+
+        def voisins_arriere(etat: Etat):
+            yield from graphe_inverse.get(etat, [])
+
+        # Pointeurs parents : état → (état voisin côté origine, chemin utilisé)
+        parents_avant: dict[Etat, tuple[Optional[Etat], Optional[Chemin]]] = {
+            depart: (None, None)
+        }
+        parents_arriere: dict[Etat, tuple[Optional[Etat], Optional[Chemin]]] = {
+            arrivee: (None, None)
+        }
+        # Profondeur de chaque état visité, renseignée à l'insertion
+        profondeurs_avant: dict[Etat, int] = {depart: 0}
+        profondeurs_arriere: dict[Etat, int] = {arrivee: 0}
+        frontiere_avant: deque = deque([depart])
+        frontiere_arriere: deque = deque([arrivee])
+        profondeur_avant = 0
+        profondeur_arriere = 0
+
+        while frontiere_avant and frontiere_arriere:
+            # Aucun chemin de longueur <= profondeur_avant + profondeur_arriere
+            if profondeur_avant + profondeur_arriere >= max_profondeur:
+                return None
+
+            if len(frontiere_avant) <= len(frontiere_arriere):
+                rencontre = self._etendre_niveau(
+                    frontiere_avant,
+                    parents_avant,
+                    profondeurs_avant,
+                    profondeurs_arriere,
+                    voisins_avant,
+                )
+                profondeur_avant += 1
+            else:
+                rencontre = self._etendre_niveau(
+                    frontiere_arriere,
+                    parents_arriere,
+                    profondeurs_arriere,
+                    profondeurs_avant,
+                    voisins_arriere,
+                )
+                profondeur_arriere += 1
+
+            if rencontre is not None:
+                longueur = profondeurs_avant[rencontre] + profondeurs_arriere[rencontre]
+                if longueur > max_profondeur:
+                    return None
+
+                chemins = self._reconstruire_chemin(parents_avant, rencontre)
+                chemins.reverse()
+                chemins.extend(self._reconstruire_chemin(parents_arriere, rencontre))
+                return chemins
 
-        while file:
-            etat_actuel, chemin_parcouru = file.popleft()
+        return None
 
-            if len(chemin_parcouru) > max_profondeur:
-                continue
+    @staticmethod
+    def _etendre_niveau(
+        frontiere: deque,
+        parents: dict,
+        profondeurs: dict[Etat, int],
+        profondeurs_opposees: dict[Etat, int],
+        voisins,
+    ) -> Optional[Etat]:
+        """
+        Étend un niveau complet d'une frontière du BFS bidirectionnel.
 
-            if etat_actuel in visites:
-                continue
+        Args:
+            frontiere: File des états du côté étendu
+            parents: Pointeurs parents du côté étendu
+            profondeurs: Profondeurs des états visités du côté étendu
+            profondeurs_opposees: Profondeurs des états visités par la recherche opposée
+            voisins: Fonction état → itérable de (chemin, état voisin)
+
+        Returns:
+            État de rencontre minimisant la longueur totale, ou None
+        """
+        rencontre = None
+        meilleure_longueur = None
 
-            visites.add(etat_actuel)
+        for _ in range(len(frontiere)):
+            etat_actuel = frontiere.popleft()
+            profondeur = profondeurs[etat_actuel] + 1
 
-            if etat_actuel == arrivee:
-                return chemin_parcouru
+            for chemin, etat_voisin in voisins(etat_actuel):
+                if etat_voisin in profondeurs:
+                    continue
 
-            chemins_sortants = graphe.get(etat_actuel, [])
+                parents[etat_voisin] = (etat_actuel, chemin)
+                profondeurs[etat_voisin] = profondeur
+                frontiere.append(etat_voisin)
 
-            for chemin in chemins_sortants:
-                etats_suivants = self._obtenir_etats_sortie(chemin)
+                if etat_voisin in profondeurs_opposees:
+                    longueur = profondeur + profondeurs_opposees[etat_voisin]
+                    if meilleure_longueur is None or longueur < meilleure_longueur:
+                        rencontre = etat_voisin
+                        meilleure_longueur = longueur
 
-                for etat_suivant in etats_suivants:
-                    if etat_suivant not in visites:
-                        nouveau_chemin = chemin_parcouru + [chemin]
-                        file.append((etat_suivant, nouveau_chemin))
+        return rencontre
 
-        return None
+    @staticmethod
+    def _reconstruire_chemin(parents: dict, etat: Etat) -> list[Chemin]:
+        """
+        Remonte les pointeurs parents depuis un état jusqu'à l'origine.
+
+        Args:
+            parents: Pointeurs parents d'un côté du BFS
+            etat: État de départ de la remontée
+
+        Returns:
+            Chemins rencontrés, de l'état vers l'origine de la recherche
+        """
+        chemins = []
+        etat_parent, chemin = parents[etat]
+        while etat_parent is not None:
+            chemins.append(chemin)
+            etat_parent, chemin = parents[etat_parent]
+        return chemins
 
     def _obtenir_etats_sortie(self, chemin: Chemin) -> list[Etat]:
         """
-        Obtient les états de sortie possibles d'un chemin.
+        Obtient les états de sortie possibles d'un chemin (précalculés).
+
+        Args:
+            chemin: Le chemin à analyser
+
+        Returns:
+            Liste des états de sortie possibles
+        """
+        etats_sortie = self._etats_sortie_cache.get(id(chemin))
+        if etats_sortie is None:
+            etats_sortie = self._calculer_etats_sortie(chemin)
+        return etats_sortie
+
+    def _calculer_etats_sortie(self, chemin: Chemin) -> list[Etat]:
+        """
+        Calcule les états de sortie possibles d'un chemin.
 
         Args:
             chemin: Le chemin à analyser
@@ -513,39 +794,51 @@ class GestionnaireEtats:
             AucunEtatTrouve: Si aucun état ne correspond et pas d'EtatInconnuGlobal
             EtatInconnuException: Si un nom d'état dans liste_etats n'existe pas
         """
+        self._assurer_initialisation()
         if liste_etats is None:
-            etats_a_tester = list(self._etats.values())
+            # Liste précalculée et déjà triée : parcourue sans copie
+            etats_a_tester = self._etats_detectables
         else:
-            etats_a_tester = []
+            tas = []
             for e in liste_etats:
                 try:
-                    etats_a_tester.append(self._resoudre_reference(e))
+                    etat = self._resoudre_reference(e)
                 except ErreurValidation as err:
                     raise EtatInconnuException(str(err))
-
-        etats_a_tester = [e for e in etats_a_tester if not isinstance(e, EtatInconnu)]
-
-        def priorite_key(etat: Etat) -> tuple[int, str]:
-            try:
-                idx = self._priorites.index(etat.nom)
-                return (0, idx)
-            except ValueError:
-                return (1, etat.nom)
-
-        etats_a_tester.sort(key=lambda e: priorite_key(e))
+                if not etat.TOUJOURS_FAUX:
+                    tas.append((self._priorite_key(etat), len(tas), etat))
+            # Tas plutôt que tri complet : les états peu prioritaires ne sont
+            # ordonnés que si les premiers verif() échouent
+            heapq.heapify(tas)
+            etats_a_tester = (heapq.heappop(tas)[2] for _ in range(len(tas)))
 
         for etat in etats_a_tester:
             if etat.verif(manoir):
                 self._logger.info(f"État actuel déterminé: {etat.nom}")
                 return etat
 
-        for etat in self._etats.values():
-            if isinstance(etat, EtatInconnu) and not etat.etats_possibles:
-                self._logger.info(f"État actuel: {etat.nom} (fallback EtatInconnuGlobal)")
-                return etat
+        etat = self._fallback_inconnu_global
+        if etat is not None:
+            self._logger.info(f"État actuel: {etat.nom} (fallback EtatInconnuGlobal)")
+            return etat
 
         raise AucunEtatTrouve("Aucun état ne correspond et pas d'EtatInconnuGlobal configuré")
 
+    def _priorite_key(self, etat: Etat) -> tuple[int, Union[int, str]]:
+        """
+        Clé de tri des états selon l'ordre de priorité configuré.
+
+        Args:
+            etat: État à classer
+
+        Returns:
+            (0, rang) pour un état listé dans les priorités, (1, nom) sinon
+        """
+        idx = self._priorite_index.get(etat.nom)
+        if idx is not None:
+            return (0, idx)
+        return (1, etat.nom)
+
     def obtenir_etat(self, nom: str) -> Etat:
         """
         Récupère une instance d'état par son nom.
@@ -559,6 +852,7 @@ class GestionnaireEtats:
         Raises:
             EtatInconnuException: Si nom invalide
         """
+        self._assurer_initialisation()
         if nom not in self._etats:
             raise EtatInconnuException(f"État inconnu: {nom}")
         return self._etats[nom]
@@ -573,8 +867,9 @@ class GestionnaireEtats:
         Returns:
             Liste de Chemin ayant etat comme etat_initial
         """
+        self._assurer_initialisation()
         etat_instance = self._resoudre_reference(etat)
-        return [c for c in self._chemins if c.etat_initial == etat_instance]
+        return list(self._chemins_par_depart.get(etat_instance, ()))
 
     def obtenir_chemins_vers(self, etat: Union[Etat, str]) -> list[Chemin]:
         """
@@ -586,22 +881,18 @@ class GestionnaireEtats:
         Returns:
             Liste de Chemin ayant etat comme etat_sortie possible
         """
+        self._assurer_initialisation()
         etat_instance = self._resoudre_reference(etat)
-        chemins_vers = []
-
-        for chemin in self._chemins:
-            etats_sortie = self._obtenir_etats_sortie(chemin)
-            if etat_instance in etats_sortie:
-                chemins_vers.append(chemin)
-
-        return chemins_vers
+        return list(self._chemins_par_arrivee.get(etat_instance, ()))
 
     @property
     def etats(self) -> dict[str, Etat]:
         """Retourne le dictionnaire des états enregistrés."""
+        self._assurer_initialisation()
         return self._etats.copy()
 
     @property
     def chemins(self) -> list[Chemin]:
         """Retourne la liste des chemins enregistrés."""
+        self._assurer_initialisation()
         return self._chemins.copy()
@@ -4,8 +4,11 @@ Permet aux fenêtres de communiquer entre elles de manière asynchrone.
 Version simple pour commencer, à enrichir plus tard.
 """
 
+import heapq
+import itertools
+import sys
 import time
-from collections import deque
+from collections import defaultdict, deque
 from dataclasses import dataclass, field
 from enum import Enum
 from threading import Lock
@@ -15,6 +18,12 @@ from utils.logger import get_module_logger
 
 logger = get_module_logger("MessageBus")
 
+# Compteur d'identifiants de messages (unique et croissant dans le processus)
+_msg_id_counter = itertools.count()
+
+# __slots__ générés par dataclass (disponible à partir de Python 3.10)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
 
 class MessageType(Enum):
     """Types de messages possibles"""
@@ -43,7 +52,7 @@ class MessageType(Enum):
     COMMANDE = "commande"  # Commande directe
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Message:
     """Représente un message inter-fenêtres
 
@@ -63,15 +72,29 @@ class Message:
     type_msg: MessageType
     contenu: Any = None
     timestamp: float = field(default_factory=time.time)
-    id: str = field(default_factory=lambda: f"{time.time():.6f}")
+    id: int = field(default_factory=lambda: next(_msg_id_counter))
     lu: bool = False
     expire: Optional[float] = None
+    # Valeur internée de type_msg (comparaison par identité dans les filtres)
+    _tv: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._tv = sys.intern(self.type_msg.value)
 
     def is_expired(self):
         """Vérifie si le message a expiré"""
-        if self.expire is None:
-            return False
-        return time.time() > self.expire
+        return self.is_expired_at(time.time())
+
+    def is_expired_at(self, now):
+        """Vérifie si le message est expiré à un instant donné
+
+        Args:
+            now: Timestamp de référence (évite un time.time() par message)
+
+        Returns:
+            bool: True si expiré à cet instant
+        """
+        return self.expire is not None and now > self.expire
 
     def is_for(self, fenetre_id):
         """Vérifie si le message est destiné à une fenêtre
@@ -102,14 +125,25 @@ class Message:
 
     @classmethod
     def from_dict(cls, data):
-        """Crée un message depuis un dictionnaire"""
+        """Crée un message depuis un dictionnaire
+
+        Accepte les anciens identifiants textuels : numériques, ils sont
+        convertis en entier, sinon (timestamp formaté) remplacés par un nouvel
+        identifiant, les messages étant fusionnés par id entier.
+        """
+        msg_id = data.get("id")
+        if isinstance(msg_id, str) and msg_id.isdigit():
+            msg_id = int(msg_id)
+        elif not isinstance(msg_id, int):
+            msg_id = next(_msg_id_counter)
+
         return cls(
             source=data["source"],
             destination=data.get("destination"),
             type_msg=MessageType(data["type_msg"]),
             contenu=data.get("contenu"),
             timestamp=data.get("timestamp", time.time()),
-            id=data.get("id", f"{time.time():.6f}"),
+            id=msg_id,
             lu=data.get("lu", False),
             expire=data.get("expire"),
         )
@@ -119,11 +153,39 @@ class Message:
         return f"Message({self.source}->{dest}, {self.type_msg.value})"
 
 
+def _type_value(type_filter):
+    """Retourne la valeur internée d'un filtre de type (None si pas de filtre)"""
+    return sys.intern(type_filter.value) if type_filter else None
+
+
+def _match(msg, fenetre_id, tf, now):
+    """Vérifie si un message non lu et non expiré est destiné à une fenêtre
+
+    Args:
+        msg: Message à tester
+        fenetre_id: ID de la fenêtre
+        tf: Valeur internée du type filtré (voir _type_value), None = tous
+        now: Timestamp de référence pour l'expiration
+
+    Returns:
+        bool: True si le message correspond
+    """
+    if msg.lu or (msg.expire is not None and now > msg.expire):
+        return False
+    if not msg.is_for(fenetre_id):
+        return False
+    return tf is None or msg._tv is tf
+
+
 class MessageBus:
     """Bus de messages pour communication inter-fenêtres
 
     Permet d'envoyer des messages entre fenêtres de manière asynchrone.
     Les messages sont stockés jusqu'à lecture ou expiration.
+
+    En plus de la file principale, les messages sont indexés par destination
+    (les broadcasts à part) et par type, dans l'ordre d'arrivée, pour que les
+    requêtes d'une fenêtre ne parcourent pas toute la file.
     """
 
     MAX_MESSAGES = 1000  # Limite de messages en file
@@ -133,7 +195,82 @@ class MessageBus:
         """Initialise le bus de messages"""
         self._messages = deque(maxlen=self.MAX_MESSAGES)
         self._lock = Lock()
-        self._subscribers = {}  # {fenetre_id: callback}
+        # {fenetre_id: callback} - copie à l'écriture, lecture sans verrou
+        self._subscribers = {}
+        self._sub_lock = Lock()
+
+        # Index secondaires (mêmes objets Message, ordre d'arrivée)
+        self._par_destination = defaultdict(deque)  # {fenetre_id: deque[Message]}
+        self._broadcasts = deque()  # Messages sans destination
+        self._par_type = defaultdict(deque)  # {MessageType: deque[Message]}
+
+        # True tant que les expirations sont croissantes dans l'ordre de la file
+        self._expiration_monotone = True
+        self._derniere_expiration = 0.0
+
+    def _indexer(self, msg):
+        """Ajoute un message aux index secondaires (PROTÉGÉ, sous verrou)"""
+        if msg.destination is None:
+            self._broadcasts.append(msg)
+        else:
+            self._par_destination[msg.destination].append(msg)
+        self._par_type[msg.type_msg].append(msg)
+
+    def _retirer_plus_ancien(self):
+        """Retire le plus ancien message de la file et des index (PROTÉGÉ, sous verrou)
+
+        Le plus ancien message de la file est aussi le premier de chacun de
+        ses index, qui respectent le même ordre d'arrivée.
+        """
+        msg = self._messages.popleft()
+
+        if msg.destination is None:
+            self._broadcasts.popleft()
+        else:
+            directs = self._par_destination[msg.destination]
+            directs.popleft()
+            if not directs:
+                del self._par_destination[msg.destination]
+
+        par_type = self._par_type[msg.type_msg]
+        par_type.popleft()
+        if not par_type:
+            del self._par_type[msg.type_msg]
+
+    def _reindexer(self):
+        """Reconstruit les index depuis la file principale (PROTÉGÉ, sous verrou)"""
+        self._par_destination.clear()
+        self._broadcasts.clear()
+        self._par_type.clear()
+        for msg in self._messages:
+            self._indexer(msg)
+
+    def _candidats(self, fenetre_id, type_filter):
+        """Retourne les messages pouvant concerner une fenêtre (PROTÉGÉ, sous verrou)
+
+        Utilise l'index par type s'il est plus petit que messages directs +
+        broadcasts. L'ordre d'arrivée est conservé.
+
+        Args:
+            fenetre_id: ID de la fenêtre
+            type_filter: Type de message filtré (optionnel)
+
+        Returns:
+            Iterable[Message]: Messages candidats (à filtrer)
+        """
+        directs = self._par_destination.get(fenetre_id, ())
+        broadcasts = self._broadcasts
+
+        if type_filter:
+            par_type = self._par_type.get(type_filter, ())
+            if len(par_type) < len(directs) + len(broadcasts):
+                return par_type
+
+        if not broadcasts:
+            return directs
+        if not directs:
+            return broadcasts
+        return heapq.merge(directs, broadcasts, key=lambda m: m.id)
 
     def send(self, source, destination, type_msg, contenu=None, expire=None):
         """Envoie un message
@@ -159,14 +296,21 @@ class MessageBus:
         )
 
         with self._lock:
+            if len(self._messages) >= self.MAX_MESSAGES:
+                self._retirer_plus_ancien()
+            if expire_time < self._derniere_expiration:
+                self._expiration_monotone = False
+            self._derniere_expiration = expire_time
             self._messages.append(msg)
+            self._indexer(msg)
 
         logger.debug(f"Message envoyé: {msg}")
 
-        # Notifier le subscriber si présent
-        if destination and destination in self._subscribers:
+        # Notifier le subscriber si présent (hors verrou)
+        callback = self._subscribers.get(destination) if destination else None
+        if callback is not None:
             try:
-                self._subscribers[destination](msg)
+                callback(msg)
             except Exception as e:
                 logger.error(f"Erreur callback subscriber {destination}: {e}")
 
@@ -215,12 +359,10 @@ class MessageBus:
         result = []
 
         with self._lock:
-            for msg in self._messages:
-                if msg.is_expired() or msg.lu:
-                    continue
-                if not msg.is_for(fenetre_id):
-                    continue
-                if type_filter and msg.type_msg != type_filter:
+            now = time.time()
+            tf = _type_value(type_filter)
+            for msg in self._candidats(fenetre_id, type_filter):
+                if not _match(msg, fenetre_id, tf, now):
                     continue
 
                 result.append(msg)
@@ -240,14 +382,11 @@ class MessageBus:
             bool: True si des messages attendent
         """
         with self._lock:
-            for msg in self._messages:
-                if msg.is_expired() or msg.lu:
-                    continue
-                if not msg.is_for(fenetre_id):
-                    continue
-                if type_filter and msg.type_msg != type_filter:
-                    continue
-                return True
+            now = time.time()
+            tf = _type_value(type_filter)
+            for msg in self._candidats(fenetre_id, type_filter):
+                if _match(msg, fenetre_id, tf, now):
+                    return True
         return False
 
     def peek_messages(self, fenetre_id, type_filter=None):
@@ -272,7 +411,14 @@ class MessageBus:
         Returns:
             int: Nombre de messages
         """
-        return len(self.peek_messages(fenetre_id, type_filter))
+        cnt = 0
+        with self._lock:
+            now = time.time()
+            tf = _type_value(type_filter)
+            for msg in self._candidats(fenetre_id, type_filter):
+                if _match(msg, fenetre_id, tf, now):
+                    cnt += 1
+        return cnt
 
     def subscribe(self, fenetre_id, callback):
         """Abonne une fenêtre pour recevoir des notifications
@@ -281,7 +427,8 @@ class MessageBus:
             fenetre_id: ID de la fenêtre
             callback: Fonction à appeler (reçoit Message en paramètre)
         """
-        self._subscribers[fenetre_id] = callback
+        with self._sub_lock:
+            self._subscribers = {**self._subscribers, fenetre_id: callback}
         logger.debug(f"Fenêtre {fenetre_id} abonnée au bus")
 
     def unsubscribe(self, fenetre_id):
@@ -290,21 +437,48 @@ class MessageBus:
         Args:
             fenetre_id: ID de la fenêtre
         """
-        if fenetre_id in self._subscribers:
-            del self._subscribers[fenetre_id]
-            logger.debug(f"Fenêtre {fenetre_id} désabonnée")
+        with self._sub_lock:
+            if fenetre_id not in self._subscribers:
+                return
+            subscribers = dict(self._subscribers)
+            del subscribers[fenetre_id]
+            self._subscribers = subscribers
+        logger.debug(f"Fenêtre {fenetre_id} désabonnée")
 
     def clear_expired(self):
-        """Supprime les messages expirés"""
+        """Supprime les messages expirés
+
+        Si les expirations sont croissantes dans la file (cas des durées de vie
+        par défaut), seuls les messages expirés en tête sont retirés. Sinon la
+        file est reconstruite.
+        """
         with self._lock:
-            # Créer une nouvelle deque avec seulement les messages valides
-            valid = [m for m in self._messages if not m.is_expired()]
-            self._messages = deque(valid, maxlen=self.MAX_MESSAGES)
+            now = time.time()
+            messages = self._messages
+
+            if self._expiration_monotone:
+                while messages and messages[0].is_expired_at(now):
+                    self._retirer_plus_ancien()
+            else:
+                # Créer une nouvelle deque avec seulement les messages valides
+                valid = [m for m in messages if not m.is_expired_at(now)]
+                self._messages = deque(valid, maxlen=self.MAX_MESSAGES)
+                self._reindexer()
+
+            if not self._messages:
+                self._reinitialiser_expiration()
+
+    def _reinitialiser_expiration(self):
+        """Réinitialise le suivi d'ordre des expirations (PROTÉGÉ, sous verrou)"""
+        self._expiration_monotone = True
+        self._derniere_expiration = 0.0
 
     def clear_all(self):
         """Supprime tous les messages"""
         with self._lock:
             self._messages.clear()
+            self._reindexer()
+            self._reinitialiser_expiration()
         logger.debug("Bus de messages vidé")
 
     def clear_for(self, fenetre_id):
@@ -317,6 +491,7 @@ class MessageBus:
             self._messages = deque(
                 [m for m in self._messages if not m.is_for(fenetre_id)], maxlen=self.MAX_MESSAGES
             )
+            self._reindexer()
 
     def __len__(self):
         return len(self._messages)
@@ -14,6 +14,29 @@ from core.etat_inconnu import EtatInconnu
 if TYPE_CHECKING:
     from manoirs.manoir_base import ManoirBase
 
+# Groupes d'un popup sans groupe déclaré (partagé, jamais modifié en place)
+_POPUP_GROUPES = ["popup"]
+
+# Classes d'actions utilisées pour fermer les popups, importées au premier besoin
+_classes_actions: Optional[tuple[type, type, type]] = None
+
+
+def _obtenir_classes_actions() -> tuple[type, type, type]:
+    """
+    Retourne les classes d'actions de fermeture, importées une seule fois.
+
+    Returns:
+        Tuple (ActionSimple, ActionBouton, ActionReprisePreparerTour)
+    """
+    global _classes_actions
+    if _classes_actions is None:
+        from actions.action import ActionSimple
+        from actions.action_reprise_preparer_tour import ActionReprisePreparerTour
+        from actions.simple.action_bouton import ActionBouton
+
+        _classes_actions = (ActionSimple, ActionBouton, ActionReprisePreparerTour)
+    return _classes_actions
+
 
 class Popup(Etat):
     """
@@ -34,6 +57,9 @@ class Popup(Etat):
         - Si position_fermeture est défini, il a priorité sur l'image
         - Les états de sortie sont calculés automatiquement par le GestionnaireEtats
           à partir des groupes définis dans le TOML + etats_possibles_extra
+        - Les attributs de configuration restent des attributs de classe (pas de
+          __slots__) : chaque sous-classe les redéfinit, et le Singleton limite
+          déjà chaque popup à une seule instance
     """
 
     image_detection: str = None
@@ -46,8 +72,11 @@ class Popup(Etat):
         """Initialise le popup."""
         super().__init__()
         # Par défaut, les popups sont dans le groupe "popup"
-        if "popup" not in self.groupes:
-            self.groupes = self.groupes + ["popup"]
+        groupes = self.groupes
+        if "popup" not in groupes:
+            self.groupes = [*groupes, "popup"] if groupes else _POPUP_GROUPES
+        # Chemin de fermeture, créé au premier appel de generer_chemin()
+        self._chemin: Optional[CheminPopup] = None
 
     def verif(self, manoir: "ManoirBase") -> bool:
         """
@@ -67,10 +96,16 @@ class Popup(Etat):
         """
         Génère le chemin de fermeture pour ce popup.
 
+        Le chemin est créé une seule fois puis réutilisé : les modifications
+        ultérieures (etat_sortie résolu par le GestionnaireEtats) portent donc
+        sur la même instance.
+
         Returns:
             Instance de CheminPopup configurée pour fermer ce popup
         """
-        return CheminPopup(self)
+        if self._chemin is None:
+            self._chemin = CheminPopup(self)
+        return self._chemin
 
 
 class CheminPopup(Chemin):
@@ -100,21 +135,49 @@ class CheminPopup(Chemin):
         self.etat_initial = popup.nom
         # etat_sortie sera défini par GestionnaireEtats._resoudre_groupes_sortie()
         self.etat_sortie = EtatInconnu(etats_possibles=[])
+        # Actions de fermeture par manoir : {id(manoir): (manoir, actions)}
+        self._actions: dict[int, tuple[Any, list[Any]]] = {}
 
     def fonction_actions(self, manoir: Any) -> list[Any]:
         """
         Génère les actions pour fermer le popup.
 
+        Les actions sont construites une fois par manoir puis réutilisées
+        (voir invalider_actions()).
+
         Args:
             manoir: Instance du manoir
 
         Returns:
             Liste d'actions pour fermer le popup
         """
-        from actions.simple.action_simple import ActionSimple
+        entree = self._actions.get(id(manoir))
+        if entree is None or entree[0] is not manoir:
+            entree = (manoir, self._construire_actions(manoir))
+            self._actions[id(manoir)] = entree
+        # Copie : l'appelant peut modifier sa liste sans toucher au cache
+        return list(entree[1])
+
+    def invalider_actions(self) -> None:
+        """
+        Oublie les actions construites.
 
-        from actions.action_reprise_preparer_tour import ActionReprisePreparerTour
-        from actions.simple.action_bouton import ActionBouton
+        À appeler si la configuration du popup (position_fermeture,
+        image_fermeture...) est modifiée en cours d'exécution.
+        """
+        self._actions.clear()
+
+    def _construire_actions(self, manoir: Any) -> list[Any]:
+        """
+        Construit les actions de fermeture pour un manoir.
+
+        Args:
+            manoir: Instance du manoir
+
+        Returns:
+            Liste d'actions pour fermer le popup
+        """
+        ActionSimple, ActionBouton, ActionReprisePreparerTour = _obtenir_classes_actions()
 
         actions = []
 
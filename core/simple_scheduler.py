@@ -9,17 +9,39 @@ Logique :
 - Quand plus aucune action prioritaire n'est prête, on passe au niveau normal
 """
 
+import heapq
+import sys
+import time
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 from utils.logger import get_module_logger
 
 logger = get_module_logger("SimpleScheduler")
 
+# __slots__ générés par dataclass (disponible à partir de Python 3.10)
+_DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+# Temps renvoyé par un manoir sans action sur un niveau
+_INF = float("inf")
+
+# Au-delà de ce nombre de candidats, le gagnant est choisi avec numpy
+SEUIL_VECTORISATION = 128
+
+# Libellés de niveau dans les logs de sélection
+_LABEL_PRIORITAIRE = "PRIORITAIRE"
+_LABEL_NORMAL = "NORMAL"
+
+# Méthode de passage interrogée pour chaque niveau : {prioritaire: nom}
+_METHODES_PASSAGE = {
+    True: "get_prochain_passage_prioritaire",
+    False: "get_prochain_passage_normal",
+}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class ManoirSelection:
-    """Résultat de sélection d'un manoir
+    """Résultat de sélection d'un manoir (immuable)
 
     Attributes:
         manoir_id: ID du manoir sélectionné
@@ -44,6 +66,42 @@ class ManoirSelection:
         return f"ManoirSelection({self.manoir_id}, [{niveau_str}] dans {self.temps_avant_passage:.1f}s, priorité={self.priorite})"
 
 
+def _meilleur(
+    candidats: list[ManoirSelection],
+    cle_principale: Callable[[ManoirSelection], float],
+    cle_secondaire: Callable[[ManoirSelection], float],
+) -> ManoirSelection:
+    """Retourne le premier candidat minimisant (cle_principale, cle_secondaire)
+
+    Équivalent à min(candidats, key=...) ; au-delà de SEUIL_VECTORISATION
+    candidats, la comparaison est faite par numpy (importé à ce moment-là,
+    s'il est installé) sur deux tableaux de clés.
+
+    Args:
+        candidats: Liste non vide de sélections
+        cle_principale: Clé comparée en premier
+        cle_secondaire: Clé départageant les égalités sur la clé principale
+
+    Returns:
+        Sélection gagnante
+    """
+    n = len(candidats)
+    if n > SEUIL_VECTORISATION:
+        try:
+            import numpy as np
+        except ImportError:
+            pass
+        else:
+            principales = np.fromiter(map(cle_principale, candidats), dtype=np.float64, count=n)
+            secondaires = np.fromiter(map(cle_secondaire, candidats), dtype=np.float64, count=n)
+
+            # Candidats à égalité sur la clé principale, puis premier minimum secondaire
+            egaux = np.flatnonzero(principales == principales.min())
+            return candidats[int(egaux[np.argmin(secondaires[egaux])])]
+
+    return min(candidats, key=lambda s: (cle_principale(s), cle_secondaire(s)))
+
+
 class SimpleScheduler:
     """Ordonnanceur à deux niveaux
 
@@ -63,54 +121,241 @@ class SimpleScheduler:
         - float('inf') ou None : pas d'action de ce type
     """
 
-    def __init__(self):
-        """Initialise l'ordonnanceur"""
-        pass
+    def __init__(
+        self, seuil_famine: int = 10, bonus_famine: int = 1, ttl_selection: float = 0
+    ):
+        """Initialise l'ordonnanceur
+
+        Args:
+            seuil_famine: Nombre de passages manqués (en étant prêt) pour
+                gagner un palier de priorité
+            bonus_famine: Priorité ajoutée à chaque palier
+            ttl_selection: Durée (secondes) pendant laquelle selectionner_manoir()
+                renvoie la dernière sélection sans réinterroger les manoirs
+                (0 = jamais)
+        """
+        # Dernière sélection : (id(manoirs), instant monotone, sélection)
+        self.ttl_selection = ttl_selection
+        self._derniere_selection: Optional[tuple[int, float, Optional[ManoirSelection]]] = None
+
+        # Vieillissement : {manoir_id: passages manqués alors que prêt}
+        self.seuil_famine = max(1, seuil_famine)
+        self.bonus_famine = bonus_famine
+        self._famine: dict[str, int] = {}
+
+        # Temps virtuel (équité pondérée) : {manoir_id: passages / poids}
+        self._temps_virtuel: dict[str, float] = {}
+
+        # Cache des collectes du tour courant : {id(manoirs): (prioritaires, normales)}
+        # Actif uniquement entre deux appels à nouveau_tour()
+        self._cache: dict[int, tuple[list[ManoirSelection], list[ManoirSelection]]] = {}
+        self._tour = 0
+
+        # Présence des méthodes de passage par classe : {(type, prioritaire): bool}
+        self._methodes_presentes: dict[tuple[type, bool], bool] = {}
+
+    def nouveau_tour(self):
+        """Démarre un nouveau tour d'ordonnancement
+
+        Les temps de passage des manoirs sont interrogés au plus une fois par
+        niveau jusqu'au prochain appel : selectionner_manoir(),
+        get_temps_attente(), get_classement() et a_prioritaire_pret() partagent
+        les mêmes collectes pendant le tour. Sans appel à nouveau_tour(), aucun
+        cache n'est utilisé. La sélection mémorisée (ttl_selection) est oubliée.
+        """
+        self.invalidate()
+        self._tour += 1
+
+    def invalidate(self):
+        """Oublie la sélection mémorisée et les collectes du tour courant
+
+        À appeler quand l'état d'un manoir change (popup apparu, action
+        terminée...) pour forcer une nouvelle interrogation des manoirs.
+        """
+        self._cache = {}
+        self._derniere_selection = None
+
+    def _implemente(self, manoir: Any, prioritaire: bool) -> bool:
+        """Indique si le manoir implémente la méthode de passage d'un niveau (PROTÉGÉ)
+
+        Le résultat est mémorisé par classe de manoir.
+
+        Args:
+            manoir: Instance du manoir
+            prioritaire: True pour get_prochain_passage_prioritaire,
+                False pour get_prochain_passage_normal
+
+        Returns:
+            True si la méthode existe
+        """
+        cle = (type(manoir), prioritaire)
+        present = self._methodes_presentes.get(cle)
+        if present is None:
+            present = hasattr(manoir, _METHODES_PASSAGE[prioritaire])
+            self._methodes_presentes[cle] = present
+        return present
+
+    def _priorite_effective(self, selection: ManoirSelection) -> int:
+        """Priorité statique augmentée du vieillissement (PROTÉGÉ)
+
+        Args:
+            selection: Sélection candidate
+
+        Returns:
+            Priorité utilisée pour départager les candidats
+        """
+        manques = self._famine.get(selection.manoir_id, 0)
+        return selection.priorite + (manques // self.seuil_famine) * self.bonus_famine
+
+    def _enregistrer_passage(
+        self, meilleur: ManoirSelection, candidats: list[ManoirSelection]
+    ):
+        """Met à jour les compteurs de famine après une sélection (PROTÉGÉ)
+
+        Chaque manoir prêt mais non retenu prend un passage manqué,
+        le manoir retenu repart de zéro.
+
+        Args:
+            meilleur: Sélection retenue
+            candidats: Sélections collectées pendant ce choix
+        """
+        retenu = meilleur.manoir_id
+        oublies = {s.manoir_id for s in candidats if s.pret and s.manoir_id != retenu}
+        for manoir_id in oublies:
+            self._famine[manoir_id] = self._famine.get(manoir_id, 0) + 1
+        self._famine.pop(retenu, None)
+
+        # Les prioritaires prêts jamais servis entrent au plancher, puis le
+        # manoir servi avance de 1 / poids (poids = priorité statique, au moins 1)
+        virtuel = self._temps_virtuel
+        plancher = self._plancher_virtuel()
+        for s in candidats:
+            if s.pret and s.est_prioritaire:
+                virtuel.setdefault(s.manoir_id, plancher)
+        virtuel[retenu] = virtuel.get(retenu, plancher) + 1.0 / max(1, meilleur.priorite)
+
+    def _oublier_absents(self, manoirs: dict[str, Any]):
+        """Oublie la famine et le temps virtuel des manoirs retirés (PROTÉGÉ)
+
+        Un manoir retiré ne fixe plus le plancher virtuel, et repart du
+        plancher s'il est ajouté à nouveau.
+
+        Args:
+            manoirs: Dictionnaire {manoir_id: manoir}
+        """
+        for etat in (self._temps_virtuel, self._famine):
+            if not etat.keys() <= manoirs.keys():
+                for manoir_id in etat.keys() - manoirs.keys():
+                    del etat[manoir_id]
+
+    def _plancher_virtuel(self) -> float:
+        """Temps virtuel attribué à un manoir jamais servi (PROTÉGÉ)
+
+        Un nouveau manoir part du plus petit temps virtuel connu, pour ne pas
+        monopoliser l'ordonnanceur le temps de rattraper les autres.
+
+        Returns:
+            Plus petit temps virtuel connu (0.0 si aucun)
+        """
+        return min(self._temps_virtuel.values(), default=0.0)
 
     def _collecter_selections(
         self, manoirs: dict[str, Any], prioritaire: bool
     ) -> list[ManoirSelection]:
-        """Collecte les sélections pour un niveau donné (PROTÉGÉ)
+        """Retourne les sélections d'un niveau donné (PROTÉGÉ)
+
+        Args:
+            manoirs: Dictionnaire {manoir_id: manoir}
+            prioritaire: True pour les prioritaires, False pour les normales
+
+        Returns:
+            Liste de ManoirSelection pour ce niveau (à ne pas modifier)
+        """
+        prioritaires, normales = self._classement(manoirs)
+        return prioritaires if prioritaire else normales
+
+    def _classement(
+        self, manoirs: dict[str, Any], arret_normal: bool = False
+    ) -> tuple[list[ManoirSelection], list[ManoirSelection]]:
+        """Retourne les collectes des deux niveaux (PROTÉGÉ)
+
+        Réutilise la collecte du tour courant si elle existe (voir nouveau_tour).
+        Une collecte partielle (voir _collecter_tous) n'est jamais mise en cache.
 
         Args:
             manoirs: Dictionnaire {manoir_id: manoir}
-            prioritaire: True pour collecter les prioritaires, False pour les normales
+            arret_normal: Transmis à _collecter_tous
 
         Returns:
-            Liste de ManoirSelection pour ce niveau
+            Tuple (prioritaires, normales) (listes à ne pas modifier)
         """
-        selections = []
-        niveau_str = "prioritaire" if prioritaire else "normal"
+        cle = id(manoirs)
+        if self._tour:
+            collecte = self._cache.get(cle)
+            if collecte is not None:
+                return collecte
+
+        collecte = self._collecter_tous(manoirs, arret_normal)
+        if self._tour and not (arret_normal and any(s.pret for s in collecte[0])):
+            self._cache[cle] = collecte
+        return collecte
+
+    def _collecter_tous(
+        self, manoirs: dict[str, Any], arret_normal: bool = False
+    ) -> tuple[list[ManoirSelection], list[ManoirSelection]]:
+        """Interroge chaque manoir sur ses deux niveaux en une seule passe (PROTÉGÉ)
+
+        Args:
+            manoirs: Dictionnaire {manoir_id: manoir}
+            arret_normal: Si True, le niveau normal n'est plus interrogé dès
+                qu'un prioritaire prêt est trouvé (normales alors partielles)
+
+        Returns:
+            Tuple (prioritaires, normales) de ManoirSelection
+        """
+        prioritaires = []
+        normales = []
+        prioritaire_pret = False
+
+        # Paramètres de chaque niveau, calculés hors de la boucle
+        niveaux = (
+            (True, _METHODES_PASSAGE[True], "prioritaire", prioritaires),
+            (False, _METHODES_PASSAGE[False], "normal", normales),
+        )
 
         for manoir_id, manoir in manoirs.items():
-            try:
-                if prioritaire:
-                    temps = manoir.get_prochain_passage_prioritaire()
-                else:
-                    temps = manoir.get_prochain_passage_normal()
+            priorite_statique = getattr(manoir, "priorite", 0)
+
+            for prioritaire, nom_methode, niveau_str, selections in niveaux:
+                # Niveau normal inutile : un prioritaire prêt sera sélectionné
+                if prioritaire_pret and not prioritaire:
+                    break
 
-                # Ignorer si pas d'action (None ou inf)
-                if temps is None or temps == float("inf"):
+                # Méthode non implémentée : ignorer ce niveau pour ce manoir
+                if not self._implemente(manoir, prioritaire):
                     continue
 
-                priorite_statique = getattr(manoir, "priorite", 0)
+                try:
+                    temps = getattr(manoir, nom_methode)()
 
-                selection = ManoirSelection(
-                    manoir_id=manoir_id,
-                    temps_avant_passage=temps,
-                    priorite=priorite_statique,
-                    est_prioritaire=prioritaire,
-                    pret=(temps <= 0),
-                )
-                selections.append(selection)
+                    # Ignorer si pas d'action (None ou inf)
+                    if temps is not None and temps < _INF:
+                        selections.append(
+                            ManoirSelection(
+                                manoir_id=manoir_id,
+                                temps_avant_passage=temps,
+                                priorite=priorite_statique,
+                                est_prioritaire=prioritaire,
+                                pret=(temps <= 0),
+                            )
+                        )
+                        if arret_normal and prioritaire and temps <= 0:
+                            prioritaire_pret = True
 
-            except AttributeError:
-                # Méthode non implémentée, ignorer ce niveau pour ce manoir
-                pass
-            except Exception as e:
-                logger.error(f"Erreur collecte {niveau_str} pour {manoir_id}: {e}")
+                except Exception as e:
+                    logger.error(f"Erreur collecte {niveau_str} pour {manoir_id}: {e}")
 
-        return selections
+        return prioritaires, normales
 
     def selectionner_manoir(self, manoirs: dict[str, Any]) -> Optional[ManoirSelection]:
         """Sélectionne le manoir à traiter
@@ -120,76 +365,155 @@ class SimpleScheduler:
         2. Si au moins un est prêt (temps <= 0) → sélectionner parmi les prioritaires
         3. Sinon → sélectionner parmi les normales
 
+        Entre prioritaires prêts, le manoir le moins servi au regard de sa
+        priorité (temps virtuel = passages / priorité) l'emporte : chacun
+        progresse, en proportion de sa priorité.
+
+        À égalité, la priorité statique est augmentée de bonus_famine
+        tous les seuil_famine passages manqués alors que le manoir était prêt,
+        pour qu'un manoir de faible priorité ne soit pas écarté indéfiniment.
+
+        Le résultat est réutilisé pendant ttl_selection secondes pour le même
+        dictionnaire de manoirs (voir invalidate()).
+
         Args:
             manoirs: Dictionnaire {manoir_id: manoir}
 
         Returns:
             ManoirSelection ou None si aucun manoir
         """
+        cle = id(manoirs)
+        maintenant = time.monotonic()
+        derniere = self._derniere_selection
+        if (
+            derniere is not None
+            and derniere[0] == cle
+            and maintenant - derniere[1] < self.ttl_selection
+        ):
+            return derniere[2]
+
+        selection = self._selectionner(manoirs)
+        self._derniere_selection = (cle, maintenant, selection)
+        return selection
+
+    def _selectionner(self, manoirs: dict[str, Any]) -> Optional[ManoirSelection]:
+        """Sélectionne le manoir à traiter, sans mémorisation (PROTÉGÉ)
+
+        Le manoir retenu, s'il est prêt, est compté comme servi (famine,
+        temps virtuel).
+
+        Args:
+            manoirs: Dictionnaire {manoir_id: manoir}
+
+        Returns:
+            ManoirSelection ou None si aucun manoir
+        """
+        self._oublier_absents(manoirs)
+        meilleur, candidats = self._choisir(manoirs)
+        if meilleur is None:
+            return None
+
+        if meilleur.pret:
+            self._enregistrer_passage(meilleur, candidats)
+        niveau_str = _LABEL_PRIORITAIRE if meilleur.est_prioritaire else _LABEL_NORMAL
+        # Formatage paresseux : repr(meilleur) calculé seulement si le log est émis
+        logger.info("[%s] Manoir sélectionné: %s", niveau_str, meilleur)
+
+        return meilleur
+
+    def _choisir(
+        self, manoirs: dict[str, Any]
+    ) -> tuple[Optional[ManoirSelection], list[ManoirSelection]]:
+        """Choisit le manoir à traiter, sans modifier l'état de l'ordonnanceur (PROTÉGÉ)
+
+        Args:
+            manoirs: Dictionnaire {manoir_id: manoir}
+
+        Returns:
+            Tuple (sélection ou None, candidats départagés : ceux qui étaient
+            prêts sans être retenus prennent un passage manqué si la sélection
+            est enregistrée)
+        """
         if not manoirs:
             logger.debug("Aucun manoir à sélectionner")
-            return None
+            return None, []
 
-        # 1. Collecter les prioritaires
-        prioritaires = self._collecter_selections(manoirs, prioritaire=True)
+        # 1. Collecter les deux niveaux en une seule passe
+        #    (niveau normal abandonné dès qu'un prioritaire est prêt)
+        prioritaires, normales = self._classement(manoirs, arret_normal=True)
 
         # 2. Vérifier si un prioritaire est prêt
         prioritaires_prets = [s for s in prioritaires if s.pret]
 
         if prioritaires_prets:
-            # Trier par priorité décroissante (temps = 0 pour tous)
-            prioritaires_prets.sort(key=lambda s: -s.priorite)
-            meilleur = prioritaires_prets[0]
-            logger.info(f"[PRIORITAIRE] Manoir sélectionné: {meilleur}")
-            return meilleur
+            # Le moins servi au regard de son poids (jamais servi : le plancher),
+            # puis priorité effective la plus haute (temps = 0 pour tous)
+            virtuel = self._temps_virtuel
+            plancher = self._plancher_virtuel()
+            priorite_effective = self._priorite_effective
+            meilleur = _meilleur(
+                prioritaires_prets,
+                lambda s: virtuel.get(s.manoir_id, plancher),
+                lambda s: -priorite_effective(s),
+            )
+            # Seuls les prioritaires vieillissent : les normales sont partielles
+            # (collecte arrêtée au premier prioritaire prêt)
+            return meilleur, prioritaires
 
         # 3. Aucun prioritaire prêt → passer au niveau normal
-        normales = self._collecter_selections(manoirs, prioritaire=False)
-
         # Combiner prioritaires non prêts + normales pour choisir le plus proche
         tous = prioritaires + normales
 
         if not tous:
             logger.debug("Aucune action disponible")
-            return None
-
-        # Trier par temps croissant, puis priorité décroissante
-        tous.sort(key=lambda s: (s.temps_avant_passage, -s.priorite))
-
-        meilleur = tous[0]
-        niveau_str = "PRIORITAIRE" if meilleur.est_prioritaire else "NORMAL"
-        logger.info(f"[{niveau_str}] Manoir sélectionné: {meilleur}")
-
-        return meilleur
-
-    def get_classement(self, manoirs: dict[str, Any]) -> dict[str, list[ManoirSelection]]:
+            return None, []
+
+        # Temps le plus court, puis priorité effective la plus haute
+        priorite_effective = self._priorite_effective
+        meilleur = _meilleur(
+            tous, lambda s: s.temps_avant_passage, lambda s: -priorite_effective(s)
+        )
+        return meilleur, tous
+
+    def get_classement(
+        self, manoirs: dict[str, Any], top: Optional[int] = None
+    ) -> dict[str, list[ManoirSelection]]:
         """Retourne le classement complet par niveau
 
         Args:
             manoirs: Dictionnaire {manoir_id: manoir}
+            top: Si fourni, ne garder que les top premiers de chaque niveau
 
         Returns:
             Dict avec clés 'prioritaire' et 'normal', chacune contenant une liste triée
         """
-        prioritaires = self._collecter_selections(manoirs, prioritaire=True)
-        normales = self._collecter_selections(manoirs, prioritaire=False)
+        prioritaires, normales = self._classement(manoirs)
+
+        def cle(s):
+            return (s.temps_avant_passage, -s.priorite)
 
-        # Trier chaque niveau
-        prioritaires.sort(key=lambda s: (s.temps_avant_passage, -s.priorite))
-        normales.sort(key=lambda s: (s.temps_avant_passage, -s.priorite))
+        # Trier chaque niveau (copies : les collectes peuvent être en cache)
+        if top is None:
+            prioritaires = sorted(prioritaires, key=cle)
+            normales = sorted(normales, key=cle)
+        else:
+            prioritaires = heapq.nsmallest(top, prioritaires, key=cle)
+            normales = heapq.nsmallest(top, normales, key=cle)
 
         return {"prioritaire": prioritaires, "normal": normales}
 
     def get_temps_attente(self, manoirs: dict[str, Any]) -> Optional[float]:
         """Retourne le temps d'attente avant le prochain manoir prêt
 
+        Ne compte aucun passage : la famine et le temps virtuel ne changent pas.
+
         Args:
             manoirs: Dictionnaire {manoir_id: manoir}
 
         Returns:
             Secondes à attendre, 0 si un manoir est prêt, None si aucun manoir
         """
-        selection = self.selectionner_manoir(manoirs)
+        selection, _ = self._choisir(manoirs)
 
         if selection is None:
             return None
@@ -208,8 +532,25 @@ class SimpleScheduler:
         Returns:
             True si au moins un manoir a une action prioritaire prête
         """
-        prioritaires = self._collecter_selections(manoirs, prioritaire=True)
-        return any(s.pret for s in prioritaires)
+        # Collecte déjà faite pendant ce tour : la réutiliser
+        collecte = self._cache.get(id(manoirs)) if self._tour else None
+        if collecte is not None:
+            return any(s.pret for s in collecte[0])
+
+        # Sinon s'arrêter au premier prioritaire prêt, sans construire de sélection
+        for manoir_id, manoir in manoirs.items():
+            if not self._implemente(manoir, True):
+                continue
+            try:
+                temps = manoir.get_prochain_passage_prioritaire()
+            except Exception as e:
+                logger.error(f"Erreur collecte prioritaire pour {manoir_id}: {e}")
+                continue
+
+            if temps is not None and temps <= 0:
+                return True
+
+        return False
 
     def __repr__(self):
         return "SimpleScheduler(2 niveaux: PRIORITAIRE, NORMAL)"
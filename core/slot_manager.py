@@ -4,13 +4,21 @@ Gère les slots d'envoi pour chaque fenêtre (1-5 selon niveau du manoir).
 Permet de savoir quand un slot sera disponible.
 """
 
-import json
 import time
+from itertools import chain
 from pathlib import Path
 from threading import Lock
 
 from utils.config import DATA_DIR, SLOTS_FILE
 from utils.logger import get_module_logger
+from utils.persistence import (
+    DebouncedSaver,
+    drain,
+    monotonic_to_wall,
+    read_json,
+    wall_to_monotonic,
+    write_json_atomic,
+)
 
 logger = get_module_logger("SlotManager")
 
@@ -22,10 +30,20 @@ class Slot:
         manoir_id: ID du manoir propriétaire
         slot_type: Type de slot (ex: "mercenaire", "collecte", "raid")
         slot_index: Index du slot dans son type (0, 1, 2...)
-        heure_liberation: Timestamp estimé de libération
+        heure_liberation: Timestamp estimé de libération (time.monotonic())
         actif: Si le slot est en cours d'utilisation
     """
 
+    __slots__ = (
+        "manoir_id",
+        "slot_type",
+        "slot_index",
+        "heure_liberation",
+        "actif",
+        "_dict",
+        "_gestionnaire",
+    )
+
     def __init__(self, manoir_id, slot_type, slot_index=0):
         """
         Args:
@@ -38,29 +56,42 @@ class Slot:
         self.slot_index = slot_index
         self.heure_liberation = 0
         self.actif = False
+        # Dernier résultat de to_dict() et état (heure_liberation, actif) associé
+        self._dict = (None, None)
+        # SlotManager propriétaire, prévenu des changements d'état (ou None)
+        self._gestionnaire = None
 
-    def is_available(self, margin=30):
+    def is_available(self, margin=30, now=None):
         """Vérifie si le slot est disponible ou le sera bientôt
 
         Args:
             margin: Marge en secondes pour considérer "bientôt disponible"
+            now: Timestamp monotone de référence (défaut: time.monotonic()), à passer une
+                 seule fois pour toute une boucle de slots
 
         Returns:
             bool: True si disponible ou bientôt disponible
         """
         if not self.actif:
             return True
-        return time.time() + margin >= self.heure_liberation
+        if now is None:
+            now = time.monotonic()
+        return now + margin >= self.heure_liberation
 
-    def is_free(self):
+    def is_free(self, now=None):
         """Vérifie si le slot est actuellement libre
 
+        Args:
+            now: Timestamp de référence (défaut: time.monotonic())
+
         Returns:
             bool: True si libre maintenant
         """
         if not self.actif:
             return True
-        return time.time() >= self.heure_liberation
+        if now is None:
+            now = time.monotonic()
+        return now >= self.heure_liberation
 
     def time_until_free(self):
         """Retourne le temps restant avant libération
@@ -70,7 +101,7 @@ class Slot:
         """
         if not self.actif:
             return 0
-        remaining = self.heure_liberation - time.time()
+        remaining = self.heure_liberation - time.monotonic()
         return max(0, remaining)
 
     def occupy(self, duree):
@@ -80,7 +111,8 @@ class Slot:
             duree: Durée estimée en secondes
         """
         self.actif = True
-        self.heure_liberation = time.time() + duree
+        self.heure_liberation = time.monotonic() + duree
+        self._signaler()
         logger.debug(
             f"Slot {self.manoir_id}:{self.slot_type}[{self.slot_index}] occupé pour {duree}s"
         )
@@ -89,34 +121,55 @@ class Slot:
         """Libère le slot"""
         self.actif = False
         self.heure_liberation = 0
+        self._signaler()
 
     def update_liberation(self, nouvelle_heure):
         """Met à jour l'heure de libération
 
         Args:
-            nouvelle_heure: Nouveau timestamp de libération
+            nouvelle_heure: Nouveau timestamp de libération (time.monotonic())
         """
         self.heure_liberation = nouvelle_heure
+        self._signaler()
+
+    def _signaler(self):
+        """Signale au gestionnaire que l'ordre de libération est à refaire (PROTÉGÉ)
+
+        Un slot renvoyé par get_free_slots()/get_all_slots() peut être occupé
+        ou libéré directement : son gestionnaire doit alors le retrier.
+        """
+        gestionnaire = self._gestionnaire
+        if gestionnaire is not None:
+            gestionnaire._a_reordonner.add((self.manoir_id, self.slot_type))
 
     def to_dict(self):
-        """Convertit en dictionnaire pour sérialisation"""
-        return {
-            "manoir_id": self.manoir_id,
-            "slot_type": self.slot_type,
-            "slot_index": self.slot_index,
-            "heure_liberation": self.heure_liberation,
-            "actif": self.actif,
-        }
+        """Convertit en dictionnaire pour sérialisation
+
+        heure_liberation est écrite en heure murale (time.time()). Le dictionnaire
+        est mémorisé tant que le slot n'a pas changé : ne pas le modifier.
+        """
+        etat = (self.heure_liberation, self.actif)
+        cle, data = self._dict
+        if cle != etat:
+            data = {
+                "manoir_id": self.manoir_id,
+                "slot_type": self.slot_type,
+                "slot_index": self.slot_index,
+                "heure_liberation": monotonic_to_wall(self.heure_liberation),
+                "actif": self.actif,
+            }
+            self._dict = (etat, data)
+        return data
 
     @classmethod
     def from_dict(cls, data):
-        """Crée un slot depuis un dictionnaire"""
+        """Crée un slot depuis un dictionnaire (heure_liberation en heure murale)"""
         slot = cls(data["manoir_id"], data["slot_type"], data.get("slot_index", 0))
-        slot.heure_liberation = data.get("heure_liberation", 0)
+        slot.heure_liberation = wall_to_monotonic(data.get("heure_liberation", 0))
         slot.actif = data.get("actif", False)
 
         # Vérifier si le slot devrait être libéré
-        if slot.actif and time.time() >= slot.heure_liberation:
+        if slot.actif and time.monotonic() >= slot.heure_liberation:
             slot.release()
 
         return slot
@@ -128,6 +181,11 @@ class Slot:
         return f"Slot({self.slot_type}[{self.slot_index}], libre)"
 
 
+def _cle_liberation(slot):
+    """Clé de tri : slots inactifs d'abord, puis par heure de libération"""
+    return (slot.actif, slot.heure_liberation)
+
+
 class SlotManager:
     """Gestionnaire de slots avec persistance
 
@@ -140,6 +198,11 @@ class SlotManager:
             {'nom': 'collecte', 'nb': 3},
             {'nom': 'raid', 'nb': 1},
         ]
+
+    Les lectures (count_*, has_free_slot, get_*) ne prennent pas de verrou :
+    elles lisent actif/heure_liberation, dont l'affectation est atomique sous
+    le GIL. Un slot occupé ou libéré pendant la lecture peut être vu dans l'un
+    ou l'autre état. Seules les écritures passent par le verrou.
     """
 
     # Temps moyens par type d'action (en secondes)
@@ -151,16 +214,32 @@ class SlotManager:
         "default": 120,
     }
 
-    def __init__(self, filepath=None):
+    def __init__(self, filepath=None, pretty=False, save_interval=5.0):
         """
         Args:
             filepath: Chemin du fichier de persistance
+            pretty: Si True, save() écrit un JSON indenté
+            save_interval: Délai (secondes) de regroupement des sauvegardes
         """
         self.filepath = Path(filepath) if filepath else SLOTS_FILE
-        self._slots = {}  # {manoir_id: {slot_type: [Slot, ...]}}
+        self.pretty = pretty
+        # {manoir_id: {slot_type: [Slot, ...]}}
+        # Jamais modifié en place : les écritures de structure publient un nouveau
+        # dict, les lectures se font sans verrou sur la version courante
+        self._slots = {}
         self._slots_config = {}  # {manoir_id: [{'nom': str, 'nb': int}, ...]}
+        # Mêmes slots triés par (actif, heure_liberation) : {manoir_id: {slot_type: [Slot]}}
+        # Le premier slot de chaque liste répond seul à get_next_free_time()
+        self._par_liberation = {}
+        # (manoir_id, slot_type) dont un slot a changé d'état depuis le dernier tri
+        self._a_reordonner = set()
+        # Sérialise les écritures (structure et occupation des slots)
         self._lock = Lock()
 
+        # save() ne fait que marquer les données modifiées, l'écriture réelle
+        # est faite par un thread au plus une fois par intervalle
+        self._saver = DebouncedSaver(self._save_impl, save_interval)
+
         # Charger les données existantes
         self._load()
 
@@ -179,47 +258,149 @@ class SlotManager:
 
             self._slots_config[manoir_id] = slots_config
 
-            if manoir_id not in self._slots:
-                self._slots[manoir_id] = {}
+            # Copie des types du manoir : les lecteurs gardent l'ancienne version
+            types = dict(self._slots.get(manoir_id, {}))
 
             # Créer/mettre à jour les slots par type
             for slot_def in slots_config:
                 slot_type = slot_def["nom"]
                 nb_slots = slot_def["nb"]
 
-                if slot_type not in self._slots[manoir_id]:
-                    self._slots[manoir_id][slot_type] = [
-                        Slot(manoir_id, slot_type, i) for i in range(nb_slots)
+                if slot_type not in types:
+                    types[slot_type] = [
+                        self._nouveau_slot(manoir_id, slot_type, i) for i in range(nb_slots)
                     ]
                 else:
-                    # Ajuster le nombre si nécessaire
-                    current = len(self._slots[manoir_id][slot_type])
+                    # Ajuster le nombre si nécessaire (nouvelle liste)
+                    current = len(types[slot_type])
                     if nb_slots > current:
-                        for i in range(current, nb_slots):
-                            self._slots[manoir_id][slot_type].append(Slot(manoir_id, slot_type, i))
-                    elif nb_slots < current:
-                        self._slots[manoir_id][slot_type] = self._slots[manoir_id][slot_type][
-                            :nb_slots
+                        types[slot_type] = types[slot_type] + [
+                            self._nouveau_slot(manoir_id, slot_type, i)
+                            for i in range(current, nb_slots)
                         ]
+                    elif nb_slots < current:
+                        types[slot_type] = types[slot_type][:nb_slots]
 
             # Supprimer les types qui ne sont plus dans la config
             types_config = {s["nom"] for s in slots_config}
-            for slot_type in list(self._slots[manoir_id].keys()):
+            for slot_type in list(types.keys()):
                 if slot_type not in types_config:
-                    del self._slots[manoir_id][slot_type]
+                    del types[slot_type]
 
-        total = sum(len(slots) for slots in self._slots[manoir_id].values())
+            # Publication par simple réassignation (atomique)
+            slots = dict(self._slots)
+            slots[manoir_id] = types
+            self._slots = slots
+            self._reordonner(manoir_id)
+
+        total = sum(len(slots) for slots in types.values())
         types_str = ", ".join(f"{s['nom']}:{s['nb']}" for s in slots_config)
         logger.debug(f"Manoir {manoir_id} enregistré avec {total} slots ({types_str})")
 
-    def _get_all_slots_list(self, manoir_id):
-        """Retourne tous les slots d'un manoir en liste plate (PROTÉGÉ)"""
-        if manoir_id not in self._slots:
-            return []
-        slots = []
-        for slot_list in self._slots[manoir_id].values():
-            slots.extend(slot_list)
-        return slots
+    def _nouveau_slot(self, manoir_id, slot_type, slot_index):
+        """Crée un slot rattaché à ce gestionnaire (PROTÉGÉ)"""
+        slot = Slot(manoir_id, slot_type, slot_index)
+        slot._gestionnaire = self
+        return slot
+
+    def _reordonner(self, manoir_id, slot_type=None):
+        """Retrie les slots d'un manoir par heure de libération (PROTÉGÉ, sous verrou)
+
+        Args:
+            manoir_id: ID du manoir
+            slot_type: Type modifié (None = tous les types)
+        """
+        # Oublier les signalements avant le tri : un changement ultérieur sera revu
+        self._prendre_signalements(manoir_id, slot_type)
+
+        types = self._slots.get(manoir_id, {})
+        if slot_type:
+            ordres = dict(self._par_liberation.get(manoir_id, {}))
+            if slot_type in types:
+                ordres[slot_type] = sorted(types[slot_type], key=_cle_liberation)
+        else:
+            ordres = {t: sorted(slots, key=_cle_liberation) for t, slots in types.items()}
+        # Publication par simple réassignation (atomique)
+        self._par_liberation[manoir_id] = ordres
+
+    def _resynchroniser(self, manoir_id):
+        """Retrie les types dont un slot a été modifié hors du gestionnaire (PROTÉGÉ)
+
+        Args:
+            manoir_id: ID du manoir
+        """
+        if not self._a_reordonner:
+            return
+        with self._lock:
+            # Reprendre tant que des slots sont signalés pendant les tris
+            signales = self._prendre_signalements(manoir_id)
+            while signales:
+                for cle in signales:
+                    self._reordonner(*cle)
+                signales = self._prendre_signalements(manoir_id)
+
+    def _prendre_signalements(self, manoir_id, slot_type=None):
+        """Retire les signalements d'un manoir et les retourne (PROTÉGÉ, sous verrou)
+
+        Slot._signaler ajoute sans verrou : l'ensemble est remplacé d'un bloc
+        avant d'être parcouru, les signalements des autres manoirs y sont remis.
+
+        Args:
+            manoir_id: ID du manoir
+            slot_type: Type de slot (None = tous les types)
+
+        Returns:
+            set: Couples (manoir_id, slot_type) signalés
+        """
+        signales, self._a_reordonner = self._a_reordonner, set()
+        pris = {
+            c for c in signales if c[0] == manoir_id and (slot_type is None or c[1] == slot_type)
+        }
+        signales -= pris
+        if signales:
+            self._a_reordonner.update(signales)
+        return pris
+
+    @staticmethod
+    def _iter_slots(types, slot_type=None):
+        """Itère sur les slots d'un manoir, sans liste intermédiaire (PROTÉGÉ)
+
+        Args:
+            types: Slots du manoir {slot_type: [Slot, ...]}
+            slot_type: Type de slot (None = tous les types)
+
+        Returns:
+            Itérable de Slot (à parcourir une seule fois)
+        """
+        if slot_type:
+            return types.get(slot_type, [])
+        return chain.from_iterable(types.values())
+
+    @staticmethod
+    def _filter_free(slots, now):
+        """Retourne les slots libres à l'instant donné (PROTÉGÉ)
+
+        Args:
+            slots: Itérable de Slot
+            now: Timestamp de référence (time.monotonic() + marge éventuelle)
+
+        Returns:
+            List[Slot]: Slots inactifs ou dont la libération est atteinte
+        """
+        return [s for s in slots if not s.actif or now >= s.heure_liberation]
+
+    @staticmethod
+    def _any_free(slots, now):
+        """Vérifie qu'au moins un slot est libre, arrêt au premier trouvé (PROTÉGÉ)
+
+        Args:
+            slots: Itérable de Slot
+            now: Timestamp de référence
+
+        Returns:
+            bool: True si au moins un slot est inactif ou libéré
+        """
+        return any(not s.actif or now >= s.heure_liberation for s in slots)
 
     def get_available_slots(self, manoir_id, slot_type=None, margin=30):
         """Récupère les slots disponibles ou bientôt disponibles
@@ -232,16 +413,11 @@ class SlotManager:
         Returns:
             List[Slot]: Slots disponibles
         """
-        with self._lock:
-            if manoir_id not in self._slots:
-                return []
-
-            if slot_type:
-                slots = self._slots[manoir_id].get(slot_type, [])
-            else:
-                slots = self._get_all_slots_list(manoir_id)
+        types = self._slots.get(manoir_id)
+        if types is None:
+            return []
 
-            return [s for s in slots if s.is_available(margin)]
+        return self._filter_free(self._iter_slots(types, slot_type), time.monotonic() + margin)
 
     def get_free_slots(self, manoir_id, slot_type=None):
         """Récupère les slots actuellement libres
@@ -253,16 +429,11 @@ class SlotManager:
         Returns:
             List[Slot]: Slots libres
         """
-        with self._lock:
-            if manoir_id not in self._slots:
-                return []
-
-            if slot_type:
-                slots = self._slots[manoir_id].get(slot_type, [])
-            else:
-                slots = self._get_all_slots_list(manoir_id)
+        types = self._slots.get(manoir_id)
+        if types is None:
+            return []
 
-            return [s for s in slots if s.is_free()]
+        return self._filter_free(self._iter_slots(types, slot_type), time.monotonic())
 
     def count_free_slots(self, manoir_id, slot_type=None):
         """Compte les slots libres
@@ -274,7 +445,7 @@ class SlotManager:
         Returns:
             int: Nombre de slots libres
         """
-        return len(self.get_free_slots(manoir_id, slot_type))
+        return self._count_free(manoir_id, slot_type, 0)
 
     def count_available_slots(self, manoir_id, slot_type=None, margin=30):
         """Compte les slots disponibles ou bientôt disponibles
@@ -287,7 +458,26 @@ class SlotManager:
         Returns:
             int: Nombre de slots disponibles
         """
-        return len(self.get_available_slots(manoir_id, slot_type, margin))
+        return self._count_free(manoir_id, slot_type, margin)
+
+    def _count_free(self, manoir_id, slot_type, margin):
+        """Compte les slots libres à now + margin, sans construire de liste (PROTÉGÉ)
+
+        Args:
+            manoir_id: ID du manoir
+            slot_type: Type de slot (None = tous les types)
+            margin: Marge en secondes
+
+        Returns:
+            int: Nombre de slots libres
+        """
+        types = self._slots.get(manoir_id)
+        if types is None:
+            return 0
+
+        now = time.monotonic() + margin
+        slots = self._iter_slots(types, slot_type)
+        return sum(1 for s in slots if not s.actif or now >= s.heure_liberation)
 
     def has_free_slot(self, manoir_id, slot_type=None):
         """Vérifie si le manoir a au moins un slot libre
@@ -299,7 +489,11 @@ class SlotManager:
         Returns:
             bool: True si au moins un slot libre
         """
-        return self.count_free_slots(manoir_id, slot_type) > 0
+        types = self._slots.get(manoir_id)
+        if types is None:
+            return False
+
+        return self._any_free(self._iter_slots(types, slot_type), time.monotonic())
 
     def occupy_slot(self, manoir_id, slot_type, duree=None):
         """Occupe le premier slot libre du type spécifié
@@ -320,9 +514,11 @@ class SlotManager:
                 return None
 
             slots = self._slots[manoir_id].get(slot_type, [])
+            now = time.monotonic()
             for slot in slots:
-                if slot.is_free():
+                if not slot.actif or now >= slot.heure_liberation:
                     slot.occupy(duree)
+                    self._reordonner(manoir_id, slot_type)
                     return slot
 
         return None
@@ -340,6 +536,7 @@ class SlotManager:
                 slots = self._slots[manoir_id][slot_type]
                 if slot_index < len(slots):
                     slots[slot_index].release()
+                    self._reordonner(manoir_id, slot_type)
 
     def update_slot_time(self, manoir_id, slot_type, slot_index, nouvelle_heure):
         """Met à jour l'heure de libération d'un slot
@@ -348,13 +545,14 @@ class SlotManager:
             manoir_id: ID du manoir
             slot_type: Type de slot
             slot_index: Index du slot dans son type
-            nouvelle_heure: Nouveau timestamp
+            nouvelle_heure: Nouveau timestamp (time.monotonic())
         """
         with self._lock:
             if manoir_id in self._slots and slot_type in self._slots[manoir_id]:
                 slots = self._slots[manoir_id][slot_type]
                 if slot_index < len(slots):
                     slots[slot_index].update_liberation(nouvelle_heure)
+                    self._reordonner(manoir_id, slot_type)
 
     def get_next_free_time(self, manoir_id, slot_type=None):
         """Récupère le timestamp de la prochaine libération de slot
@@ -364,30 +562,28 @@ class SlotManager:
             slot_type: Type de slot (None = tous les types)
 
         Returns:
-            float ou None: Timestamp de la prochaine libération
+            float ou None: Timestamp (time.monotonic()) de la prochaine libération
         """
-        with self._lock:
-            if manoir_id not in self._slots:
-                return None
-
-            if slot_type:
-                slots = self._slots[manoir_id].get(slot_type, [])
-            else:
-                slots = self._get_all_slots_list(manoir_id)
-
-            # Si un slot est déjà libre, retourner maintenant
-            for slot in slots:
-                if slot.is_free():
-                    return time.time()
-
-            # Sinon trouver le slot qui se libère le plus tôt
-            next_time = None
-            for slot in slots:
-                if slot.actif:
-                    if next_time is None or slot.heure_liberation < next_time:
-                        next_time = slot.heure_liberation
-
-            return next_time
+        self._resynchroniser(manoir_id)
+        ordres = self._par_liberation.get(manoir_id)
+        if ordres is None:
+            return None
+
+        # Premier slot de chaque type : inactif s'il en existe un, sinon le
+        # slot actif qui se libère le plus tôt
+        if slot_type:
+            ordre = ordres.get(slot_type)
+            premiers = [ordre[0]] if ordre else []
+        else:
+            premiers = [ordre[0] for ordre in ordres.values() if ordre]
+
+        # Si un slot est déjà libre, retourner maintenant
+        now = time.monotonic()
+        if self._any_free(premiers, now):
+            return now
+
+        # Sinon le slot qui se libère le plus tôt
+        return min((s.heure_liberation for s in premiers), default=None)
 
     def get_all_slots(self, manoir_id, slot_type=None):
         """Récupère tous les slots d'un manoir
@@ -399,15 +595,15 @@ class SlotManager:
         Returns:
             List[Slot]: Tous les slots (ou dict si slot_type=None)
         """
-        with self._lock:
-            if manoir_id not in self._slots:
-                return [] if slot_type else {}
+        types = self._slots.get(manoir_id)
+        if types is None:
+            return [] if slot_type else {}
 
-            if slot_type:
-                return self._slots[manoir_id].get(slot_type, []).copy()
-            else:
-                # Retourne une copie du dict
-                return {t: slots.copy() for t, slots in self._slots[manoir_id].items()}
+        if slot_type:
+            return types.get(slot_type, []).copy()
+        else:
+            # Retourne une copie du dict
+            return {t: slots.copy() for t, slots in types.items()}
 
     def get_slot_types(self, manoir_id):
         """Récupère les types de slots disponibles pour un manoir
@@ -418,10 +614,10 @@ class SlotManager:
         Returns:
             List[str]: Types de slots
         """
-        with self._lock:
-            if manoir_id not in self._slots:
-                return []
-            return list(self._slots[manoir_id].keys())
+        types = self._slots.get(manoir_id)
+        if types is None:
+            return []
+        return list(types.keys())
 
     def refresh_slots(self, manoir_id, slot_type=None):
         """Actualise l'état des slots (libère ceux qui devraient l'être)
@@ -430,19 +626,28 @@ class SlotManager:
             manoir_id: ID du manoir
             slot_type: Type de slot (None = tous les types)
         """
+        self._resynchroniser(manoir_id)
         with self._lock:
             if manoir_id not in self._slots:
                 return
 
-            if slot_type:
-                slots = self._slots[manoir_id].get(slot_type, [])
-            else:
-                slots = self._get_all_slots_list(manoir_id)
-
-            now = time.time()
-            for slot in slots:
-                if slot.actif and now >= slot.heure_liberation:
+            ordres = self._par_liberation.get(manoir_id, {})
+            listes = [ordres.get(slot_type, [])] if slot_type else ordres.values()
+
+            # Slots actifs triés par heure de libération : arrêt au premier non échu
+            now = time.monotonic()
+            libere = False
+            for ordre in listes:
+                for slot in ordre:
+                    if not slot.actif:
+                        continue
+                    if now < slot.heure_liberation:
+                        break
                     slot.release()
+                    libere = True
+
+            if libere:
+                self._reordonner(manoir_id, slot_type)
 
     def _load(self):
         """Charge les données depuis le fichier (PROTÉGÉ)"""
@@ -451,18 +656,26 @@ class SlotManager:
             return
 
         try:
-            with open(self.filepath, encoding="utf-8") as f:
-                data = json.load(f)
+            data = read_json(self.filepath)
+
+            # Charger les slots par manoir et par type (données brutes libérées au fil de l'eau)
+            slots = {
+                manoir_id: {
+                    slot_type: [Slot.from_dict(s) for s in drain(slots_data)]
+                    for slot_type, slots_data in types_data.items()
+                }
+                for manoir_id, types_data in data.get("slots", {}).items()
+            }
+
+            for types in slots.values():
+                for slot in self._iter_slots(types):
+                    slot._gestionnaire = self
 
             with self._lock:
                 self._slots_config = data.get("slots_config", {})
-                self._slots = {}
-
-                # Charger les slots par manoir et par type
-                for manoir_id, types_data in data.get("slots", {}).items():
-                    self._slots[manoir_id] = {}
-                    for slot_type, slots_data in types_data.items():
-                        self._slots[manoir_id][slot_type] = [Slot.from_dict(s) for s in slots_data]
+                self._slots = slots
+                for manoir_id in slots:
+                    self._reordonner(manoir_id)
 
             total = sum(len(slots) for types in self._slots.values() for slots in types.values())
             logger.info(f"Chargé {total} slot(s) pour {len(self._slots)} manoir(s)")
@@ -471,7 +684,18 @@ class SlotManager:
             logger.error(f"Erreur chargement slots: {e}")
 
     def save(self):
-        """Sauvegarde les données dans le fichier"""
+        """Demande une sauvegarde différée (non bloquant)
+
+        Les demandes rapprochées sont regroupées en une seule écriture.
+        """
+        self._saver.request()
+
+    def flush(self):
+        """Écrit immédiatement les modifications en attente"""
+        self._saver.flush()
+
+    def _save_impl(self):
+        """Sauvegarde les données dans le fichier (PROTÉGÉ)"""
         try:
             DATA_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -488,8 +712,7 @@ class SlotManager:
                     },
                 }
 
-            with open(self.filepath, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            write_json_atomic(self.filepath, data, pretty=self.pretty)
 
             logger.debug("Slots sauvegardés")
 
@@ -503,6 +726,7 @@ class SlotManager:
 
 # Instance globale
 _slot_manager_instance = None
+_slot_manager_instance_lock = Lock()
 
 
 def get_slot_manager():
@@ -513,5 +737,8 @@ def get_slot_manager():
     """
     global _slot_manager_instance
     if _slot_manager_instance is None:
-        _slot_manager_instance = SlotManager()
+        # Création sous verrou : deux threads ne doivent pas charger deux instances
+        with _slot_manager_instance_lock:
+            if _slot_manager_instance is None:
+                _slot_manager_instance = SlotManager()
     return _slot_manager_instance
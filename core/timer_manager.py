@@ -4,16 +4,34 @@ Gère les timers pour les tâches récurrentes (collecte, construction, etc.)
 Les timers sont persistés en JSON pour survivre aux redémarrages.
 """
 
-import json
+import heapq
 import time
 from pathlib import Path
-from threading import Lock
+from threading import Lock, RLock
 
 from utils.config import DATA_DIR, TIMERS_FILE
 from utils.logger import get_module_logger
+from utils.persistence import (
+    DebouncedSaver,
+    drain,
+    monotonic_to_wall,
+    read_json,
+    wall_to_monotonic,
+    write_json_atomic,
+)
 
 logger = get_module_logger("TimerManager")
 
+# À partir de ce nombre de timers dans une fenêtre, les timers dus sont filtrés avec numpy
+SEUIL_VECTORISATION = 128
+
+
+def _cle_timer(nom, fenetre_id=None):
+    """Génère la clé unique d'un timer ("fenetre:nom" ou "global:nom")"""
+    if fenetre_id:
+        return f"{fenetre_id}:{nom}"
+    return f"global:{nom}"
+
 
 class Timer:
     """Représente un timer individuel
@@ -22,12 +40,26 @@ class Timer:
         nom: Nom unique du timer
         fenetre_id: ID de la fenêtre propriétaire (None = global)
         intervalle: Intervalle en secondes entre chaque exécution
-        derniere_execution: Timestamp de la dernière exécution
-        prochaine_execution: Timestamp de la prochaine exécution prévue
+        derniere_execution: Timestamp (time.monotonic()) de la dernière exécution
+        prochaine_execution: Timestamp (time.monotonic()) de la prochaine exécution prévue
         actif: Si le timer est actif
         priorite: Priorité du timer (plus haut = plus prioritaire)
+        key: Clé unique du timer dans le TimerManager (calculée à la création)
     """
 
+    __slots__ = (
+        "nom",
+        "fenetre_id",
+        "key",
+        "intervalle",
+        "derniere_execution",
+        "_prochaine_execution",
+        "_actif",
+        "priorite",
+        "_surveillant",
+        "_dict",
+    )
+
     def __init__(self, nom, fenetre_id=None, intervalle=3600, priorite=0):
         """
         Args:
@@ -36,23 +68,55 @@ class Timer:
             intervalle: Intervalle en secondes (défaut: 1 heure)
             priorite: Priorité du timer
         """
+        # Rappelé à chaque changement d'échéance ou d'activation (voir TimerManager)
+        self._surveillant = None
+        # Dernier résultat de to_dict() et état des champs modifiables associé
+        self._dict = (None, None)
         self.nom = nom
         self.fenetre_id = fenetre_id
+        self.key = _cle_timer(nom, fenetre_id)
         self.intervalle = intervalle
         self.derniere_execution = 0
         self.prochaine_execution = 0
         self.actif = True
         self.priorite = priorite
 
-    def is_due(self):
+    @property
+    def prochaine_execution(self):
+        """Timestamp (time.monotonic()) de la prochaine exécution prévue"""
+        return self._prochaine_execution
+
+    @prochaine_execution.setter
+    def prochaine_execution(self, valeur):
+        self._prochaine_execution = valeur
+        if self._surveillant is not None:
+            self._surveillant(self)
+
+    @property
+    def actif(self):
+        """Si le timer est actif"""
+        return self._actif
+
+    @actif.setter
+    def actif(self, valeur):
+        self._actif = valeur
+        if self._surveillant is not None:
+            self._surveillant(self)
+
+    def is_due(self, now=None):
         """Vérifie si le timer est dû
 
+        Args:
+            now: Timestamp monotone de référence (défaut: time.monotonic())
+
         Returns:
             bool: True si le timer doit être exécuté
         """
-        if not self.actif:
+        if not self._actif:
             return False
-        return time.time() >= self.prochaine_execution
+        if now is None:
+            now = time.monotonic()
+        return now >= self._prochaine_execution
 
     def time_until_due(self):
         """Retourne le temps restant avant l'échéance
@@ -60,16 +124,16 @@ class Timer:
         Returns:
             float: Secondes restantes (négatif si déjà dû)
         """
-        return self.prochaine_execution - time.time()
+        return self.prochaine_execution - time.monotonic()
 
     def mark_executed(self):
         """Marque le timer comme exécuté et calcule la prochaine échéance"""
-        self.derniere_execution = time.time()
+        self.derniere_execution = time.monotonic()
         self.prochaine_execution = self.derniere_execution + self.intervalle
 
     def reset(self):
         """Réinitialise le timer (prochaine exécution = maintenant)"""
-        self.prochaine_execution = time.time()
+        self.prochaine_execution = time.monotonic()
 
     def delay(self, seconds):
         """Retarde le timer
@@ -82,25 +146,39 @@ class Timer:
     def to_dict(self):
         """Convertit le timer en dictionnaire pour sérialisation
 
+        Les timestamps sont écrits en heure murale (time.time()). Le dictionnaire
+        est mémorisé tant que le timer n'a pas changé : ne pas le modifier.
+
         Returns:
             dict: Représentation du timer
         """
-        return {
-            "nom": self.nom,
-            "fenetre_id": self.fenetre_id,
-            "intervalle": self.intervalle,
-            "derniere_execution": self.derniere_execution,
-            "prochaine_execution": self.prochaine_execution,
-            "actif": self.actif,
-            "priorite": self.priorite,
-        }
+        etat = (
+            self.intervalle,
+            self.derniere_execution,
+            self._prochaine_execution,
+            self._actif,
+            self.priorite,
+        )
+        cle, data = self._dict
+        if cle != etat:
+            data = {
+                "nom": self.nom,
+                "fenetre_id": self.fenetre_id,
+                "intervalle": self.intervalle,
+                "derniere_execution": monotonic_to_wall(self.derniere_execution),
+                "prochaine_execution": monotonic_to_wall(self.prochaine_execution),
+                "actif": self.actif,
+                "priorite": self.priorite,
+            }
+            self._dict = (etat, data)
+        return data
 
     @classmethod
     def from_dict(cls, data):
         """Crée un timer depuis un dictionnaire
 
         Args:
-            data: Dictionnaire de données
+            data: Dictionnaire de données (timestamps en heure murale)
 
         Returns:
             Timer: Instance de timer
@@ -111,8 +189,8 @@ class Timer:
             intervalle=data.get("intervalle", 3600),
             priorite=data.get("priorite", 0),
         )
-        timer.derniere_execution = data.get("derniere_execution", 0)
-        timer.prochaine_execution = data.get("prochaine_execution", 0)
+        timer.derniere_execution = wall_to_monotonic(data.get("derniere_execution", 0))
+        timer.prochaine_execution = wall_to_monotonic(data.get("prochaine_execution", 0))
         timer.actif = data.get("actif", True)
         return timer
 
@@ -121,30 +199,180 @@ class Timer:
         return f"Timer('{self.nom}', fenetre={self.fenetre_id}, {status})"
 
 
+class _TimerShard:
+    """Timers d'une même fenêtre, avec leur verrou et leur tas d'échéances (PROTÉGÉ)
+
+    Attributes:
+        lock: Verrou réentrant (les timers notifient leurs changements sous verrou)
+        timers: Timers de la fenêtre {timer_key: Timer}
+        echeances: Tas [(prochaine_execution, timer_key), ...], entrées périmées ignorées
+        tableaux: (timers, {timer_key: indice}, prochaine_execution, actif) en tableaux
+            numpy parallèles, ou None sous SEUIL_VECTORISATION ou sans numpy
+    """
+
+    __slots__ = ("lock", "timers", "echeances", "tableaux")
+
+    def __init__(self):
+        self.lock = RLock()
+        self.timers = {}
+        self.echeances = []
+        self.tableaux = None
+
+
 class TimerManager:
     """Gestionnaire de timers avec persistance
 
     Gère les timers par fenêtre et les timers globaux.
     Persiste les données en JSON.
+
+    Les timers sont répartis par fenêtre, chaque fenêtre ayant son propre
+    verrou : les opérations sur des fenêtres différentes ne se bloquent pas.
     """
 
-    def __init__(self, filepath=None):
+    def __init__(self, filepath=None, pretty=False, save_interval=5.0):
         """
         Args:
             filepath: Chemin du fichier de persistance (défaut: config)
+            pretty: Si True, save() écrit un JSON indenté
+            save_interval: Délai (secondes) de regroupement des sauvegardes
         """
         self.filepath = Path(filepath) if filepath else TIMERS_FILE
-        self._timers = {}  # {timer_key: Timer}
+        self.pretty = pretty
+        self._shards = {}  # {fenetre_id: _TimerShard} (None = timers globaux)
+        # Protège la création des shards et le rechargement
         self._lock = Lock()
 
+        # save() ne fait que marquer les données modifiées, l'écriture réelle
+        # est faite par un thread au plus une fois par intervalle
+        self._saver = DebouncedSaver(self._save_impl, save_interval)
+
         # Charger les timers existants
         self._load()
 
     def _get_timer_key(self, nom, fenetre_id=None):
         """Génère la clé unique pour un timer (PROTÉGÉ)"""
-        if fenetre_id:
-            return f"{fenetre_id}:{nom}"
-        return f"global:{nom}"
+        return _cle_timer(nom, fenetre_id)
+
+    def _resoudre(self, nom, fenetre_id):
+        """Retourne (clé, fenêtre) d'un timer désigné par son nom ou par lui-même (PROTÉGÉ)
+
+        Args:
+            nom: Nom du timer, ou instance de Timer (clé déjà calculée)
+            fenetre_id: ID de la fenêtre (ignoré si nom est un Timer)
+
+        Returns:
+            tuple: (timer_key, fenetre_id)
+        """
+        if isinstance(nom, Timer):
+            return nom.key, nom.fenetre_id
+        return self._get_timer_key(nom, fenetre_id), fenetre_id
+
+    def _get_shard(self, fenetre_id, creer=False):
+        """Retourne le shard d'une fenêtre (PROTÉGÉ)
+
+        Args:
+            fenetre_id: ID de la fenêtre (None = timers globaux)
+            creer: Si True, crée le shard s'il n'existe pas
+
+        Returns:
+            _TimerShard ou None
+        """
+        shard = self._shards.get(fenetre_id)
+        if shard is None and creer:
+            with self._lock:
+                shard = self._shards.get(fenetre_id)
+                if shard is None:
+                    shard = _TimerShard()
+                    shards = dict(self._shards)
+                    shards[fenetre_id] = shard
+                    self._shards = shards
+        return shard
+
+    def _suivre(self, shard, timer):
+        """Rattache un timer au gestionnaire et planifie son échéance (PROTÉGÉ, sous verrou)"""
+        timer._surveillant = self._planifier
+        self._planifier(timer)
+
+    @staticmethod
+    def _indexer(shard):
+        """Reconstruit les tableaux numpy d'un shard (PROTÉGÉ, sous verrou)
+
+        Appelé quand l'ensemble des timers change (ajout, suppression, chargement).
+        numpy n'est importé qu'à partir de SEUIL_VECTORISATION timers ; sans
+        numpy, le shard reste sans tableaux.
+
+        Args:
+            shard: _TimerShard de la fenêtre
+        """
+        shard.tableaux = None
+        if len(shard.timers) < SEUIL_VECTORISATION:
+            return
+        try:
+            import numpy as np
+        except ImportError:
+            return
+
+        timers = list(shard.timers.values())
+        n = len(timers)
+        shard.tableaux = (
+            timers,
+            {key: i for i, key in enumerate(shard.timers)},
+            np.fromiter((t.prochaine_execution for t in timers), dtype=np.float64, count=n),
+            np.fromiter((t.actif for t in timers), dtype=bool, count=n),
+        )
+
+    def _planifier(self, timer):
+        """Répercute l'échéance courante d'un timer sur sa fenêtre (PROTÉGÉ)
+
+        Appelé par le timer à chaque changement de prochaine_execution ou d'actif :
+        met à jour les tableaux numpy et ajoute l'échéance au tas.
+
+        Args:
+            timer: Timer modifié
+        """
+        shard = self._get_shard(timer.fenetre_id)
+        if shard is None:
+            return
+
+        key = timer.key
+        with shard.lock:
+            if shard.tableaux is not None:
+                _, indices, prochaine, actif = shard.tableaux
+                i = indices.get(key)
+                if i is not None:
+                    prochaine[i] = timer.prochaine_execution
+                    actif[i] = timer.actif
+
+            if not timer.actif:
+                return
+
+            heapq.heappush(shard.echeances, (timer.prochaine_execution, key))
+
+            # Trop d'entrées périmées : reconstruire
+            if len(shard.echeances) > 2 * len(shard.timers) + 16:
+                shard.echeances = [
+                    (t.prochaine_execution, k) for k, t in shard.timers.items() if t.actif
+                ]
+                heapq.heapify(shard.echeances)
+
+    @staticmethod
+    def _prochaine_echeance(shard):
+        """Retourne la plus proche échéance valide d'un shard (PROTÉGÉ, sous verrou)
+
+        Args:
+            shard: _TimerShard de la fenêtre
+
+        Returns:
+            float ou None: Timestamp de l'échéance
+        """
+        tas = shard.echeances
+        while tas:
+            echeance, key = tas[0]
+            timer = shard.timers.get(key)
+            if timer is not None and timer.actif and timer.prochaine_execution == echeance:
+                return echeance
+            heapq.heappop(tas)
+        return None
 
     def add_timer(self, nom, fenetre_id=None, intervalle=3600, priorite=0, start_now=False):
         """Ajoute un nouveau timer
@@ -160,20 +388,23 @@ class TimerManager:
             Timer: Le timer créé
         """
         key = self._get_timer_key(nom, fenetre_id)
+        shard = self._get_shard(fenetre_id, creer=True)
 
-        with self._lock:
-            if key in self._timers:
+        with shard.lock:
+            if key in shard.timers:
                 logger.warning(f"Timer '{key}' existe déjà, mise à jour")
-                timer = self._timers[key]
+                timer = shard.timers[key]
                 timer.intervalle = intervalle
                 timer.priorite = priorite
             else:
                 timer = Timer(nom, fenetre_id, intervalle, priorite)
                 if start_now:
-                    timer.prochaine_execution = time.time()
+                    timer.prochaine_execution = time.monotonic()
                 else:
-                    timer.prochaine_execution = time.time() + intervalle
-                self._timers[key] = timer
+                    timer.prochaine_execution = time.monotonic() + intervalle
+                shard.timers[key] = timer
+                self._suivre(shard, timer)
+                self._indexer(shard)
                 logger.debug(f"Timer ajouté: {timer}")
 
         return timer
@@ -182,34 +413,58 @@ class TimerManager:
         """Récupère un timer
 
         Args:
-            nom: Nom du timer
+            nom: Nom du timer (ou le Timer lui-même)
             fenetre_id: ID de la fenêtre
 
         Returns:
             Timer ou None
         """
-        key = self._get_timer_key(nom, fenetre_id)
-        return self._timers.get(key)
+        key, fenetre_id = self._resoudre(nom, fenetre_id)
+        shard = self._get_shard(fenetre_id)
+        if shard is None:
+            return None
+        return shard.timers.get(key)
 
     def remove_timer(self, nom, fenetre_id=None):
         """Supprime un timer
 
         Args:
-            nom: Nom du timer
+            nom: Nom du timer (ou le Timer lui-même)
             fenetre_id: ID de la fenêtre
 
         Returns:
             bool: True si supprimé
         """
-        key = self._get_timer_key(nom, fenetre_id)
+        key, fenetre_id = self._resoudre(nom, fenetre_id)
+        shard = self._get_shard(fenetre_id)
+        if shard is None:
+            return False
 
-        with self._lock:
-            if key in self._timers:
-                del self._timers[key]
+        with shard.lock:
+            if key in shard.timers:
+                shard.timers.pop(key)._surveillant = None
+                self._indexer(shard)
                 logger.debug(f"Timer supprimé: {key}")
                 return True
         return False
 
+    def _shards_concernes(self, fenetre_id):
+        """Retourne les shards visibles depuis une fenêtre (PROTÉGÉ)
+
+        Args:
+            fenetre_id: ID de la fenêtre (None = toutes)
+
+        Returns:
+            List[_TimerShard]: Shards de la fenêtre et des timers globaux
+        """
+        if fenetre_id is None:
+            return list(self._shards.values())
+        return [
+            shard
+            for shard in (self._shards.get(fenetre_id), self._shards.get(None))
+            if shard is not None
+        ]
+
     def get_due_timers(self, fenetre_id=None):
         """Récupère les timers dus pour une fenêtre
 
@@ -220,13 +475,18 @@ class TimerManager:
             List[Timer]: Timers dus, triés par priorité
         """
         due_timers = []
-
-        with self._lock:
-            for timer in self._timers.values():
-                if timer.is_due() and (
-                    fenetre_id is None or timer.fenetre_id == fenetre_id or timer.fenetre_id is None
-                ):
-                    due_timers.append(timer)
+        now = time.monotonic()
+
+        for shard in self._shards_concernes(fenetre_id):
+            with shard.lock:
+                if shard.tableaux is not None:
+                    timers, _, prochaine, actif = shard.tableaux
+                    dus = (actif & (prochaine <= now)).nonzero()[0]
+                    due_timers.extend(timers[i] for i in dus)
+                else:
+                    due_timers.extend(
+                        t for t in shard.timers.values() if t.actif and now >= t.prochaine_execution
+                    )
 
         # Trier par priorité (décroissant)
         due_timers.sort(key=lambda t: t.priorite, reverse=True)
@@ -242,14 +502,12 @@ class TimerManager:
         Returns:
             List[Timer]: Timers de la fenêtre
         """
-        timers = []
-
-        with self._lock:
-            for timer in self._timers.values():
-                if timer.fenetre_id == fenetre_id:
-                    timers.append(timer)
+        shard = self._get_shard(fenetre_id)
+        if shard is None:
+            return []
 
-        return timers
+        with shard.lock:
+            return list(shard.timers.values())
 
     def get_global_timers(self):
         """Récupère les timers globaux
@@ -257,8 +515,7 @@ class TimerManager:
         Returns:
             List[Timer]: Timers globaux
         """
-        with self._lock:
-            return [t for t in self._timers.values() if t.fenetre_id is None]
+        return self.get_fenetre_timers(None)
 
     def get_next_due_time(self, fenetre_id=None):
         """Récupère le timestamp de la prochaine échéance
@@ -267,22 +524,15 @@ class TimerManager:
             fenetre_id: ID de la fenêtre (None = tous)
 
         Returns:
-            float ou None: Timestamp de la prochaine échéance
+            float ou None: Timestamp (time.monotonic()) de la prochaine échéance
         """
         next_time = None
 
-        with self._lock:
-            for timer in self._timers.values():
-                if not timer.actif:
-                    continue
-                if (
-                    fenetre_id is not None
-                    and timer.fenetre_id != fenetre_id
-                    and timer.fenetre_id is not None
-                ):
-                    continue
-                if next_time is None or timer.prochaine_execution < next_time:
-                    next_time = timer.prochaine_execution
+        for shard in self._shards_concernes(fenetre_id):
+            with shard.lock:
+                echeance = self._prochaine_echeance(shard)
+            if echeance is not None and (next_time is None or echeance < next_time):
+                next_time = echeance
 
         return next_time
 
@@ -290,7 +540,7 @@ class TimerManager:
         """Marque un timer comme exécuté
 
         Args:
-            nom: Nom du timer
+            nom: Nom du timer (ou le Timer lui-même)
             fenetre_id: ID de la fenêtre
         """
         timer = self.get_timer(nom, fenetre_id)
@@ -305,50 +555,76 @@ class TimerManager:
             return
 
         try:
-            with open(self.filepath, encoding="utf-8") as f:
-                data = json.load(f)
+            data = read_json(self.filepath)
+
+            shards = {}
+            # Données brutes libérées au fur et à mesure de la création des timers
+            for timer_data in drain(data.get("timers", [])):
+                timer = Timer.from_dict(timer_data)
+                key = timer.key
+                shard = shards.get(timer.fenetre_id)
+                if shard is None:
+                    shard = shards[timer.fenetre_id] = _TimerShard()
+                shard.timers[key] = timer
 
             with self._lock:
-                self._timers = {}
-                for timer_data in data.get("timers", []):
-                    timer = Timer.from_dict(timer_data)
-                    key = self._get_timer_key(timer.nom, timer.fenetre_id)
-                    self._timers[key] = timer
+                self._shards = shards
+                for shard in shards.values():
+                    with shard.lock:
+                        for timer in shard.timers.values():
+                            self._suivre(shard, timer)
+                        self._indexer(shard)
 
-            logger.info(f"Chargé {len(self._timers)} timer(s) depuis {self.filepath}")
+            logger.info(f"Chargé {len(self)} timer(s) depuis {self.filepath}")
 
         except Exception as e:
             logger.error(f"Erreur chargement timers: {e}")
 
     def save(self):
-        """Sauvegarde les timers dans le fichier"""
+        """Demande une sauvegarde différée (non bloquant)
+
+        Les demandes rapprochées sont regroupées en une seule écriture.
+        """
+        self._saver.request()
+
+    def flush(self):
+        """Écrit immédiatement les modifications en attente"""
+        self._saver.flush()
+
+    def _save_impl(self):
+        """Sauvegarde les timers dans le fichier (PROTÉGÉ)"""
         try:
             # Créer le dossier si nécessaire
             DATA_DIR.mkdir(parents=True, exist_ok=True)
 
-            with self._lock:
-                data = {
-                    "last_save": time.time(),
-                    "timers": [t.to_dict() for t in self._timers.values()],
-                }
+            # Instantané de chaque fenêtre sous son propre verrou
+            timers = []
+            for shard in list(self._shards.values()):
+                with shard.lock:
+                    timers.extend(t.to_dict() for t in shard.timers.values())
+
+            data = {
+                "last_save": time.time(),
+                "timers": timers,
+            }
 
-            with open(self.filepath, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            write_json_atomic(self.filepath, data, pretty=self.pretty)
 
-            logger.debug(f"Sauvegardé {len(self._timers)} timer(s)")
+            logger.debug(f"Sauvegardé {len(timers)} timer(s)")
 
         except Exception as e:
             logger.error(f"Erreur sauvegarde timers: {e}")
 
     def __len__(self):
-        return len(self._timers)
+        return sum(len(shard.timers) for shard in list(self._shards.values()))
 
     def __repr__(self):
-        return f"TimerManager({len(self._timers)} timers)"
+        return f"TimerManager({len(self)} timers)"
 
 
 # Instance globale
 _timer_manager_instance = None
+_timer_manager_instance_lock = Lock()
 
 
 def get_timer_manager():
@@ -359,5 +635,8 @@ def get_timer_manager():
     """
     global _timer_manager_instance
     if _timer_manager_instance is None:
-        _timer_manager_instance = TimerManager()
+        # Création sous verrou : deux threads ne doivent pas charger deux instances
+        with _timer_manager_instance_lock:
+            if _timer_manager_instance is None:
+                _timer_manager_instance = TimerManager()
     return _timer_manager_instance
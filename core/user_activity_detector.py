@@ -4,10 +4,11 @@ Utilise pynput pour une détection non-bloquante.
 Fonctionne sur Windows, macOS et Linux.
 """
 
+import queue
 import time
-from threading import Lock
+from threading import Event, Lock, Thread
 
-from utils.config import ACTIVITY_CHECK_INTERVAL, PAUSE_SI_ACTIVITE_USER
+from utils.config import PAUSE_SI_ACTIVITE_USER
 from utils.logger import get_module_logger
 
 logger = get_module_logger("UserActivityDetector")
@@ -22,17 +23,25 @@ except ImportError:
     logger.warning("pynput non disponible - Détection activité désactivée")
 
 
+# Marqueur de fin pour le thread de traitement des événements
+_ARRET = object()
+
+
 class UserActivityDetector:
     """Détecteur d'activité utilisateur (souris + clavier)
 
     Surveille les mouvements de souris, clics et frappes clavier
     pour détecter si l'utilisateur est actif.
+
+    Les callbacks pynput tournent sur le thread du hook d'entrée : ils se
+    limitent à déposer un marqueur dans une file sans verrou. Un thread dédié
+    vide la file, horodate une fois par lot et met à jour l'état ; les
+    lecteurs lisent l'horodatage une seule fois.
     """
 
     def __init__(self):
         """Initialise le détecteur"""
         self._derniere_activite = 0
-        self._lock = Lock()
         self._running = False
         self._mouse_listener = None
         self._keyboard_listener = None
@@ -40,6 +49,16 @@ class UserActivityDetector:
         # Position souris pour détecter mouvements
         self._last_mouse_pos = None
 
+        # Événements déposés par les callbacks, traités par _drain() hors du hook
+        self._event_queue = queue.SimpleQueue()
+        self._drain_thread = None
+        # Regroupement : au plus un horodatage toutes les _coalescence secondes
+        # (invisible face aux timeouts de plusieurs secondes)
+        self._coalescence = 0.05
+
+        # Signalé à chaque activité : réveille wait_for_inactivity() sans sondage
+        self._activity_event = Event()
+
     def start(self):
         """Démarre la détection
 
@@ -58,6 +77,10 @@ class UserActivityDetector:
         self._running = True
 
         try:
+            # Thread de traitement des événements
+            self._drain_thread = Thread(target=self._drain, name="UserActivityDrain", daemon=True)
+            self._drain_thread.start()
+
             # Listener souris
             self._mouse_listener = mouse.Listener(
                 on_move=self._on_mouse_move,
@@ -71,7 +94,7 @@ class UserActivityDetector:
             self._keyboard_listener.start()
 
             # Initialiser le timestamp
-            self._derniere_activite = time.time()
+            self._derniere_activite = time.monotonic()
 
             logger.info("Détection d'activité démarrée")
             return True
@@ -79,6 +102,7 @@ class UserActivityDetector:
         except Exception as e:
             logger.error(f"Erreur démarrage détection: {e}")
             self._running = False
+            self._arreter_drain()
             return False
 
     def stop(self):
@@ -101,29 +125,63 @@ class UserActivityDetector:
         except Exception as e:
             logger.error(f"Erreur arrêt détection: {e}")
 
+        self._arreter_drain()
+
         logger.info("Détection d'activité arrêtée")
 
     def _on_mouse_move(self, x, y):
         """Callback mouvement souris (PROTÉGÉ)"""
-        with self._lock:
-            self._derniere_activite = time.time()
-            self._last_mouse_pos = (x, y)
+        self._last_mouse_pos = (x, y)
+        self._event_queue.put_nowait(None)
 
     def _on_mouse_click(self, x, y, button, pressed):
         """Callback clic souris (PROTÉGÉ)"""
         if pressed:
-            with self._lock:
-                self._derniere_activite = time.time()
+            self._event_queue.put_nowait(None)
 
     def _on_mouse_scroll(self, x, y, dx, dy):
         """Callback scroll souris (PROTÉGÉ)"""
-        with self._lock:
-            self._derniere_activite = time.time()
+        self._event_queue.put_nowait(None)
 
     def _on_key_press(self, key):
         """Callback touche clavier (PROTÉGÉ)"""
-        with self._lock:
-            self._derniere_activite = time.time()
+        self._event_queue.put_nowait(None)
+
+    def _drain(self):
+        """Boucle du thread de traitement des événements (PROTÉGÉ)
+
+        Attend un événement, vide la file, horodate une seule fois pour tout
+        le lot puis laisse les suivants s'accumuler pendant _coalescence.
+        """
+        file = self._event_queue
+        while True:
+            arret = file.get() is _ARRET
+            while not arret:
+                try:
+                    arret = file.get_nowait() is _ARRET
+                except queue.Empty:
+                    break
+            if arret:
+                return
+
+            self._derniere_activite = time.monotonic()
+            self._signaler_activite()
+            time.sleep(self._coalescence)
+
+    def _arreter_drain(self):
+        """Arrête le thread de traitement des événements (PROTÉGÉ)"""
+        if self._drain_thread is not None:
+            self._event_queue.put_nowait(_ARRET)
+            self._drain_thread = None
+
+    def _signaler_activite(self):
+        """Réveille un éventuel wait_for_inactivity() (PROTÉGÉ)
+
+        Event.set() prend un verrou interne : on ne l'appelle que si
+        l'événement n'est pas déjà levé (lecture simple).
+        """
+        if not self._activity_event.is_set():
+            self._activity_event.set()
 
     def is_user_active(self, timeout=2.0):
         """Vérifie si l'utilisateur a été actif récemment
@@ -137,9 +195,8 @@ class UserActivityDetector:
         if not PYNPUT_AVAILABLE or not self._running:
             return False
 
-        with self._lock:
-            elapsed = time.time() - self._derniere_activite
-            return elapsed < timeout
+        derniere_activite = self._derniere_activite
+        return time.monotonic() - derniere_activite < timeout
 
     def get_time_since_activity(self):
         """Retourne le temps écoulé depuis la dernière activité
@@ -147,8 +204,8 @@ class UserActivityDetector:
         Returns:
             float: Secondes depuis la dernière activité
         """
-        with self._lock:
-            return time.time() - self._derniere_activite
+        derniere_activite = self._derniere_activite
+        return time.monotonic() - derniere_activite
 
     def wait_for_inactivity(self, inactivity_duration=2.0, max_wait=None):
         """Attend que l'utilisateur soit inactif
@@ -163,13 +220,26 @@ class UserActivityDetector:
         if max_wait is None:
             max_wait = PAUSE_SI_ACTIVITE_USER
 
-        start = time.time()
-
-        while (time.time() - start) < max_wait:
-            if not self.is_user_active(inactivity_duration):
-                logger.debug(f"Inactivité détectée après {time.time() - start:.1f}s")
+        start = time.monotonic()
+        deadline = start + max_wait
+
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+
+            # Effacer avant de lire l'horodatage : une activité concurrente relève l'événement
+            self._activity_event.clear()
+            if not PYNPUT_AVAILABLE or not self._running:
+                restant = 0.0
+            else:
+                restant = inactivity_duration - (now - self._derniere_activite)
+            if restant <= 0:
+                logger.debug(f"Inactivité détectée après {now - start:.1f}s")
                 return True
-            time.sleep(ACTIVITY_CHECK_INTERVAL)
+
+            # Dormir jusqu'à la fin de la période d'inactivité ou jusqu'à la prochaine activité
+            self._activity_event.wait(min(restant, deadline - now))
 
         logger.warning(f"Timeout d'attente d'inactivité ({max_wait}s)")
         return False
@@ -180,8 +250,7 @@ class UserActivityDetector:
         Utile après une action automatique pour éviter de la confondre
         avec une activité utilisateur.
         """
-        with self._lock:
-            self._derniere_activite = time.time()
+        self._derniere_activite = time.monotonic()
 
     def get_last_mouse_position(self):
         """Retourne la dernière position de souris détectée
@@ -189,8 +258,7 @@ class UserActivityDetector:
         Returns:
             Tuple (x, y) ou None
         """
-        with self._lock:
-            return self._last_mouse_pos
+        return self._last_mouse_pos
 
     @property
     def is_running(self):
@@ -200,6 +268,7 @@ class UserActivityDetector:
 
 # Instance globale
 _activity_detector_instance = None
+_activity_detector_instance_lock = Lock()
 
 
 def get_activity_detector():
@@ -210,5 +279,8 @@ def get_activity_detector():
     """
     global _activity_detector_instance
     if _activity_detector_instance is None:
-        _activity_detector_instance = UserActivityDetector()
+        # Création sous verrou : deux threads ne doivent pas créer deux instances
+        with _activity_detector_instance_lock:
+            if _activity_detector_instance is None:
+                _activity_detector_instance = UserActivityDetector()
     return _activity_detector_instance
@@ -4,9 +4,11 @@ Utilise pywin32 pour interagir avec les fenêtres Windows.
 Fonctionne uniquement sur Windows.
 """
 
-import builtins
-import contextlib
+import sys
 import time
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock, local
 
 from utils.logger import get_module_logger
 
@@ -16,13 +18,160 @@ logger = get_module_logger("WindowManager")
 try:
     import win32con
     import win32gui
-    import win32process
 
     WIN32_AVAILABLE = True
 except ImportError:
     WIN32_AVAILABLE = False
     logger.warning("pywin32 non disponible - WindowManager désactivé")
 
+# user32 via ctypes pour les appels fréquents (activation, état, position) :
+# prototypes déclarés une fois, sans conversion pywin32 à chaque appel
+_user32 = None
+if WIN32_AVAILABLE:
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        _user32 = ctypes.WinDLL("user32", use_last_error=True)
+    except (AttributeError, OSError, ValueError):
+        # Hors Windows (ctypes.WinDLL absent)
+        _user32 = None
+
+if _user32 is not None:
+    for _nom, _args, _retour in (
+        ("IsWindow", [wintypes.HWND], wintypes.BOOL),
+        ("IsWindowVisible", [wintypes.HWND], wintypes.BOOL),
+        ("IsIconic", [wintypes.HWND], wintypes.BOOL),
+        ("GetForegroundWindow", [], wintypes.HWND),
+        ("GetWindowThreadProcessId", [wintypes.HWND, wintypes.LPDWORD], wintypes.DWORD),
+        ("AttachThreadInput", [wintypes.DWORD, wintypes.DWORD, wintypes.BOOL], wintypes.BOOL),
+        ("BringWindowToTop", [wintypes.HWND], wintypes.BOOL),
+        ("ShowWindow", [wintypes.HWND, ctypes.c_int], wintypes.BOOL),
+        ("SetForegroundWindow", [wintypes.HWND], wintypes.BOOL),
+        ("GetWindowRect", [wintypes.HWND, ctypes.POINTER(wintypes.RECT)], wintypes.BOOL),
+        (
+            "MoveWindow",
+            [wintypes.HWND, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_int, wintypes.BOOL],
+            wintypes.BOOL,
+        ),
+        ("GetWindowTextW", [wintypes.HWND, wintypes.LPWSTR, ctypes.c_int], ctypes.c_int),
+        ("GetWindowTextLengthW", [wintypes.HWND], ctypes.c_int),
+        ("GetWindowLongW", [wintypes.HWND, ctypes.c_int], wintypes.LONG),
+    ):
+        _fonction = getattr(_user32, _nom)
+        _fonction.argtypes = _args
+        _fonction.restype = _retour
+
+    class _WINDOWINFO(ctypes.Structure):
+        """Structure WINDOWINFO de user32 (existence, style et rectangle en un appel)"""
+
+        _fields_ = [
+            ("cbSize", wintypes.DWORD),
+            ("rcWindow", wintypes.RECT),
+            ("rcClient", wintypes.RECT),
+            ("dwStyle", wintypes.DWORD),
+            ("dwExStyle", wintypes.DWORD),
+            ("dwWindowStatus", wintypes.DWORD),
+            ("cxWindowBorders", wintypes.UINT),
+            ("cyWindowBorders", wintypes.UINT),
+            ("atomWindowType", wintypes.ATOM),
+            ("wCreatorVersion", wintypes.WORD),
+        ]
+
+    _user32.GetWindowInfo.argtypes = [wintypes.HWND, ctypes.POINTER(_WINDOWINFO)]
+    _user32.GetWindowInfo.restype = wintypes.BOOL
+
+    _WNDENUMPROC = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+    _user32.EnumWindows.argtypes = [_WNDENUMPROC, wintypes.LPARAM]
+    _user32.EnumWindows.restype = wintypes.BOOL
+
+# Tampon de lecture des titres, réutilisé d'une fenêtre à l'autre (un par thread)
+_TITRE_TAMPON = 512
+_tampon_titre = local()
+
+
+def _window_info(hwnd):
+    """Lit WINDOWINFO d'une fenêtre en un seul appel user32
+
+    Args:
+        hwnd: Handle de la fenêtre
+
+    Returns:
+        _WINDOWINFO ou None si la fenêtre n'existe pas
+    """
+    info = _WINDOWINFO()
+    info.cbSize = ctypes.sizeof(_WINDOWINFO)
+    if not _user32.GetWindowInfo(hwnd, ctypes.byref(info)):
+        return None
+    return info
+
+
+def _is_visible_toplevel(hwnd):
+    """Teste le style WS_VISIBLE d'une fenêtre de premier niveau
+
+    Pour une fenêtre sans parent (celles que rend EnumWindows), le bit
+    WS_VISIBLE suffit : inutile de remonter la chaîne des parents comme le
+    fait IsWindowVisible. Sans user32 (ctypes), repli sur IsWindowVisible.
+
+    Args:
+        hwnd: Handle d'une fenêtre de premier niveau
+
+    Returns:
+        bool: True si la fenêtre a le style WS_VISIBLE
+    """
+    if _user32 is None:
+        return bool(win32gui.IsWindowVisible(hwnd))
+    return bool(_user32.GetWindowLongW(hwnd, win32con.GWL_STYLE) & win32con.WS_VISIBLE)
+
+
+def _window_text(hwnd):
+    """Lit le titre d'une fenêtre sans allouer de tampon à chaque appel
+
+    Le titre est lu dans un tampon propre au thread ; il n'est agrandi que
+    pour un titre plus long que le tampon. Sans user32 (ctypes), repli sur
+    win32gui.GetWindowText.
+
+    Args:
+        hwnd: Handle de la fenêtre
+
+    Returns:
+        str: Titre de la fenêtre ("" si aucun)
+    """
+    if _user32 is None:
+        return win32gui.GetWindowText(hwnd)
+
+    tampon = getattr(_tampon_titre, "tampon", None)
+    if tampon is None:
+        tampon = _tampon_titre.tampon = ctypes.create_unicode_buffer(_TITRE_TAMPON)
+    if _user32.GetWindowTextW(hwnd, tampon, len(tampon)) >= len(tampon) - 1:
+        # Titre peut-être tronqué : agrandir le tampon si nécessaire
+        longueur = _user32.GetWindowTextLengthW(hwnd)
+        if longueur >= len(tampon):
+            tampon = _tampon_titre.tampon = ctypes.create_unicode_buffer(longueur + 1)
+            _user32.GetWindowTextW(hwnd, tampon, len(tampon))
+    return tampon.value
+
+
+def _window_rect(hwnd):
+    """Lit le rectangle d'une fenêtre via user32
+
+    Args:
+        hwnd: Handle de la fenêtre
+
+    Returns:
+        Tuple (left, top, right, bottom), lève OSError en cas d'erreur
+    """
+    rect = wintypes.RECT()
+    if not _user32.GetWindowRect(hwnd, ctypes.byref(rect)):
+        raise ctypes.WinError(ctypes.get_last_error())
+    return (rect.left, rect.top, rect.right, rect.bottom)
+
+
+def _move_window(hwnd, x, y, width, height, repaint):
+    """Déplace et redimensionne une fenêtre via user32, lève OSError en cas d'erreur"""
+    if not _user32.MoveWindow(hwnd, x, y, width, height, repaint):
+        raise ctypes.WinError(ctypes.get_last_error())
+
 
 class WindowManager:
     """Gestionnaire de fenêtres Windows
@@ -30,13 +179,82 @@ class WindowManager:
     Permet de trouver, activer et manipuler les fenêtres Windows.
     """
 
+    # Nombre maximal de recherches mémorisées par find_window()
+    WINDOW_CACHE_MAX = 32
+
+    # Énumération des fenêtres partagée par les recherches rapprochées (secondes)
+    ENUM_CACHE_TTL = 0.2
+
+    # GetWindowRect partagé par les appels d'une même « frame » (~16 ms)
+    RECT_CACHE_TTL = 0.016
+    RECT_CACHE_MAX = 64
+
     def __init__(self):
         """Initialise le gestionnaire"""
         if not WIN32_AVAILABLE:
             logger.error("pywin32 requis pour WindowManager")
 
-        # Cache des fenêtres trouvées {titre: hwnd}
-        self._window_cache = {}
+        # Cache LRU des fenêtres trouvées {recherche: (hwnd, titre)}, la recherche
+        # étant titre_partiel.casefold() : "BlueStacks" et "bluestacks" partagent l'entrée
+        self._window_cache = OrderedDict()
+        # Index inverse {hwnd: {recherche, ...}} pour invalider une fenêtre en O(1)
+        self._hwnd_to_keys = {}
+
+        # Dernière énumération des fenêtres visibles [(hwnd, titre, titre.casefold()), ...]
+        # partagée par find_window / find_all_windows / list_all_windows
+        self._enum_cache = None
+        self._enum_cache_ts = 0.0
+
+        # Cache LRU des rectangles {hwnd: (timestamp, rect)}
+        self._rect_cache = OrderedDict()
+
+        # Thread propriétaire des fenêtres activées {hwnd: thread_id}
+        self._tid_cache = {}
+
+    def _enumerate(self, rafraichir=False):
+        """Énumère les fenêtres visibles ayant un titre (PROTÉGÉ)
+
+        Un seul EnumWindows par rafale de recherches : le résultat est
+        réutilisé pendant ENUM_CACHE_TTL secondes.
+
+        Args:
+            rafraichir: Si True, ignore l'énumération en cache
+
+        Returns:
+            List[Tuple]: Liste de (hwnd, titre, titre normalisé par casefold())
+        """
+        now = time.monotonic()
+        if (
+            not rafraichir
+            and self._enum_cache is not None
+            and now - self._enum_cache_ts < self.ENUM_CACHE_TTL
+        ):
+            return self._enum_cache
+
+        windows = []
+
+        def enum_callback(hwnd, _):
+            if _is_visible_toplevel(hwnd):
+                titre = _window_text(hwnd)
+                if titre:  # Ignorer les fenêtres sans titre
+                    # casefold() une fois par titre et par énumération. Pas de rejet
+                    # préalable sur la longueur du titre brut : casefold() peut
+                    # l'allonger ("ß" -> "ss"), le test « in » s'en charge
+                    windows.append((hwnd, titre, titre.casefold()))
+            return True
+
+        try:
+            if _user32 is not None:
+                _user32.EnumWindows(_WNDENUMPROC(enum_callback), 0)
+            else:
+                win32gui.EnumWindows(enum_callback, None)
+        except Exception as e:
+            logger.error(f"Erreur EnumWindows: {e}")
+            return windows
+
+        self._enum_cache = windows
+        self._enum_cache_ts = now
+        return windows
 
     def find_window(self, titre_partiel, use_cache=True):
         """Trouve une fenêtre par son titre (recherche partielle)
@@ -52,37 +270,95 @@ class WindowManager:
             return None
 
         # Vérifier le cache
-        if use_cache and titre_partiel in self._window_cache:
-            hwnd = self._window_cache[titre_partiel]
-            # Vérifier que la fenêtre existe toujours
-            if win32gui.IsWindow(hwnd):
+        recherche = sys.intern(titre_partiel.casefold())
+        rafraichir = not use_cache
+        if use_cache and recherche in self._window_cache:
+            hwnd, _ = self._window_cache[recherche]
+            # Vérifier que la fenêtre est encore visible et porte ce titre : une
+            # fenêtre fermée n'a plus de titre, un hwnd réattribué en a un autre,
+            # et l'énumération ne retient que les fenêtres visibles
+            try:
+                titre = _window_text(hwnd) if _is_visible_toplevel(hwnd) else ""
+            except Exception:
+                titre = ""
+            if titre and recherche in titre.casefold():
+                self._window_cache.move_to_end(recherche)
                 return hwnd
-            else:
-                del self._window_cache[titre_partiel]
+            self._oublier(recherche)
+            # L'énumération en cache est aussi périmée
+            rafraichir = True
+
+        # Chemin rapide : titre exact, comparé par user32 sans énumérer les fenêtres
+        hwnd = self._find_exact(titre_partiel)
+        if hwnd:
+            self._memoriser(recherche, hwnd, titre_partiel)
+            logger.debug(f"Fenêtre trouvée (titre exact): '{titre_partiel}' (hwnd={hwnd})")
+            return hwnd
 
-        # Rechercher la fenêtre
-        found_windows = []
+        # Rechercher la fenêtre. L'énumération est complète (pas d'arrêt au premier
+        # résultat) : elle est réutilisée par les recherches suivantes pendant
+        # ENUM_CACHE_TTL, le parcours ci-dessous s'arrête lui au premier résultat
+        for hwnd, titre, titre_cf in self._enumerate(rafraichir=rafraichir):
+            if recherche in titre_cf:
+                self._memoriser(recherche, hwnd, titre)
+                logger.debug(f"Fenêtre trouvée: '{titre}' (hwnd={hwnd})")
+                return hwnd
+
+        logger.debug(f"Fenêtre non trouvée: '{titre_partiel}'")
+        return None
 
-        def enum_callback(hwnd, windows):
-            if win32gui.IsWindowVisible(hwnd):
-                titre = win32gui.GetWindowText(hwnd)
-                if titre and titre_partiel.lower() in titre.lower():
-                    windows.append((hwnd, titre))
+    @staticmethod
+    def _find_exact(titre):
+        """Cherche une fenêtre visible portant exactement ce titre (PROTÉGÉ)
 
-        try:
-            win32gui.EnumWindows(enum_callback, found_windows)
-        except Exception as e:
-            logger.error(f"Erreur EnumWindows: {e}")
-            return None
+        Args:
+            titre: Titre complet de la fenêtre
 
-        if found_windows:
-            hwnd, titre = found_windows[0]
-            self._window_cache[titre_partiel] = hwnd
-            logger.debug(f"Fenêtre trouvée: '{titre}' (hwnd={hwnd})")
+        Returns:
+            int: Handle de la fenêtre, 0 si aucune
+        """
+        try:
+            hwnd = win32gui.FindWindow(None, titre)
+        except Exception:
+            # Selon la version de pywin32, une absence lève une erreur
+            return 0
+        if hwnd and _is_visible_toplevel(hwnd):
             return hwnd
+        return 0
+
+    def _memoriser(self, recherche, hwnd, titre):
+        """Mémorise le résultat d'une recherche, en évinçant la plus ancienne (PROTÉGÉ)"""
+        self._oublier(recherche)
+        self._window_cache[recherche] = (hwnd, titre)
+        self._hwnd_to_keys.setdefault(hwnd, set()).add(recherche)
+        if len(self._window_cache) > self.WINDOW_CACHE_MAX:
+            self._oublier(next(iter(self._window_cache)))
+
+    def _oublier(self, recherche):
+        """Retire une recherche du cache et de l'index inverse (PROTÉGÉ)"""
+        entree = self._window_cache.pop(recherche, None)
+        if entree is None:
+            return
+        cles = self._hwnd_to_keys.get(entree[0])
+        if cles is not None:
+            cles.discard(recherche)
+            if not cles:
+                del self._hwnd_to_keys[entree[0]]
+
+    def invalidate(self, titre_partiel=None, hwnd=None):
+        """Oublie une recherche mémorisée par find_window()
 
-        logger.debug(f"Fenêtre non trouvée: '{titre_partiel}'")
-        return None
+        Args:
+            titre_partiel: Recherche à oublier
+            hwnd: Oublier toutes les recherches ayant abouti à cette fenêtre
+        """
+        if titre_partiel is not None:
+            self._oublier(titre_partiel.casefold())
+        if hwnd is not None:
+            for cle in self._hwnd_to_keys.pop(hwnd, ()):
+                del self._window_cache[cle]
+            self._tid_cache.pop(hwnd, None)
+        self._enum_cache = None
 
     def find_all_windows(self, titre_partiel):
         """Trouve toutes les fenêtres correspondant au titre
@@ -96,22 +372,33 @@ class WindowManager:
         if not WIN32_AVAILABLE:
             return []
 
-        found_windows = []
-
-        def enum_callback(hwnd, windows):
-            if win32gui.IsWindowVisible(hwnd):
-                titre = win32gui.GetWindowText(hwnd)
-                if titre and titre_partiel.lower() in titre.lower():
-                    windows.append((hwnd, titre))
-
-        try:
-            win32gui.EnumWindows(enum_callback, found_windows)
-        except Exception as e:
-            logger.error(f"Erreur EnumWindows: {e}")
+        recherche = titre_partiel.casefold()
+        found_windows = [
+            (hwnd, titre) for hwnd, titre, titre_cf in self._enumerate() if recherche in titre_cf
+        ]
 
         logger.debug(f"Trouvé {len(found_windows)} fenêtre(s) pour '{titre_partiel}'")
         return found_windows
 
+    @staticmethod
+    def _attendre(condition, delai, intervalle=0.005):
+        """Attend qu'une condition soit vraie, au plus delai secondes (PROTÉGÉ)
+
+        Args:
+            condition: Fonction sans argument retournant un booléen
+            delai: Attente maximale en secondes
+            intervalle: Pause entre deux vérifications
+
+        Returns:
+            bool: True si la condition est devenue vraie
+        """
+        deadline = time.monotonic() + delai
+        while not condition():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(intervalle)
+        return True
+
     def activate_window(self, hwnd):
         """Active une fenêtre (met au premier plan)
 
@@ -119,71 +406,94 @@ class WindowManager:
             hwnd: Handle de la fenêtre
 
         Returns:
-            bool: True si succès
+            bool: True si la fenêtre est effectivement au premier plan
         """
-        if not WIN32_AVAILABLE:
+        if _user32 is None:
             return False
 
         try:
-            # Vérifier que la fenêtre existe
-            if not win32gui.IsWindow(hwnd):
+            # Existence et style en un seul appel (au lieu de IsWindow + IsIconic + ...)
+            info = _window_info(hwnd)
+            if info is None:
                 logger.error(f"Fenêtre {hwnd} n'existe plus")
                 return False
 
-            # Restaurer si minimisée
-            if win32gui.IsIconic(hwnd):
-                win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
-                time.sleep(0.2)
+            # Restaurer si minimisée (SW_RESTORE l'affiche aussi)
+            restauree = bool(info.dwStyle & win32con.WS_MINIMIZE)
+
+            # Déjà au premier plan et non minimisée : rien à faire
+            if not restauree and _user32.GetForegroundWindow() == hwnd:
+                logger.debug(f"Fenêtre {hwnd} déjà au premier plan")
+                return True
+
+            if restauree:
+                _user32.ShowWindow(hwnd, win32con.SW_RESTORE)
+                self._attendre(lambda: not _user32.IsIconic(hwnd), 0.2)
 
             # Mettre au premier plan
             # Méthode robuste avec AttachThreadInput pour contourner restrictions Windows
-            try:
-                # Obtenir le thread de la fenêtre courante au premier plan
-                foreground_hwnd = win32gui.GetForegroundWindow()
-                foreground_thread = win32process.GetWindowThreadProcessId(foreground_hwnd)[0]
-                target_thread = win32process.GetWindowThreadProcessId(hwnd)[0]
-
-                # Attacher les threads pour permettre SetForegroundWindow
-                if foreground_thread != target_thread:
-                    try:
-                        import ctypes
-
-                        ctypes.windll.user32.AttachThreadInput(
-                            foreground_thread, target_thread, True
-                        )
-                    except Exception:
-                        pass  # Ignorer si échoue
+            foreground_hwnd = _user32.GetForegroundWindow()
+            foreground_thread = (
+                _user32.GetWindowThreadProcessId(foreground_hwnd, None) if foreground_hwnd else 0
+            )
+            target_thread = self._thread_de(hwnd)
 
-                # Forcer l'activation
-                win32gui.BringWindowToTop(hwnd)
-                win32gui.ShowWindow(hwnd, win32con.SW_SHOW)
-                win32gui.SetForegroundWindow(hwnd)
+            # Attacher les threads pour permettre SetForegroundWindow
+            attache = False
+            if foreground_thread and foreground_thread != target_thread:
+                attache = bool(_user32.AttachThreadInput(foreground_thread, target_thread, True))
+                if not attache:
+                    logger.debug(f"AttachThreadInput refusé (erreur {ctypes.get_last_error()})")
 
+            try:
+                # Forcer l'activation
+                _user32.BringWindowToTop(hwnd)
+                if not restauree and not info.dwStyle & win32con.WS_VISIBLE:
+                    _user32.ShowWindow(hwnd, win32con.SW_SHOW)
+                if not _user32.SetForegroundWindow(hwnd):
+                    logger.debug(
+                        f"SetForegroundWindow({hwnd}) refusé (erreur {ctypes.get_last_error()})"
+                    )
+            finally:
                 # Détacher les threads
-                if foreground_thread != target_thread:
-                    with contextlib.suppress(builtins.BaseException):
-                        ctypes.windll.user32.AttachThreadInput(
-                            foreground_thread, target_thread, False
-                        )
-
-            except Exception:
-                # Fallback : méthode simple
-                try:
-                    win32gui.BringWindowToTop(hwnd)
-                    win32gui.SetForegroundWindow(hwnd)
-                except Exception:
-                    pass
+                if attache:
+                    _user32.AttachThreadInput(foreground_thread, target_thread, False)
 
-            time.sleep(0.1)
+            # Attendre que la fenêtre soit réellement au premier plan (sortie anticipée)
+            active = self._attendre(lambda: _user32.GetForegroundWindow() == hwnd, 0.2)
+            self._invalider_rect(hwnd)
 
-            logger.debug(f"Fenêtre {hwnd} activée")
-            return True
+            if active:
+                logger.debug(f"Fenêtre {hwnd} activée")
+            else:
+                # SetForegroundWindow peut échouer si l'utilisateur est actif ;
+                # ne pas réutiliser un thread peut-être périmé (hwnd réattribué)
+                self._tid_cache.pop(hwnd, None)
+                logger.warning(f"Fenêtre {hwnd} non passée au premier plan")
+            return active
 
         except Exception as e:
-            # SetForegroundWindow peut échouer si l'utilisateur est actif
-            # Ce n'est pas critique, juste un warning
-            logger.warning(f"Activation fenêtre {hwnd} partielle: {e}")
-            return True  # On continue quand même
+            logger.error(f"Erreur activate_window({hwnd}): {e}")
+            return False
+
+    def _thread_de(self, hwnd):
+        """Thread propriétaire d'une fenêtre, mémorisé entre deux activations (PROTÉGÉ)
+
+        Le thread d'une fenêtre ne change pas pendant sa vie ; l'entrée est
+        oubliée à la fermeture, à l'invalidation et après un échec d'activation.
+
+        Args:
+            hwnd: Handle d'une fenêtre existante
+
+        Returns:
+            int: Identifiant du thread
+        """
+        tid = self._tid_cache.get(hwnd)
+        if tid is None:
+            tid = _user32.GetWindowThreadProcessId(hwnd, None)
+            if tid:
+                self._tid_cache[hwnd] = tid
+        return tid
 
     def get_window_rect(self, hwnd):
         """Obtient les coordonnées d'une fenêtre
@@ -194,15 +504,41 @@ class WindowManager:
         Returns:
             Tuple (left, top, right, bottom) ou None
         """
-        if not WIN32_AVAILABLE:
+        if _user32 is None:
             return None
 
         try:
-            return win32gui.GetWindowRect(hwnd)
+            return self._rect(hwnd)
         except Exception as e:
             logger.error(f"Erreur GetWindowRect({hwnd}): {e}")
             return None
 
+    def _rect(self, hwnd):
+        """GetWindowRect mémorisé RECT_CACHE_TTL secondes (PROTÉGÉ)
+
+        Args:
+            hwnd: Handle de la fenêtre
+
+        Returns:
+            Tuple (left, top, right, bottom), lève une exception en cas d'erreur
+        """
+        now = time.monotonic()
+        entree = self._rect_cache.get(hwnd)
+        if entree is not None and now - entree[0] < self.RECT_CACHE_TTL:
+            self._rect_cache.move_to_end(hwnd)
+            return entree[1]
+
+        rect = _window_rect(hwnd)
+        self._rect_cache[hwnd] = (now, rect)
+        self._rect_cache.move_to_end(hwnd)
+        if len(self._rect_cache) > self.RECT_CACHE_MAX:
+            self._rect_cache.popitem(last=False)
+        return rect
+
+    def _invalider_rect(self, hwnd):
+        """Oublie le rectangle mémorisé d'une fenêtre déplacée ou modifiée (PROTÉGÉ)"""
+        self._rect_cache.pop(hwnd, None)
+
     def get_window_size(self, hwnd):
         """Obtient la taille d'une fenêtre
 
@@ -231,7 +567,7 @@ class WindowManager:
             return None
 
         try:
-            return win32gui.GetWindowText(hwnd)
+            return _window_text(hwnd)
         except Exception:
             return None
 
@@ -244,11 +580,11 @@ class WindowManager:
         Returns:
             bool: True si visible
         """
-        if not WIN32_AVAILABLE:
+        if _user32 is None:
             return False
 
         try:
-            return win32gui.IsWindowVisible(hwnd)
+            return bool(_user32.IsWindowVisible(hwnd))
         except Exception:
             return False
 
@@ -261,11 +597,11 @@ class WindowManager:
         Returns:
             bool: True si minimisée
         """
-        if not WIN32_AVAILABLE:
+        if _user32 is None:
             return False
 
         try:
-            return win32gui.IsIconic(hwnd)
+            return bool(_user32.IsIconic(hwnd))
         except Exception:
             return False
 
@@ -278,11 +614,11 @@ class WindowManager:
         Returns:
             bool: True si existe
         """
-        if not WIN32_AVAILABLE:
+        if _user32 is None:
             return False
 
         try:
-            return win32gui.IsWindow(hwnd)
+            return bool(_user32.IsWindow(hwnd))
         except Exception:
             return False
 
@@ -295,11 +631,12 @@ class WindowManager:
         Returns:
             bool: True si succès
         """
-        if not WIN32_AVAILABLE:
+        if _user32 is None:
             return False
 
         try:
-            win32gui.ShowWindow(hwnd, win32con.SW_MINIMIZE)
+            _user32.ShowWindow(hwnd, win32con.SW_MINIMIZE)
+            self._invalider_rect(hwnd)
             return True
         except Exception as e:
             logger.error(f"Erreur minimize_window({hwnd}): {e}")
@@ -314,11 +651,12 @@ class WindowManager:
         Returns:
             bool: True si succès
         """
-        if not WIN32_AVAILABLE:
+        if _user32 is None:
             return False
 
         try:
-            win32gui.ShowWindow(hwnd, win32con.SW_RESTORE)
+            _user32.ShowWindow(hwnd, win32con.SW_RESTORE)
+            self._invalider_rect(hwnd)
             return True
         except Exception as e:
             logger.error(f"Erreur restore_window({hwnd}): {e}")
@@ -338,13 +676,15 @@ class WindowManager:
 
         try:
             win32gui.PostMessage(hwnd, win32con.WM_CLOSE, 0, 0)
+            self.invalidate(hwnd=hwnd)
+            self._invalider_rect(hwnd)
             logger.info(f"Message WM_CLOSE envoyé à {hwnd}")
             return True
         except Exception as e:
             logger.error(f"Erreur close_window({hwnd}): {e}")
             return False
 
-    def move_and_resize_window(self, hwnd, x=None, y=None, width=None, height=None):
+    def move_and_resize_window(self, hwnd, x=None, y=None, width=None, height=None, repaint=True):
         """Déplace et/ou redimensionne une fenêtre
 
         Args:
@@ -353,33 +693,35 @@ class WindowManager:
             y: Position Y (None pour conserver)
             width: Largeur (None pour conserver)
             height: Hauteur (None pour conserver)
+            repaint: Si False, ne force pas le repaint synchrone (fenêtre en
+                     arrière-plan, repeinte plus tard par Windows)
 
         Returns:
             bool: True si succès
         """
-        if not WIN32_AVAILABLE:
+        if _user32 is None:
             return False
 
         try:
             # Vérifier que la fenêtre existe
-            if not win32gui.IsWindow(hwnd):
+            if not _user32.IsWindow(hwnd):
                 logger.error(f"Fenêtre {hwnd} n'existe plus")
                 return False
 
-            # Obtenir les coordonnées actuelles
-            current_rect = win32gui.GetWindowRect(hwnd)
-            current_x, current_y = current_rect[0], current_rect[1]
-            current_width = current_rect[2] - current_rect[0]
-            current_height = current_rect[3] - current_rect[1]
-
-            # Utiliser les valeurs actuelles si non spécifiées
-            new_x = x if x is not None else current_x
-            new_y = y if y is not None else current_y
-            new_width = width if width is not None else current_width
-            new_height = height if height is not None else current_height
+            if None in (x, y, width, height):
+                # Compléter avec les coordonnées actuelles
+                left, top, right, bottom = self._rect(hwnd)
+                new_x = x if x is not None else left
+                new_y = y if y is not None else top
+                new_width = width if width is not None else right - left
+                new_height = height if height is not None else bottom - top
+            else:
+                # Tout est spécifié : inutile de lire le rectangle actuel
+                new_x, new_y, new_width, new_height = x, y, width, height
 
             # Déplacer et redimensionner
-            win32gui.MoveWindow(hwnd, new_x, new_y, new_width, new_height, True)
+            _move_window(hwnd, new_x, new_y, new_width, new_height, repaint)
+            self._invalider_rect(hwnd)
 
             logger.info(
                 f"Fenêtre {hwnd} placée à ({new_x}, {new_y}) avec dimensions {new_width}x{new_height}"
@@ -413,22 +755,27 @@ class WindowManager:
             # Redimensionner à 600px de hauteur avec ratio 16:9
             resize_with_aspect_ratio(hwnd, 600, aspect_ratio=16/9)
         """
-        if not WIN32_AVAILABLE:
+        if _user32 is None:
             return False
 
         try:
             # Vérifier que la fenêtre existe
-            if not win32gui.IsWindow(hwnd):
+            if not _user32.IsWindow(hwnd):
                 logger.error(f"Fenêtre {hwnd} n'existe plus")
                 return False
 
-            # Obtenir les dimensions actuelles si besoin du ratio
-            if aspect_ratio is None:
-                current_size = self.get_window_size(hwnd)
-                if not current_size:
+            # Un seul GetWindowRect, et seulement si le ratio ou la position manque
+            rect = None
+            if aspect_ratio is None or x is None or y is None:
+                try:
+                    rect = self._rect(hwnd)
+                except Exception:
                     logger.error(f"Impossible d'obtenir les dimensions de {hwnd}")
                     return False
-                current_width, current_height = current_size
+
+            # Obtenir les dimensions actuelles si besoin du ratio
+            if aspect_ratio is None:
+                current_width, current_height = rect[2] - rect[0], rect[3] - rect[1]
                 if current_height == 0:
                     logger.error(f"Hauteur actuelle nulle pour {hwnd}")
                     return False
@@ -443,8 +790,16 @@ class WindowManager:
                 f"{width}x{height} (hauteur={height}, largeur calculée={width})"
             )
 
-            # Utiliser move_and_resize_window pour effectuer le changement
-            return self.move_and_resize_window(hwnd, x=x, y=y, width=width, height=height)
+            # Déplacer et redimensionner directement (fenêtre et rectangle déjà vérifiés)
+            new_x = x if x is not None else rect[0]
+            new_y = y if y is not None else rect[1]
+            _move_window(hwnd, new_x, new_y, width, height, True)
+            self._invalider_rect(hwnd)
+
+            logger.info(
+                f"Fenêtre {hwnd} placée à ({new_x}, {new_y}) avec dimensions {width}x{height}"
+            )
+            return True
 
         except Exception as e:
             logger.error(f"Erreur resize_with_aspect_ratio({hwnd}): {e}")
@@ -466,29 +821,30 @@ class WindowManager:
         Returns:
             bool: True si succès
         """
-        if not WIN32_AVAILABLE:
+        if _user32 is None:
             return False
 
         try:
-            if not win32gui.IsWindow(hwnd):
+            if not _user32.IsWindow(hwnd):
                 logger.error(f"Fenêtre {hwnd} n'existe plus")
                 return False
 
             # Obtenir les dimensions actuelles
-            current_rect = win32gui.GetWindowRect(hwnd)
+            current_rect = self._rect(hwnd)
             current_width = current_rect[2] - current_rect[0]
             current_x = current_rect[0] if x is None else x
             current_y = current_rect[1] if y is None else y
 
             # Redimensionner avec la largeur actuelle et la nouvelle hauteur
             # BlueStacks pourrait ajuster sa largeur en interne
-            win32gui.MoveWindow(hwnd, current_x, current_y, current_width, height, True)
+            _move_window(hwnd, current_x, current_y, current_width, height, True)
+            self._invalider_rect(hwnd)
 
             # Attendre un peu pour que BlueStacks s'ajuste
             time.sleep(0.1)
 
             # Récupérer les nouvelles dimensions (BlueStacks peut les avoir ajustées)
-            new_rect = win32gui.GetWindowRect(hwnd)
+            new_rect = self._rect(hwnd)
             new_width = new_rect[2] - new_rect[0]
             new_height = new_rect[3] - new_rect[1]
 
@@ -509,13 +865,11 @@ class WindowManager:
         Returns:
             int: Handle de la fenêtre active
         """
-        if not WIN32_AVAILABLE:
+        if _user32 is None:
             return None
 
-        try:
-            return win32gui.GetForegroundWindow()
-        except Exception:
-            return None
+        # HWND nul renvoyé par ctypes sous forme de None
+        return _user32.GetForegroundWindow() or 0
 
     def is_window_foreground(self, hwnd):
         """Vérifie si une fenêtre est au premier plan
@@ -531,6 +885,9 @@ class WindowManager:
     def clear_cache(self):
         """Vide le cache des fenêtres"""
         self._window_cache.clear()
+        self._hwnd_to_keys.clear()
+        self._enum_cache = None
+        self._tid_cache.clear()
         logger.debug("Cache des fenêtres vidé")
 
     def list_all_windows(self):
@@ -542,24 +899,12 @@ class WindowManager:
         if not WIN32_AVAILABLE:
             return []
 
-        windows = []
-
-        def enum_callback(hwnd, result):
-            if win32gui.IsWindowVisible(hwnd):
-                titre = win32gui.GetWindowText(hwnd)
-                if titre:  # Ignorer les fenêtres sans titre
-                    result.append((hwnd, titre))
-
-        try:
-            win32gui.EnumWindows(enum_callback, windows)
-        except Exception as e:
-            logger.error(f"Erreur list_all_windows: {e}")
-
-        return windows
+        return [(hwnd, titre) for hwnd, titre, _ in self._enumerate()]
 
 
 # Instance globale
 _window_manager_instance = None
+_window_manager_instance_lock = Lock()
 
 
 def detecter_dimensions_bluestacks(largeur_actuelle, hauteur_actuelle):
@@ -587,6 +932,34 @@ def detecter_dimensions_bluestacks(largeur_actuelle, hauteur_actuelle):
             - a_bandeau: bool indiquant si bandeau présent
             - largeur_pub: largeur de la pub (0 si pas de pub)
     """
+    dimensions, a_pub, a_bandeau, largeur_pub, largeur_projetee = _detecter_configuration(
+        largeur_actuelle, hauteur_actuelle
+    )
+
+    logger.debug(
+        f"Détection BlueStacks: {largeur_actuelle}x{hauteur_actuelle} "
+        f"(projeté: {largeur_projetee:.0f}x{dimensions[1]}) -> "
+        f"pub={a_pub}, bandeau={a_bandeau} -> cible={dimensions[0]}x{dimensions[1]}"
+    )
+
+    return {
+        "dimensions": dimensions,
+        "a_pub": a_pub,
+        "a_bandeau": a_bandeau,
+        "largeur_pub": largeur_pub,
+    }
+
+
+@lru_cache(maxsize=64)
+def _detecter_configuration(largeur_actuelle, hauteur_actuelle):
+    """Calcul de detecter_dimensions_bluestacks(), mémorisé par dimensions (PROTÉGÉ)
+
+    Fonction pure : une fenêtre déjà placée redonne les mêmes dimensions à
+    chaque vérification, le résultat est alors lu dans le cache.
+
+    Returns:
+        Tuple (dimensions, a_pub, a_bandeau, largeur_pub, largeur_projetee)
+    """
     # Hauteur cible fixe
     HAUTEUR_CIBLE = 1030
 
@@ -627,18 +1000,7 @@ def detecter_dimensions_bluestacks(largeur_actuelle, hauteur_actuelle):
     # Calculer la largeur de pub si présente
     largeur_pub = dimensions[0] - 595 if a_pub else 0  # 915-595=320 ou 884-595=289
 
-    logger.debug(
-        f"Détection BlueStacks: {largeur_actuelle}x{hauteur_actuelle} "
-        f"(projeté: {largeur_projetee:.0f}x{HAUTEUR_CIBLE}) -> "
-        f"pub={a_pub}, bandeau={a_bandeau} -> cible={dimensions[0]}x{dimensions[1]}"
-    )
-
-    return {
-        "dimensions": dimensions,
-        "a_pub": a_pub,
-        "a_bandeau": a_bandeau,
-        "largeur_pub": largeur_pub,
-    }
+    return dimensions, a_pub, a_bandeau, largeur_pub, largeur_projetee
 
 
 def get_window_manager():
@@ -649,5 +1011,8 @@ def get_window_manager():
     """
     global _window_manager_instance
     if _window_manager_instance is None:
-        _window_manager_instance = WindowManager()
+        # Création sous verrou : deux threads ne doivent pas créer deux instances
+        with _window_manager_instance_lock:
+            if _window_manager_instance is None:
+                _window_manager_instance = WindowManager()
     return _window_manager_instance
@@ -0,0 +1,61 @@
+"""Tests pour Engine
+
+Vérifie l'enregistrement des manoirs, un par un ou par lot.
+"""
+
+import signal
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from core.engine import Engine
+
+
+def manoir(manoir_id, priorite=1):
+    """Manoir minimal : identifiant et priorité"""
+    return SimpleNamespace(manoir_id=manoir_id, priorite=priorite)
+
+
+class TestAjoutManoirs(unittest.TestCase):
+    """Tests de ajouter_manoir / ajouter_manoirs"""
+
+    def setUp(self):
+        # Engine installe ses gestionnaires SIGINT/SIGTERM : les restaurer
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            self.addCleanup(signal.signal, signum, signal.getsignal(signum))
+        self.engine = Engine()
+        self.engine.scheduler = MagicMock()
+        patcher = patch("core.engine.logger")
+        self.logger = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_ajout_par_lot(self):
+        """Un lot est enregistré avec une seule invalidation et un seul log"""
+        self.engine._contextes["b"] = SimpleNamespace()
+        self.engine.ajouter_manoirs({"a": manoir("a", 3), "b": manoir("b")})
+
+        self.assertEqual(list(self.engine.manoirs), ["a", "b"])
+        self.assertEqual(self.engine._echecs_consecutifs, {"a": 0, "b": 0})
+        self.assertNotIn("b", self.engine._contextes)
+        self.engine.scheduler.invalidate.assert_called_once_with()
+        self.logger.info.assert_called_once()
+        self.assertIn("a (priorité=3)", self.logger.info.call_args[0][0])
+
+    def test_ajout_par_liste(self):
+        """Une liste de manoirs est acceptée comme un dictionnaire"""
+        self.engine.ajouter_manoirs([manoir("a"), manoir("b")])
+
+        self.assertEqual(list(self.engine.manoirs), ["a", "b"])
+
+    def test_ajout_unitaire(self):
+        """Un manoir ajouté seul invalide l'ordonnanceur et remplace l'ancien"""
+        self.engine.ajouter_manoir(manoir("a"))
+        remplacant = manoir("a", 5)
+        self.engine.ajouter_manoir(remplacant)
+
+        self.assertIs(self.engine.manoirs["a"], remplacant)
+        self.assertEqual(self.engine.scheduler.invalidate.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
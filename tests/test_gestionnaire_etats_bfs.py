@@ -0,0 +1,164 @@
+"""Tests du pathfinding de GestionnaireEtats
+
+Compare le BFS bidirectionnel (_bfs_plus_court_chemin) à un BFS simple,
+reprise de l'implémentation d'origine, sur des graphes générés aléatoirement.
+"""
+
+import random
+import tempfile
+import unittest
+from collections import deque
+from pathlib import Path
+
+from core.gestionnaire_etats import GestionnaireEtats
+
+
+class EtatFactice:
+    """État minimal : seule l'identité compte pour le pathfinding"""
+
+    def __init__(self, nom):
+        self.nom = nom
+
+    def __repr__(self):
+        return f"EtatFactice({self.nom})"
+
+
+class CheminFactice:
+    """Chemin minimal vers une liste d'états de sortie possibles"""
+
+    def __init__(self, etat_initial, etat_sortie):
+        self.etat_initial = etat_initial
+        self.etat_sortie = etat_sortie
+
+    def est_certain(self):
+        return len(self.etat_sortie) == 1
+
+
+def bfs_reference(gestionnaire, graphe, depart, arrivee, max_profondeur):
+    """BFS unidirectionnel d'origine (file de (état, chemins parcourus))"""
+    file = deque([(depart, [])])
+    visites = set()
+
+    while file:
+        etat_actuel, chemin_parcouru = file.popleft()
+
+        if len(chemin_parcouru) > max_profondeur:
+            continue
+        if etat_actuel in visites:
+            continue
+        visites.add(etat_actuel)
+
+        if etat_actuel == arrivee:
+            return chemin_parcouru
+
+        for chemin in graphe.get(etat_actuel, []):
+            for etat_suivant in gestionnaire._obtenir_etats_sortie(chemin):
+                if etat_suivant not in visites:
+                    file.append((etat_suivant, chemin_parcouru + [chemin]))
+
+    return None
+
+
+class TestBfsBidirectionnel(unittest.TestCase):
+    """Le BFS bidirectionnel trouve des chemins valides de même longueur que le BFS simple"""
+
+    def setUp(self):
+        self._dossier = tempfile.TemporaryDirectory()
+        config = Path(self._dossier.name) / "config" / "etat-chemin.toml"
+        config.parent.mkdir()
+        config.write_text("[pathfinding]\nmax_profondeur = 20\n", encoding="utf-8")
+        self.gestionnaire = GestionnaireEtats(str(config))
+
+    def tearDown(self):
+        self._dossier.cleanup()
+
+    def _charger_graphe(self, etats, chemins, max_profondeur):
+        """Installe un graphe factice à la place du scan des modules"""
+        gestionnaire = self.gestionnaire
+        gestionnaire._config["pathfinding"]["max_profondeur"] = max_profondeur
+        gestionnaire._etats = {e.nom: e for e in etats}
+        gestionnaire._chemins = chemins
+        gestionnaire._precalculer_graphes()
+        gestionnaire._initialise = True
+
+    def _verifier_chemin(self, chemins, depart, arrivee):
+        """Vérifie qu'une suite de chemins relie bien depart à arrivee"""
+        etats_possibles = [depart]
+        for chemin in chemins:
+            self.assertIn(chemin.etat_initial, etats_possibles)
+            etats_possibles = self.gestionnaire._obtenir_etats_sortie(chemin)
+        self.assertIn(arrivee, etats_possibles)
+
+    def _comparer(self, graphe, etats, max_profondeur):
+        """Compare les deux BFS sur toutes les paires d'états"""
+        for depart in etats:
+            for arrivee in etats:
+                attendu = bfs_reference(self.gestionnaire, graphe, depart, arrivee, max_profondeur)
+                obtenu = self.gestionnaire._bfs_plus_court_chemin(graphe, depart, arrivee)
+
+                if attendu is None:
+                    self.assertIsNone(obtenu, f"{depart} → {arrivee}")
+                    continue
+
+                self.assertIsNotNone(obtenu, f"{depart} → {arrivee}")
+                self.assertEqual(len(obtenu), len(attendu), f"{depart} → {arrivee}")
+                if obtenu:
+                    self._verifier_chemin(obtenu, depart, arrivee)
+
+    def test_graphe_lineaire(self):
+        """Chaîne a → b → c → d : chemin unique"""
+        etats = [EtatFactice(n) for n in "abcd"]
+        chemins = [CheminFactice(etats[i], [etats[i + 1]]) for i in range(3)]
+        self._charger_graphe(etats, chemins, 20)
+
+        obtenu = self.gestionnaire._bfs_plus_court_chemin(
+            self.gestionnaire._graphe_complet, etats[0], etats[3]
+        )
+
+        self.assertEqual(obtenu, chemins)
+        self.assertIsNone(
+            self.gestionnaire._bfs_plus_court_chemin(
+                self.gestionnaire._graphe_complet, etats[3], etats[0]
+            )
+        )
+
+    def test_depart_egal_arrivee(self):
+        """Départ = arrivée : liste vide"""
+        etats = [EtatFactice("a")]
+        self._charger_graphe(etats, [], 20)
+
+        self.assertEqual(self.gestionnaire._bfs_plus_court_chemin({}, etats[0], etats[0]), [])
+
+    def test_profondeur_maximale(self):
+        """Au-delà de max_profondeur, aucun chemin n'est retourné"""
+        etats = [EtatFactice(str(i)) for i in range(6)]
+        chemins = [CheminFactice(etats[i], [etats[i + 1]]) for i in range(5)]
+        self._charger_graphe(etats, chemins, 3)
+        bfs = self.gestionnaire._bfs_plus_court_chemin
+        graphe = self.gestionnaire._graphe_complet
+
+        self.assertEqual(len(bfs(graphe, etats[0], etats[3])), 3)
+        self.assertIsNone(bfs(graphe, etats[0], etats[4]))
+
+    def test_graphes_aleatoires(self):
+        """Même longueur que le BFS simple sur des graphes aléatoires (sorties multiples)"""
+        aleatoire = random.Random(42)
+
+        for _ in range(60):
+            etats = [EtatFactice(str(i)) for i in range(aleatoire.randint(2, 12))]
+            chemins = [
+                CheminFactice(
+                    aleatoire.choice(etats),
+                    aleatoire.sample(etats, aleatoire.randint(1, min(3, len(etats)))),
+                )
+                for _ in range(aleatoire.randint(0, 3 * len(etats)))
+            ]
+            max_profondeur = aleatoire.choice([2, 3, 20])
+            self._charger_graphe(etats, chemins, max_profondeur)
+
+            self._comparer(self.gestionnaire._graphe_complet, etats, max_profondeur)
+            self._comparer(self.gestionnaire._graphe_certain, etats, max_profondeur)
+
+
+if __name__ == "__main__":
+    unittest.main()
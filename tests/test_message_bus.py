@@ -0,0 +1,211 @@
+"""Tests pour MessageBus
+
+Compare les requêtes du bus, servies par les index secondaires (par
+destination, broadcasts, par type), à un modèle simple qui parcourt tous
+les messages envoyés, et vérifie le retrait des messages expirés et la
+relecture des anciens identifiants.
+"""
+
+import random
+import time
+import unittest
+
+from core.message_bus import Message, MessageBus, MessageType
+
+FENETRES = ["a", "b", "c"]
+TYPES = [MessageType.INFO, MessageType.COMMANDE, MessageType.DEMANDE_RAID]
+
+
+class PetitBus(MessageBus):
+    """Bus limité à quelques messages pour exercer l'éviction du plus ancien"""
+
+    MAX_MESSAGES = 8
+
+
+class ModeleBus:
+    """Modèle de référence : une liste parcourue entièrement à chaque requête"""
+
+    def __init__(self, max_messages):
+        self.max_messages = max_messages
+        self.messages = []
+
+    def envoyer(self, msg):
+        self.messages.append(msg)
+        del self.messages[: -self.max_messages]
+
+    def attendus(self, fenetre_id, type_filter=None):
+        now = time.time()
+        return [
+            m
+            for m in self.messages
+            if not m.lu
+            and not m.is_expired_at(now)
+            and m.is_for(fenetre_id)
+            and (type_filter is None or m.type_msg == type_filter)
+        ]
+
+    def retirer(self, predicat):
+        self.messages = [m for m in self.messages if not predicat(m)]
+
+
+def verifier_index(test, bus):
+    """Les index contiennent exactement les messages de la file, dans son ordre"""
+    messages = list(bus._messages)
+
+    for fenetre_id, directs in bus._par_destination.items():
+        test.assertTrue(directs, f"index vide conservé pour {fenetre_id}")
+        test.assertEqual(list(directs), [m for m in messages if m.destination == fenetre_id])
+    test.assertEqual(list(bus._broadcasts), [m for m in messages if m.destination is None])
+
+    for type_msg, par_type in bus._par_type.items():
+        test.assertTrue(par_type, f"index vide conservé pour {type_msg}")
+        test.assertEqual(list(par_type), [m for m in messages if m.type_msg == type_msg])
+
+    directs = sum(len(d) for d in bus._par_destination.values())
+    test.assertEqual(directs + len(bus._broadcasts), len(messages))
+    test.assertEqual(sum(len(t) for t in bus._par_type.values()), len(messages))
+
+
+class TestMessageBusIndex(unittest.TestCase):
+    """Les index secondaires donnent les mêmes réponses qu'un parcours complet"""
+
+    def _comparer(self, obtenus, attendus):
+        """Compare deux listes de messages par identité, ordre d'arrivée compris"""
+        self.assertEqual(list(map(id, obtenus)), list(map(id, attendus)))
+
+    def _executer(self, bus, graine, operations):
+        """Applique des opérations aléatoires au bus et au modèle, puis compare"""
+        aleatoire = random.Random(graine)
+        modele = ModeleBus(bus.MAX_MESSAGES)
+
+        for _ in range(operations):
+            op = aleatoire.random()
+            fenetre_id = aleatoire.choice(FENETRES)
+            type_filter = aleatoire.choice(TYPES + [None])
+
+            if op < 0.5:
+                msg = bus.send(
+                    aleatoire.choice(FENETRES),
+                    aleatoire.choice(FENETRES + [None]),
+                    aleatoire.choice(TYPES),
+                    expire=aleatoire.choice([None, None, 60, -1]),
+                )
+                modele.envoyer(msg)
+            elif op < 0.65:
+                attendus = modele.attendus(fenetre_id, type_filter)
+                self._comparer(bus.peek_messages(fenetre_id, type_filter), attendus)
+                self.assertEqual(bus.count_messages(fenetre_id, type_filter), len(attendus))
+                self.assertEqual(bus.has_messages(fenetre_id, type_filter), bool(attendus))
+            elif op < 0.75:
+                attendus = modele.attendus(fenetre_id, type_filter)
+                self._comparer(bus.get_messages(fenetre_id, type_filter), attendus)
+                self.assertFalse(bus.has_messages(fenetre_id, type_filter))
+            elif op < 0.85:
+                bus.clear_expired()
+                now = time.time()
+                modele.retirer(lambda m: m.is_expired_at(now))
+            elif op < 0.95:
+                bus.clear_for(fenetre_id)
+                modele.retirer(lambda m: m.is_for(fenetre_id))
+            else:
+                bus.clear_all()
+                modele.retirer(lambda m: True)
+
+            self.assertEqual(len(bus), len(modele.messages))
+            verifier_index(self, bus)
+
+    def test_requetes_aleatoires(self):
+        """Envois, lectures et suppressions aléatoires : mêmes résultats que le modèle"""
+        for graine in range(20):
+            self._executer(MessageBus(), graine, 300)
+
+    def test_eviction_du_plus_ancien(self):
+        """File pleine : le plus ancien message quitte la file et tous ses index"""
+        for graine in range(20):
+            self._executer(PetitBus(), graine, 300)
+
+    def test_eviction_vide_les_index(self):
+        """Un index vidé par l'éviction est supprimé"""
+        bus = PetitBus()
+        bus.send("a", "b", MessageType.COMMANDE)
+        for _ in range(PetitBus.MAX_MESSAGES):
+            bus.broadcast("a", MessageType.INFO)
+
+        self.assertNotIn("b", bus._par_destination)
+        self.assertNotIn(MessageType.COMMANDE, bus._par_type)
+        self.assertEqual(bus.count_messages("b"), PetitBus.MAX_MESSAGES)
+        verifier_index(self, bus)
+
+
+class TestMessageBusExpiration(unittest.TestCase):
+    """Tests de clear_expired (tête de file ou reconstruction)"""
+
+    def test_expires_retires_en_tete(self):
+        """Expirations croissantes : les messages expirés sont retirés en tête"""
+        bus = MessageBus()
+        bus.send("a", "b", MessageType.INFO, expire=-20)
+        bus.broadcast("a", MessageType.COMMANDE, expire=-10)
+        valide = bus.send("a", "b", MessageType.INFO)
+
+        bus.clear_expired()
+
+        self.assertTrue(bus._expiration_monotone)
+        self.assertEqual(list(bus._messages), [valide])
+        self.assertEqual(bus.get_messages("b"), [valide])
+        verifier_index(self, bus)
+
+    def test_expirations_desordonnees(self):
+        """Un message expirant avant le précédent force la reconstruction de la file"""
+        bus = MessageBus()
+        premier = bus.send("a", "b", MessageType.INFO)
+        bus.send("a", "b", MessageType.COMMANDE, expire=-1)
+        dernier = bus.broadcast("a", MessageType.INFO)
+
+        self.assertFalse(bus._expiration_monotone)
+        bus.clear_expired()
+
+        self.assertEqual(list(bus._messages), [premier, dernier])
+        self.assertEqual(bus.count_messages("b", MessageType.COMMANDE), 0)
+        verifier_index(self, bus)
+
+    def test_file_videe_reinitialise_le_suivi(self):
+        """Une fois la file vide, les expirations sont de nouveau supposées croissantes"""
+        bus = MessageBus()
+        bus.send("a", "b", MessageType.INFO)
+        bus.send("a", "b", MessageType.INFO, expire=-1)
+        bus.clear_for("b")
+        bus.clear_expired()
+
+        self.assertEqual(len(bus), 0)
+        self.assertTrue(bus._expiration_monotone)
+
+        bus.send("a", "b", MessageType.INFO, expire=-1)
+        bus.clear_expired()
+        self.assertEqual(len(bus), 0)
+        verifier_index(self, bus)
+
+
+class TestMessageFromDict(unittest.TestCase):
+    """Tests de Message.from_dict sur les identifiants"""
+
+    def _depuis(self, msg_id):
+        return Message.from_dict(
+            {"source": "a", "destination": "b", "type_msg": MessageType.INFO.value, "id": msg_id}
+        )
+
+    def test_identifiant_entier_conserve(self):
+        """Un identifiant entier ou numérique textuel est conservé en entier"""
+        self.assertEqual(self._depuis(42).id, 42)
+        self.assertEqual(self._depuis("42").id, 42)
+
+    def test_ancien_identifiant_textuel_remplace(self):
+        """Un ancien identifiant textuel reçoit un nouvel identifiant entier"""
+        ancien = self._depuis("20240101_120000_123456")
+        nouveau = MessageBus().send("a", "b", MessageType.INFO)
+
+        self.assertIsInstance(ancien.id, int)
+        self.assertLess(ancien.id, nouveau.id)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""Tests pour utils.persistence
+
+Vérifie l'écriture JSON atomique (write_json_atomic / read_json) et le
+regroupement des sauvegardes par DebouncedSaver.
+"""
+
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from utils.persistence import DebouncedSaver, drain, read_json, write_json_atomic
+
+DONNEES = {"nom": "Manoir é", "valeurs": [1, 2.5, None, True], "imbrique": {"a": {"b": []}}}
+
+
+class TestWriteJsonAtomic(unittest.TestCase):
+    """Tests de write_json_atomic et read_json"""
+
+    def setUp(self):
+        self._dossier = tempfile.TemporaryDirectory()
+        self.fichier = Path(self._dossier.name) / "donnees.json"
+
+    def tearDown(self):
+        self._dossier.cleanup()
+
+    def test_aller_retour(self):
+        """Les données relues sont identiques, compactes ou indentées"""
+        for pretty in (False, True):
+            write_json_atomic(self.fichier, DONNEES, pretty=pretty)
+
+            self.assertEqual(read_json(self.fichier), DONNEES)
+            self.assertEqual(json.loads(self.fichier.read_text(encoding="utf-8")), DONNEES)
+
+    def test_pretty_indente(self):
+        """pretty=True produit un JSON sur plusieurs lignes, sinon une seule"""
+        write_json_atomic(self.fichier, DONNEES, pretty=False)
+        self.assertNotIn("\n", self.fichier.read_text(encoding="utf-8").strip())
+
+        write_json_atomic(self.fichier, DONNEES, pretty=True)
+        self.assertIn("\n", self.fichier.read_text(encoding="utf-8").strip())
+
+    def test_pas_de_fichier_temporaire_restant(self):
+        """Le fichier temporaire est renommé sur la cible"""
+        write_json_atomic(self.fichier, DONNEES)
+
+        self.assertEqual([p.name for p in self.fichier.parent.iterdir()], [self.fichier.name])
+
+    def test_echec_conserve_l_ancien_contenu(self):
+        """Une erreur pendant l'écriture laisse la version précédente intacte"""
+        write_json_atomic(self.fichier, {"version": 1})
+
+        with patch("utils.persistence.os.replace", side_effect=OSError("disque plein")):
+            with self.assertRaises(OSError):
+                write_json_atomic(self.fichier, {"version": 2})
+
+        self.assertEqual(read_json(self.fichier), {"version": 1})
+
+
+class TestDrain(unittest.TestCase):
+    """Tests de drain"""
+
+    def test_ordre_et_vidage(self):
+        """Les éléments sont rendus dans l'ordre et la liste est vidée"""
+        elements = [1, 2, 3]
+
+        self.assertEqual(list(drain(elements)), [1, 2, 3])
+        self.assertEqual(elements, [])
+
+
+class TestDebouncedSaver(unittest.TestCase):
+    """Tests du regroupement des sauvegardes"""
+
+    def test_flush_sans_demande(self):
+        """flush() n'écrit rien si aucune sauvegarde n'est en attente"""
+        appels = []
+        saver = DebouncedSaver(lambda: appels.append(1), interval=60)
+
+        saver.flush()
+
+        self.assertEqual(appels, [])
+
+    def test_demandes_regroupees_par_flush(self):
+        """Plusieurs demandes suivies d'un flush : une seule écriture"""
+        appels = []
+        saver = DebouncedSaver(lambda: appels.append(1), interval=60)
+
+        for _ in range(10):
+            saver.request()
+        saver.flush()
+        saver.flush()
+
+        self.assertEqual(appels, [1])
+
+    def test_ecriture_differee_par_le_thread(self):
+        """Sans flush, le thread écrit une fois après l'intervalle"""
+        ecrit = threading.Event()
+        appels = []
+
+        def sauvegarder():
+            appels.append(time.monotonic())
+            ecrit.set()
+
+        saver = DebouncedSaver(sauvegarder, interval=0.05)
+        debut = time.monotonic()
+        for _ in range(5):
+            saver.request()
+
+        self.assertTrue(ecrit.wait(timeout=2))
+        self.assertGreaterEqual(appels[0] - debut, 0.05)
+        time.sleep(0.1)
+        self.assertEqual(len(appels), 1)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,339 @@
+"""Tests pour SimpleScheduler
+
+Vérifie l'ordre de sélection entre niveaux, l'équité pondérée (temps virtuel)
+entre manoirs prioritaires prêts, le vieillissement (seuil_famine / bonus_famine)
+et la réutilisation de la dernière sélection (ttl_selection).
+"""
+
+import random
+import sys
+import types
+import unittest
+from collections import Counter
+from unittest.mock import patch
+
+from core.simple_scheduler import SimpleScheduler, _meilleur
+
+
+class ManoirFactice:
+    """Manoir minimal exposant les temps de passage des deux niveaux"""
+
+    def __init__(self, priorite, prioritaire=None, normal=None):
+        self.priorite = priorite
+        self.prioritaire = prioritaire
+        self.normal = normal
+        self.appels_normal = 0
+
+    def get_prochain_passage_prioritaire(self):
+        return self.prioritaire
+
+    def get_prochain_passage_normal(self):
+        self.appels_normal += 1
+        return self.normal
+
+
+def selections(scheduler, manoirs, n):
+    """Enchaîne n sélections et retourne la liste des manoir_id retenus"""
+    return [scheduler.selectionner_manoir(manoirs).manoir_id for _ in range(n)]
+
+
+def numpy_reel():
+    """Indique si le vrai numpy est importable (d'autres tests le remplacent par un mock)"""
+    try:
+        import numpy
+    except ImportError:
+        return False
+    return isinstance(numpy, types.ModuleType)
+
+
+class TestSelectionNiveaux(unittest.TestCase):
+    """Tests du choix entre niveau prioritaire et niveau normal"""
+
+    def setUp(self):
+        self.scheduler = SimpleScheduler()
+
+    def test_aucun_manoir(self):
+        """Sans manoir, aucune sélection"""
+        self.assertIsNone(self.scheduler.selectionner_manoir({}))
+
+    def test_aucune_action(self):
+        """Manoirs sans action (None ou inf) : aucune sélection"""
+        manoirs = {
+            "a": ManoirFactice(1, prioritaire=None, normal=float("inf")),
+            "b": ManoirFactice(2),
+        }
+        self.assertIsNone(self.scheduler.selectionner_manoir(manoirs))
+
+    def test_prioritaire_pret_avant_normal_pret(self):
+        """Un prioritaire prêt passe avant un normal prêt de priorité plus haute"""
+        manoirs = {
+            "normal": ManoirFactice(50, normal=0),
+            "prio": ManoirFactice(1, prioritaire=0),
+        }
+        selection = self.scheduler.selectionner_manoir(manoirs)
+
+        self.assertEqual(selection.manoir_id, "prio")
+        self.assertTrue(selection.est_prioritaire)
+        self.assertTrue(selection.pret)
+
+    def test_niveau_normal_abandonne_apres_prioritaire_pret(self):
+        """Le niveau normal n'est plus interrogé une fois un prioritaire prêt trouvé"""
+        manoirs = {
+            "prio": ManoirFactice(1, prioritaire=0, normal=0),
+            "normal": ManoirFactice(50, normal=0),
+        }
+        self.assertEqual(self.scheduler.selectionner_manoir(manoirs).manoir_id, "prio")
+
+        self.assertEqual(manoirs["prio"].appels_normal, 0)
+        self.assertEqual(manoirs["normal"].appels_normal, 0)
+
+    def test_sans_prioritaire_pret_le_plus_proche(self):
+        """Sans prioritaire prêt, le passage le plus proche l'emporte, tous niveaux confondus"""
+        manoirs = {
+            "a": ManoirFactice(5, prioritaire=30, normal=20),
+            "b": ManoirFactice(1, normal=10),
+        }
+        selection = self.scheduler.selectionner_manoir(manoirs)
+
+        self.assertEqual(selection.manoir_id, "b")
+        self.assertFalse(selection.pret)
+        self.assertEqual(selection.temps_avant_passage, 10)
+
+    def test_egalite_departagee_par_priorite(self):
+        """À temps égal, la priorité la plus haute l'emporte"""
+        manoirs = {
+            "bas": ManoirFactice(1, normal=15),
+            "haut": ManoirFactice(9, normal=15),
+        }
+        self.assertEqual(self.scheduler.selectionner_manoir(manoirs).manoir_id, "haut")
+
+    def test_get_temps_attente(self):
+        """get_temps_attente: 0 si prêt, sinon le délai du plus proche"""
+        manoirs = {"a": ManoirFactice(1, normal=12)}
+        self.assertEqual(self.scheduler.get_temps_attente(manoirs), 12)
+
+        manoirs["a"].normal = -3
+        self.assertEqual(self.scheduler.get_temps_attente(manoirs), 0)
+
+    def test_get_temps_attente_sans_effet(self):
+        """get_temps_attente ne compte aucun passage (famine, temps virtuel)"""
+        scheduler = SimpleScheduler(seuil_famine=1, bonus_famine=1)
+        manoirs = {
+            "a": ManoirFactice(1, prioritaire=0),
+            "b": ManoirFactice(1, prioritaire=0),
+        }
+        for _ in range(3):
+            self.assertEqual(scheduler.get_temps_attente(manoirs), 0)
+
+        self.assertEqual(scheduler._famine, {})
+        self.assertEqual(scheduler._temps_virtuel, {})
+        self.assertEqual(selections(scheduler, manoirs, 2), ["a", "b"])
+
+
+class TestEquitePrioritaires(unittest.TestCase):
+    """Tests du temps virtuel entre manoirs prioritaires prêts"""
+
+    def setUp(self):
+        self.scheduler = SimpleScheduler()
+
+    def test_alternance_a_priorite_egale(self):
+        """Deux prioritaires prêts de même priorité sont servis en alternance"""
+        manoirs = {
+            "a": ManoirFactice(3, prioritaire=0),
+            "b": ManoirFactice(3, prioritaire=0),
+        }
+        ordre = selections(self.scheduler, manoirs, 6)
+
+        self.assertEqual(ordre, ["a", "b", "a", "b", "a", "b"])
+
+    def test_partage_proportionnel_a_la_priorite(self):
+        """Chaque prioritaire prêt est servi en proportion de sa priorité"""
+        manoirs = {
+            "fort": ManoirFactice(3, prioritaire=0),
+            "faible": ManoirFactice(1, prioritaire=0),
+        }
+        compte = Counter(selections(self.scheduler, manoirs, 40))
+
+        self.assertEqual(compte["fort"], 30)
+        self.assertEqual(compte["faible"], 10)
+
+    def test_aucun_prioritaire_ecarte(self):
+        """Un manoir de faible priorité est servi au moins une fois par cycle"""
+        manoirs = {
+            "fort": ManoirFactice(10, prioritaire=0),
+            "faible": ManoirFactice(1, prioritaire=0),
+        }
+        ordre = selections(self.scheduler, manoirs, 11)
+
+        self.assertIn("faible", ordre)
+
+    def test_nouveau_manoir_ne_monopolise_pas(self):
+        """Un manoir ajouté en cours de route part du plus petit temps virtuel connu"""
+        manoirs = {
+            "a": ManoirFactice(1, prioritaire=0),
+            "b": ManoirFactice(1, prioritaire=0),
+        }
+        selections(self.scheduler, manoirs, 20)
+
+        manoirs["c"] = ManoirFactice(1, prioritaire=0)
+        compte = Counter(selections(self.scheduler, manoirs, 9))
+
+        self.assertEqual(compte, Counter({"a": 3, "b": 3, "c": 3}))
+
+    def test_manoir_retire_oublie(self):
+        """Un manoir retiré puis ajouté à nouveau repart du plancher, sans rattrapage"""
+        manoirs = {
+            "a": ManoirFactice(1, prioritaire=0),
+            "b": ManoirFactice(1, prioritaire=0),
+        }
+        selections(self.scheduler, manoirs, 10)
+
+        b = manoirs.pop("b")
+        selections(self.scheduler, manoirs, 10)
+        self.assertNotIn("b", self.scheduler._temps_virtuel)
+
+        manoirs["b"] = b
+        self.assertEqual(Counter(selections(self.scheduler, manoirs, 4)), Counter(a=2, b=2))
+
+
+class TestFamine(unittest.TestCase):
+    """Tests du vieillissement des manoirs prêts non retenus"""
+
+    def test_sans_vieillissement_le_plus_prioritaire_gagne(self):
+        """Bonus nul : le manoir de plus haute priorité est toujours retenu"""
+        scheduler = SimpleScheduler(seuil_famine=2, bonus_famine=0)
+        manoirs = {
+            "haut": ManoirFactice(5, normal=0),
+            "bas": ManoirFactice(1, normal=0),
+        }
+        self.assertEqual(selections(scheduler, manoirs, 6), ["haut"] * 6)
+
+    def test_palier_de_famine(self):
+        """Tous les seuil_famine passages manqués, la priorité gagne bonus_famine"""
+        scheduler = SimpleScheduler(seuil_famine=2, bonus_famine=10)
+        manoirs = {
+            "haut": ManoirFactice(5, normal=0),
+            "bas": ManoirFactice(1, normal=0),
+        }
+        ordre = selections(scheduler, manoirs, 6)
+
+        self.assertEqual(ordre, ["haut", "haut", "bas", "haut", "haut", "bas"])
+
+    def test_famine_comptee_seulement_si_pret(self):
+        """Un manoir non prêt n'accumule pas de passages manqués"""
+        scheduler = SimpleScheduler(seuil_famine=1, bonus_famine=100)
+        manoirs = {
+            "haut": ManoirFactice(5, normal=0),
+            "bas": ManoirFactice(1, normal=60),
+        }
+        selections(scheduler, manoirs, 5)
+
+        self.assertNotIn("bas", scheduler._famine)
+        self.assertEqual(scheduler.selectionner_manoir(manoirs).manoir_id, "haut")
+
+    def test_normal_non_vieilli_par_un_prioritaire_pret(self):
+        """Un prioritaire prêt servi ne fait vieillir que les autres prioritaires"""
+        scheduler = SimpleScheduler(seuil_famine=1, bonus_famine=1)
+        manoirs = {
+            "normal": ManoirFactice(1, normal=0),
+            "prio": ManoirFactice(1, prioritaire=0),
+            "autre": ManoirFactice(1, prioritaire=0),
+        }
+        self.assertEqual(scheduler.selectionner_manoir(manoirs).manoir_id, "prio")
+
+        self.assertEqual(scheduler._famine, {"autre": 1})
+
+
+class TestMemorisation(unittest.TestCase):
+    """Tests de la réutilisation de la dernière sélection (ttl_selection)"""
+
+    def test_selection_reutilisee_puis_invalidee(self):
+        """La sélection est réutilisée pendant le TTL, recalculée après invalidate()"""
+        scheduler = SimpleScheduler(ttl_selection=60)
+        manoirs = {"a": ManoirFactice(1, normal=5), "b": ManoirFactice(1, normal=8)}
+
+        self.assertEqual(scheduler.selectionner_manoir(manoirs).manoir_id, "a")
+        manoirs["a"].normal = 20
+        self.assertEqual(scheduler.selectionner_manoir(manoirs).manoir_id, "a")
+
+        scheduler.invalidate()
+        self.assertEqual(scheduler.selectionner_manoir(manoirs).manoir_id, "b")
+
+
+class TestSelectionSansNumpy(unittest.TestCase):
+    """Au-delà de SEUIL_VECTORISATION, sans numpy, repli sur min()"""
+
+    def test_repli_sur_min(self):
+        """numpy absent : même sélection que sous le seuil"""
+        manoirs = {f"m{i}": ManoirFactice(i % 3, normal=10 - i % 4) for i in range(20)}
+        attendu = SimpleScheduler().selectionner_manoir(manoirs)
+
+        with patch.dict(sys.modules, {"numpy": None}), patch(
+            "core.simple_scheduler.SEUIL_VECTORISATION", 0
+        ):
+            obtenu = SimpleScheduler().selectionner_manoir(manoirs)
+
+        self.assertEqual(obtenu, attendu)
+
+
+@unittest.skipUnless(numpy_reel(), "numpy non installé ou remplacé par un mock")
+class TestSelectionVectorisee(unittest.TestCase):
+    """Au-delà de SEUIL_VECTORISATION, numpy retient le même manoir que min()"""
+
+    TEMPS = [None, float("inf"), -5, 0, 0, 3, 3, 12]
+
+    def _manoirs(self, aleatoire):
+        """Génère des manoirs aux temps et priorités souvent égaux"""
+        return {
+            f"m{i}": ManoirFactice(
+                aleatoire.randint(0, 4),
+                prioritaire=aleatoire.choice(self.TEMPS),
+                normal=aleatoire.choice(self.TEMPS),
+            )
+            for i in range(aleatoire.randint(1, 40))
+        }
+
+    def _selections(self, manoirs, seuil, n):
+        """Enchaîne n sélections avec un seuil de vectorisation donné"""
+        scheduler = SimpleScheduler(seuil_famine=2, bonus_famine=3)
+        with patch("core.simple_scheduler.SEUIL_VECTORISATION", seuil):
+            resultat = []
+            for _ in range(n):
+                selection = scheduler.selectionner_manoir(manoirs)
+                resultat.append(selection and selection.manoir_id)
+            return resultat
+
+    def test_meilleur_identique_a_min(self):
+        """_meilleur vectorisé : même candidat que min(), premier en cas d'égalité"""
+        aleatoire = random.Random(3)
+        scheduler = SimpleScheduler()
+
+        for _ in range(50):
+            manoirs = self._manoirs(aleatoire)
+            candidats = scheduler._collecter_selections(manoirs, False)
+            if not candidats:
+                continue
+
+            def cle1(s):
+                return s.temps_avant_passage
+
+            def cle2(s):
+                return -s.priorite
+
+            attendu = min(candidats, key=lambda s: (cle1(s), cle2(s)))
+            with patch("core.simple_scheduler.SEUIL_VECTORISATION", 0):
+                self.assertIs(_meilleur(candidats, cle1, cle2), attendu)
+
+    def test_memes_selections_que_le_chemin_python(self):
+        """Sélections successives identiques avec ou sans numpy"""
+        aleatoire = random.Random(7)
+
+        for _ in range(50):
+            manoirs = self._manoirs(aleatoire)
+            self.assertEqual(
+                self._selections(manoirs, 0, 10), self._selections(manoirs, 10**9, 10)
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
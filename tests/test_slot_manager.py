@@ -0,0 +1,271 @@
+"""Tests pour SlotManager
+
+Vérifie get_next_free_time, servi par les slots triés par heure de
+libération, contre un parcours complet des slots, et la persistance : les
+heures de libération, tenues en time.monotonic() en mémoire, sont écrites en
+heure murale (time.monotonic()) et reconverties au chargement.
+"""
+
+import json
+import random
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from core.slot_manager import SlotManager
+from utils.persistence import monotonic_to_wall, wall_to_monotonic
+
+SLOTS_CONFIG = [{"nom": "collecte", "nb": 3}, {"nom": "raid", "nb": 2}]
+SLOTS_SAUVEGARDE = [{"nom": "collecte", "nb": 2}, {"nom": "raid", "nb": 1}]
+
+
+class TestSlotManagerOrdre(unittest.TestCase):
+    """get_next_free_time donne la même réponse qu'un parcours complet des slots"""
+
+    def setUp(self):
+        self._dossier = tempfile.TemporaryDirectory()
+        self.manager = SlotManager(Path(self._dossier.name) / "slots.json")
+        self.manager.register_manoir("m1", SLOTS_CONFIG)
+
+    def tearDown(self):
+        self._dossier.cleanup()
+
+    def _slots(self, slot_type):
+        """Slots d'un type, ou de tous les types si None"""
+        if slot_type:
+            return self.manager.get_all_slots("m1", slot_type)
+        return [s for slots in self.manager.get_all_slots("m1").values() for s in slots]
+
+    def _verifier(self):
+        """Compare get_next_free_time au parcours complet, pour chaque type et pour tous"""
+        for slot_type in (None, "collecte", "raid"):
+            obtenu = self.manager.get_next_free_time("m1", slot_type)
+            slots = self._slots(slot_type)
+            now = time.monotonic()
+
+            if any(not s.actif or now >= s.heure_liberation for s in slots):
+                # Un slot est libre : l'heure courante
+                self.assertAlmostEqual(obtenu, now, delta=1)
+            else:
+                self.assertEqual(obtenu, min(s.heure_liberation for s in slots))
+
+    def test_modifications_aleatoires(self):
+        """Occupations, libérations et mises à jour aléatoires via le gestionnaire"""
+        aleatoire = random.Random(5)
+
+        for _ in range(500):
+            slot_type = aleatoire.choice(["collecte", "raid"])
+            index = aleatoire.randrange(3 if slot_type == "collecte" else 2)
+            op = aleatoire.random()
+
+            if op < 0.5:
+                self.manager.occupy_slot("m1", slot_type, aleatoire.randint(1, 100))
+            elif op < 0.7:
+                self.manager.release_slot("m1", slot_type, index)
+            else:
+                decalage = aleatoire.choice([-1, 1]) * aleatoire.randint(1, 50)
+                self.manager.update_slot_time("m1", slot_type, index, time.monotonic() + decalage)
+
+            self._verifier()
+
+    def test_tous_occupes(self):
+        """Tous les slots occupés : la libération la plus proche"""
+        for duree in (30, 10, 20):
+            self.manager.occupy_slot("m1", "collecte", duree)
+
+        attendu = min(s.heure_liberation for s in self._slots("collecte"))
+        self.assertEqual(self.manager.get_next_free_time("m1", "collecte"), attendu)
+        self.assertAlmostEqual(attendu, time.monotonic() + 10, delta=1)
+
+    def test_manoir_inconnu(self):
+        """Manoir non enregistré : None"""
+        self.assertIsNone(self.manager.get_next_free_time("inconnu"))
+
+
+class TestSlotManagerPersistance(unittest.TestCase):
+    """Sauvegarde et rechargement à travers la conversion monotone ↔ murale"""
+
+    def setUp(self):
+        self._dossier = tempfile.TemporaryDirectory()
+        self.dossier = Path(self._dossier.name)
+        self.fichier = self.dossier / "slots.json"
+        self._patch_data_dir = patch("core.slot_manager.DATA_DIR", self.dossier)
+        self._patch_data_dir.start()
+
+    def tearDown(self):
+        self._patch_data_dir.stop()
+        self._dossier.cleanup()
+
+    def _sauvegarder(self, manager):
+        """Force l'écriture différée et relit le fichier brut"""
+        manager.save()
+        manager.flush()
+        return json.loads(self.fichier.read_text(encoding="utf-8"))
+
+    def test_heure_ecrite_en_heure_murale(self):
+        """Un slot occupé est écrit avec une heure de libération murale"""
+        manager = SlotManager(self.fichier)
+        manager.register_manoir("m1", SLOTS_SAUVEGARDE)
+        slot = manager.occupy_slot("m1", "raid", 600)
+
+        data = self._sauvegarder(manager)
+        ecrit = data["slots"]["m1"]["raid"][0]
+
+        self.assertTrue(ecrit["actif"])
+        self.assertAlmostEqual(ecrit["heure_liberation"], time.time() + 600, delta=5)
+        self.assertAlmostEqual(
+            ecrit["heure_liberation"], monotonic_to_wall(slot.heure_liberation), places=6
+        )
+
+    def test_slot_libre_garde_zero(self):
+        """Un slot libre garde heure_liberation = 0 (pas de décalage appliqué)"""
+        manager = SlotManager(self.fichier)
+        manager.register_manoir("m1", SLOTS_SAUVEGARDE)
+
+        data = self._sauvegarder(manager)
+
+        for ecrit in data["slots"]["m1"]["collecte"]:
+            self.assertFalse(ecrit["actif"])
+            self.assertEqual(ecrit["heure_liberation"], 0)
+
+    def test_aller_retour(self):
+        """Sauvegarde puis rechargement : même état, heures reconverties en monotone"""
+        manager = SlotManager(self.fichier)
+        manager.register_manoir("m1", SLOTS_SAUVEGARDE)
+        occupe = manager.occupy_slot("m1", "collecte", 300)
+        self._sauvegarder(manager)
+
+        recharge = SlotManager(self.fichier)
+        slots = recharge.get_all_slots("m1", "collecte")
+
+        self.assertTrue(slots[0].actif)
+        self.assertAlmostEqual(slots[0].heure_liberation, occupe.heure_liberation, places=3)
+        self.assertAlmostEqual(slots[0].heure_liberation, time.monotonic() + 300, delta=5)
+        self.assertFalse(slots[1].actif)
+        self.assertEqual(recharge.count_free_slots("m1", "collecte"), 1)
+        self.assertEqual(recharge.count_free_slots("m1", "raid"), 1)
+
+    def test_slot_echu_libere_au_chargement(self):
+        """Un slot dont l'heure murale est passée est libre au rechargement"""
+        data = {
+            "last_save": time.time(),
+            "slots_config": {"m1": [{"nom": "raid", "nb": 1}]},
+            "slots": {
+                "m1": {
+                    "raid": [
+                        {
+                            "manoir_id": "m1",
+                            "slot_type": "raid",
+                            "slot_index": 0,
+                            "heure_liberation": time.time() - 60,
+                            "actif": True,
+                        }
+                    ]
+                }
+            },
+        }
+        self.fichier.write_text(json.dumps(data), encoding="utf-8")
+
+        manager = SlotManager(self.fichier)
+
+        slot = manager.get_all_slots("m1", "raid")[0]
+        self.assertFalse(slot.actif)
+        self.assertTrue(manager.has_free_slot("m1", "raid"))
+
+    def test_prochaine_liberation_apres_rechargement(self):
+        """get_next_free_time répond en temps monotone après rechargement"""
+        manager = SlotManager(self.fichier)
+        manager.register_manoir("m1", [{"nom": "raid", "nb": 1}])
+        manager.occupy_slot("m1", "raid", 120)
+        self._sauvegarder(manager)
+
+        recharge = SlotManager(self.fichier)
+        prochaine = recharge.get_next_free_time("m1", "raid")
+
+        self.assertAlmostEqual(prochaine, time.monotonic() + 120, delta=5)
+
+    def test_modification_directe_d_un_slot(self):
+        """Un slot occupé ou libéré directement est pris en compte par get_next_free_time"""
+        manager = SlotManager(self.fichier)
+        manager.register_manoir("m1", [{"nom": "raid", "nb": 2}])
+        premier, second = manager.get_all_slots("m1", "raid")
+
+        premier.occupy(100)
+        second.occupy(50)
+        self.assertAlmostEqual(
+            manager.get_next_free_time("m1", "raid"), second.heure_liberation, places=6
+        )
+
+        second.release()
+        self.assertAlmostEqual(manager.get_next_free_time("m1", "raid"), time.monotonic(), delta=1)
+
+
+class SignalementConcurrent(set):
+    """Ensemble de signalements dont le parcours est interrompu par un Slot._signaler
+
+    Reproduit un slot modifié par un autre thread pendant que le gestionnaire
+    parcourt ses signalements.
+    """
+
+    def __init__(self, elements, slot):
+        super().__init__(elements)
+        self.slot = slot
+
+    def __iter__(self):
+        for i, cle in enumerate(set.__iter__(self)):
+            if i == 0:
+                self.slot.occupy(30)
+            yield cle
+
+
+class TestSlotManagerSignalements(unittest.TestCase):
+    """Tests des signalements de slots modifiés hors du gestionnaire"""
+
+    def setUp(self):
+        self._dossier = tempfile.TemporaryDirectory()
+        self.manager = SlotManager(Path(self._dossier.name) / "slots.json")
+        self.manager.register_manoir("m1", SLOTS_CONFIG)
+        self.manager.register_manoir("m2", SLOTS_CONFIG)
+
+    def tearDown(self):
+        self._dossier.cleanup()
+
+    def test_signalement_pendant_le_parcours(self):
+        """Un slot signalé pendant le parcours n'interrompt pas le tri et reste à traiter"""
+        raid = self.manager.get_all_slots("m1", "raid")[0]
+        self.manager._a_reordonner = SignalementConcurrent({("m1", "collecte")}, raid)
+
+        # L'autre slot raid, resté libre, passe devant le slot occupé
+        self.assertAlmostEqual(
+            self.manager.get_next_free_time("m1", "raid"), time.monotonic(), delta=1
+        )
+        self.assertEqual(self.manager._a_reordonner, set())
+
+    def test_signalements_des_autres_manoirs_conserves(self):
+        """Resynchroniser un manoir laisse en attente les signalements des autres"""
+        self.manager.get_all_slots("m1", "raid")[0].occupy(30)
+        self.manager.get_all_slots("m2", "collecte")[0].occupy(30)
+
+        self.manager.get_next_free_time("m1")
+
+        self.assertEqual(self.manager._a_reordonner, {("m2", "collecte")})
+
+
+class TestConversionHorloges(unittest.TestCase):
+    """Tests de monotonic_to_wall / wall_to_monotonic"""
+
+    def test_conversion_inverse(self):
+        """Les deux conversions sont inverses l'une de l'autre"""
+        t = time.monotonic() + 42
+        self.assertAlmostEqual(wall_to_monotonic(monotonic_to_wall(t)), t, places=6)
+
+    def test_zero_conserve(self):
+        """0 (jamais / immédiat) n'est pas converti"""
+        self.assertEqual(monotonic_to_wall(0), 0)
+        self.assertEqual(wall_to_monotonic(0), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
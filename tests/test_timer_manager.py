@@ -0,0 +1,219 @@
+"""Tests pour TimerManager
+
+Compare get_next_due_time et get_due_timers, servis par les shards de chaque
+fenêtre et leurs tas d'échéances, à un parcours complet des timers après des modifications
+aléatoires (ajout, suppression, retard, exécution, désactivation).
+"""
+
+import random
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from core.timer_manager import TimerManager
+
+FENETRES = ["f1", "f2", None]
+NOMS = ["collecte", "raid", "construction", "quete"]
+
+
+def timer_key(timer):
+    """Clé d'un timer dans le gestionnaire ("fenetre:nom" ou "global:nom")"""
+    return f"{timer.fenetre_id or 'global'}:{timer.nom}"
+
+
+def numpy_reel():
+    """Indique si le vrai numpy est importable (d'autres tests le remplacent par un mock)"""
+    try:
+        import numpy
+    except ImportError:
+        return False
+    return isinstance(numpy, types.ModuleType)
+
+
+class TestTimerManagerEcheances(unittest.TestCase):
+    """Les shards et leurs tas d'échéances donnent les mêmes réponses qu'un parcours complet"""
+
+    def setUp(self):
+        self._dossier = tempfile.TemporaryDirectory()
+        self.manager = TimerManager(Path(self._dossier.name) / "timers.json")
+        # Modèle : {(nom, fenetre_id): Timer}
+        self.timers = {}
+
+    def tearDown(self):
+        self._dossier.cleanup()
+
+    def _visibles(self, fenetre_id):
+        """Timers vus depuis une fenêtre : les siens et les globaux (tous si None)"""
+        return [
+            t
+            for t in self.timers.values()
+            if fenetre_id is None or t.fenetre_id in (fenetre_id, None)
+        ]
+
+    def _verifier_shards(self):
+        """Chaque timer est dans le shard de sa fenêtre, son échéance courante dans le tas"""
+        for fenetre_id, shard in self.manager._shards.items():
+            for key, timer in shard.timers.items():
+                self.assertEqual(timer.fenetre_id, fenetre_id)
+                self.assertEqual(key, timer_key(timer))
+                if timer.actif:
+                    self.assertIn((timer.prochaine_execution, key), shard.echeances)
+
+        for timer in self.timers.values():
+            shard = self.manager._shards[timer.fenetre_id]
+            self.assertIs(shard.timers[timer_key(timer)], timer)
+
+    def _verifier(self):
+        """Compare les requêtes du gestionnaire au parcours complet du modèle"""
+        for fenetre_id in FENETRES + ["absente"]:
+            visibles = self._visibles(fenetre_id)
+
+            attendu = min((t.prochaine_execution for t in visibles if t.actif), default=None)
+            self.assertEqual(self.manager.get_next_due_time(fenetre_id), attendu)
+
+            dus = self.manager.get_due_timers(fenetre_id)
+            self.assertEqual({id(t) for t in dus}, {id(t) for t in visibles if t.is_due()})
+            priorites = [t.priorite for t in dus]
+            self.assertEqual(priorites, sorted(priorites, reverse=True))
+
+        self.assertEqual(len(self.manager), len(self.timers))
+        self._verifier_shards()
+
+    def _operation(self, aleatoire):
+        """Applique une modification aléatoire au gestionnaire et au modèle"""
+        nom = aleatoire.choice(NOMS)
+        fenetre_id = aleatoire.choice(FENETRES)
+        timer = self.timers.get((nom, fenetre_id))
+        op = aleatoire.random()
+
+        if timer is None or op < 0.2:
+            self.timers[(nom, fenetre_id)] = self.manager.add_timer(
+                nom,
+                fenetre_id,
+                intervalle=aleatoire.randint(1, 100),
+                priorite=aleatoire.randint(0, 3),
+                start_now=aleatoire.random() < 0.5,
+            )
+        elif op < 0.3:
+            self.assertTrue(self.manager.remove_timer(nom, fenetre_id))
+            del self.timers[(nom, fenetre_id)]
+        elif op < 0.55:
+            timer.delay(aleatoire.randint(-100, 100))
+        elif op < 0.65:
+            timer.reset()
+        elif op < 0.8:
+            self.manager.mark_executed(nom, fenetre_id)
+        else:
+            timer.actif = not timer.actif
+
+    def test_modifications_aleatoires(self):
+        """Après chaque modification, mêmes réponses que le parcours complet"""
+        for graine in range(10):
+            aleatoire = random.Random(graine)
+            for _ in range(300):
+                self._operation(aleatoire)
+                self._verifier()
+
+            for nom, fenetre_id in list(self.timers):
+                self.manager.remove_timer(nom, fenetre_id)
+                del self.timers[(nom, fenetre_id)]
+
+    def test_timer_desactive_ignore(self):
+        """Un timer désactivé n'a plus d'échéance, et la retrouve une fois réactivé"""
+        timer = self.manager.add_timer("collecte", "f1", intervalle=10)
+        self.timers[("collecte", "f1")] = timer
+
+        timer.actif = False
+        self.assertIsNone(self.manager.get_next_due_time("f1"))
+
+        timer.actif = True
+        self.assertEqual(self.manager.get_next_due_time("f1"), timer.prochaine_execution)
+        self._verifier()
+
+    def test_aucun_timer(self):
+        """Sans timer, ni échéance ni timer dû"""
+        self.assertIsNone(self.manager.get_next_due_time())
+        self.assertEqual(self.manager.get_due_timers(), [])
+
+
+class TestTimerManagerPersistance(unittest.TestCase):
+    """Sauvegarde puis rechargement des timers"""
+
+    def setUp(self):
+        self._dossier = tempfile.TemporaryDirectory()
+        self.dossier = Path(self._dossier.name)
+        self.fichier = self.dossier / "timers.json"
+        patcher = patch("core.timer_manager.DATA_DIR", self.dossier)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self._dossier.cleanup()
+
+    def test_aller_retour(self):
+        """Les timers rechargés ont les mêmes champs et les mêmes échéances"""
+        manager = TimerManager(self.fichier)
+        timers = [
+            manager.add_timer("collecte", "f1", intervalle=120, priorite=2),
+            manager.add_timer("raid", "f2", intervalle=30, start_now=True),
+            manager.add_timer("quete", None, intervalle=60),
+        ]
+        timers[2].actif = False
+        manager.save()
+        manager.flush()
+
+        recharge = TimerManager(self.fichier)
+
+        self.assertEqual(len(recharge), len(timers))
+        for timer in timers:
+            relu = recharge.get_timer(timer.nom, timer.fenetre_id)
+            self.assertEqual(
+                (relu.intervalle, relu.priorite, relu.actif),
+                (timer.intervalle, timer.priorite, timer.actif),
+            )
+            self.assertAlmostEqual(relu.prochaine_execution, timer.prochaine_execution, places=3)
+
+        collecte = recharge.get_timer("collecte", "f1")
+        self.assertEqual(recharge.get_next_due_time("f1"), collecte.prochaine_execution)
+        self.assertEqual([t.nom for t in recharge.get_due_timers("f2")], ["raid"])
+
+
+class TestTimerManagerSansNumpy(TestTimerManagerEcheances):
+    """Mêmes vérifications au-delà de SEUIL_VECTORISATION, numpy absent"""
+
+    def setUp(self):
+        for patcher in (
+            patch("core.timer_manager.SEUIL_VECTORISATION", 1),
+            patch.dict(sys.modules, {"numpy": None}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        super().setUp()
+
+    def _verifier(self):
+        super()._verifier()
+        for shard in self.manager._shards.values():
+            self.assertIsNone(shard.tableaux)
+
+
+@unittest.skipUnless(numpy_reel(), "numpy non installé ou remplacé par un mock")
+class TestTimerManagerVectorise(TestTimerManagerEcheances):
+    """Mêmes vérifications avec les tableaux numpy (SEUIL_VECTORISATION abaissé)"""
+
+    def setUp(self):
+        patcher = patch("core.timer_manager.SEUIL_VECTORISATION", 1)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        super().setUp()
+
+    def _verifier(self):
+        super()._verifier()
+        for shard in self.manager._shards.values():
+            self.assertEqual(shard.tableaux is not None, bool(shard.timers))
+
+
+if __name__ == "__main__":
+    unittest.main()
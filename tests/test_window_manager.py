@@ -0,0 +1,35 @@
+"""Tests pour WindowManager
+
+Vérifie que les tests d'état d'une fenêtre renvoient False pour un handle
+invalide au lieu de propager l'erreur de conversion ctypes.
+"""
+
+import ctypes
+import unittest
+from unittest.mock import MagicMock, patch
+
+import core.window_manager as window_manager
+
+
+class TestEtatFenetre(unittest.TestCase):
+    """is_window_visible, is_window_minimized et window_exists sur un handle invalide"""
+
+    def setUp(self):
+        user32 = MagicMock()
+        for nom in ("IsWindow", "IsWindowVisible", "IsIconic"):
+            getattr(user32, nom).side_effect = ctypes.ArgumentError("argument 1: wrong type")
+        patcher = patch.object(window_manager, "_user32", user32)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.manager = window_manager.WindowManager()
+
+    def test_handle_invalide(self):
+        """Un handle refusé par ctypes donne False"""
+        for hwnd in (None, "fenetre"):
+            self.assertFalse(self.manager.window_exists(hwnd))
+            self.assertFalse(self.manager.is_window_visible(hwnd))
+            self.assertFalse(self.manager.is_window_minimized(hwnd))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,6 +13,13 @@ __all__ = [
     "is_point_in_window",
     "region_to_absolute",
     "clamp_to_window",
+    # Persistence
+    "write_json_atomic",
+    "DebouncedSaver",
+    "read_json",
+    "drain",
+    "monotonic_to_wall",
+    "wall_to_monotonic",
 ]
 
 from utils.config import *  # noqa: F403
@@ -26,3 +33,11 @@ from utils.coordinates import (
     relative_to_absolute,
 )
 from utils.logger import get_manoir_logger, get_module_logger, setup_logging
+from utils.persistence import (
+    DebouncedSaver,
+    drain,
+    monotonic_to_wall,
+    read_json,
+    wall_to_monotonic,
+    write_json_atomic,
+)
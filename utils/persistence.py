@@ -0,0 +1,158 @@
+"""Écriture des fichiers de persistance JSON (atomique, différée)"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+# orjson (optionnel) : sérialisation en C, nettement plus rapide que json
+try:
+    import orjson
+
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def write_json_atomic(filepath, data, pretty=False):
+    """Écrit des données JSON de façon atomique
+
+    Le contenu est écrit dans un fichier temporaire voisin, synchronisé sur
+    disque puis renommé : en cas d'arrêt brutal, le fichier cible contient
+    soit l'ancienne version, soit la nouvelle, jamais un contenu tronqué.
+
+    Args:
+        filepath: Chemin du fichier cible
+        data: Données sérialisables en JSON
+        pretty: Si True, indente le JSON (lisible, plus lent et plus gros)
+    """
+    filepath = Path(filepath)
+    if ORJSON_AVAILABLE:
+        contenu = orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    elif pretty:
+        contenu = json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    else:
+        contenu = json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+    tmp = filepath.with_name(filepath.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(contenu)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, filepath)
+
+
+def read_json(filepath):
+    """Lit un fichier JSON (orjson si disponible)
+
+    Args:
+        filepath: Chemin du fichier
+
+    Returns:
+        Données désérialisées
+    """
+    with open(filepath, "rb") as f:
+        contenu = f.read()
+    if ORJSON_AVAILABLE:
+        return orjson.loads(contenu)
+    return json.loads(contenu)
+
+
+# Écart entre l'horloge murale et l'horloge monotone, fixé au démarrage
+_WALL_OFFSET = time.time() - time.monotonic()
+
+
+def monotonic_to_wall(t):
+    """Convertit un timestamp time.monotonic() en timestamp time.time() pour la persistance
+
+    Un timestamp monotone ne vaut que pour le processus courant : il est
+    converti en heure murale à l'écriture. 0 (jamais / immédiat) est conservé.
+
+    Args:
+        t: Timestamp monotone
+
+    Returns:
+        float: Timestamp mural équivalent
+    """
+    return t + _WALL_OFFSET if t else t
+
+
+def wall_to_monotonic(t):
+    """Convertit un timestamp time.time() persisté en timestamp time.monotonic()
+
+    Args:
+        t: Timestamp mural (0 conservé)
+
+    Returns:
+        float: Timestamp monotone équivalent (dans le passé si déjà échu)
+    """
+    return t - _WALL_OFFSET if t else t
+
+
+def drain(items):
+    """Parcourt une liste en la vidant, dans l'ordre
+
+    Chaque élément est retiré de la liste avant d'être rendu : une fois
+    converti par l'appelant, l'enregistrement brut peut être libéré, ce qui
+    évite de garder en mémoire à la fois le JSON chargé et les objets créés.
+
+    Args:
+        items: Liste à consommer (modifiée en place)
+
+    Yields:
+        Les éléments de la liste
+    """
+    items.reverse()
+    while items:
+        yield items.pop()
+
+
+class DebouncedSaver:
+    """Regroupe les demandes de sauvegarde en une écriture différée
+
+    request() marque les données comme modifiées ; un thread démon appelle
+    la fonction de sauvegarde au plus une fois par intervalle, quel que soit
+    le nombre de demandes reçues entre-temps. Les données en attente sont
+    écrites à la sortie du programme.
+    """
+
+    def __init__(self, save_func, interval=5.0):
+        """
+        Args:
+            save_func: Fonction sans argument effectuant l'écriture réelle
+            interval: Délai (secondes) de regroupement des demandes
+        """
+        self.save_func = save_func
+        self.interval = interval
+        self._dirty = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def request(self):
+        """Demande une sauvegarde (non bloquant)"""
+        self._dirty.set()
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="DebouncedSaver", daemon=True
+                    )
+                    self._thread.start()
+                    atexit.register(self.flush)
+
+    def flush(self):
+        """Écrit immédiatement si une sauvegarde est en attente"""
+        with self._lock:
+            if self._dirty.is_set():
+                self._dirty.clear()
+                self.save_func()
+
+    def _run(self):
+        """Boucle du thread de sauvegarde (PROTÉGÉ)"""
+        while True:
+            self._dirty.wait()
+            # Laisser les demandes suivantes s'accumuler
+            time.sleep(self.interval)
+            self.flush()